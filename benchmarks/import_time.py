@@ -0,0 +1,58 @@
+"""
+Measure how long starting SeedSeeker takes.
+
+Every command is run in a fresh interpreter several times and the fastest and
+median wall times are reported, e.g.
+
+    python benchmarks/import_time.py --runs 20
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "import seedseeker": ["-c", "import seedseeker"],
+    "import seedseeker.cli": ["-c", "import seedseeker.cli"],
+    "--version": ["-m", "seedseeker", "--version"],
+    "--generate xoshiro": ["-m", "seedseeker", "-g", "xoshiro", "1;2;3;4"],
+    "--generate mersenne": ["-m", "seedseeker", "-g", "mersenne", "5"],
+}
+
+
+def measure(arguments: list[str], runs: int) -> list[float]:
+    """Return the wall times of running the interpreter with `arguments`."""
+    times = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        _ = subprocess.run(  # noqa: S603
+            [sys.executable, *arguments], check=True, stdout=subprocess.DEVNULL
+        )
+        times.append(time.perf_counter() - started)
+
+    return times
+
+
+def main() -> None:
+    """Print the startup time of every command."""
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs of every command")
+    args = parser.parse_args()
+
+    print(f"{'command':<24}{'min ms':>10}{'median ms':>12}")
+    for name, arguments in COMMANDS.items():
+        times = measure(arguments, args.runs)
+        print(
+            f"{name:<24}{min(times) * 1000:>10.1f}"
+            f"{statistics.median(times) * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
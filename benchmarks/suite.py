@@ -0,0 +1,262 @@
+"""
+Measure the speed of the generators, the reversers and the command line.
+
+`run` measures every case and writes the results as JSON, `compare` compares
+results with a stored baseline and fails if a case got slower, e.g.
+
+    python benchmarks/suite.py run --output baseline.json
+    python benchmarks/suite.py run --output current.json
+    python benchmarks/suite.py compare baseline.json current.json
+
+Generators are measured in values per second, one value at a time and in
+blocks from `next_block`. Every `reverse_*` function is timed on several
+input lengths and generator parameters, and on values no generator produced,
+which it has to reject. The command line is timed from start to exit,
+reversing a file. Every case is repeated and the fastest run is kept.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from seedseeker import generators
+from seedseeker.registry import GENERATORS
+from seedseeker.utils.optional import numpy
+
+# parameters of every generator, as given to --generate
+PARAMETERS = {
+    "lcg": "4294967296;1664525;1013904223;1",
+    "fibonacci": "24;55;4294967296;1",
+    "ran3": "5",
+    "xoshiro": "1;2;3;4",
+    "mersenne": "5",
+}
+
+# number of values generated by the generator cases
+GENERATED = 100_000
+
+# generator and parameters of the reverser cases, which vary the modulus of
+# the LCG and the lags of the lagged Fibonacci generator
+REVERSALS = {
+    "lcg/m=2^16": ("lcg", "65536;25173;13849;1"),
+    "lcg/m=2^32": ("lcg", "4294967296;1664525;1013904223;1"),
+    "lcg/m=2^61-1": ("lcg", "2305843009213693951;437799614237992725;12345;1"),
+    "fibonacci/lags=7,10": ("fibonacci", "7;10;4294967296;1"),
+    "fibonacci/lags=24,55": ("fibonacci", "24;55;4294967296;1"),
+    "fibonacci/lags=273,607": ("fibonacci", "273;607;4294967296;1"),
+    "ran3": ("ran3", "5"),
+    "xoshiro": ("xoshiro", "1;2;3;4"),
+    "mersenne": ("mersenne", "5"),
+}
+
+# input lengths of the reverser cases
+LENGTHS = [1024, 4096, 16384]
+
+# length of the files reversed by the command line cases
+CLI_LENGTH = 1024
+
+# results in these units are better when lower, the others when higher
+LOWER_IS_BETTER = {"s"}
+
+
+class Result(NamedTuple):
+    """Speed of a single case."""
+
+    name: str
+    # "values/s" or "s"
+    unit: str
+    value: float
+
+
+def fastest(repeat: int, function: Callable[..., Any], *args: Any) -> float:
+    """Return the shortest wall time of calling `function` `repeat` times."""
+    times = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _ = function(*args)
+        times.append(time.perf_counter() - started)
+
+    return min(times)
+
+
+def consume(values: Iterable[int]) -> None:
+    """Exhaust an iterator."""
+    _ = deque(values, maxlen=0)
+
+
+def noise(count: int) -> list[int]:
+    """Return 32-bit values no generator produced, the same on every run."""
+    return [
+        int.from_bytes(hashlib.sha256(i.to_bytes(8)).digest()[:4]) for i in range(count)
+    ]
+
+
+def generate(name: str, parameters: str, count: int) -> list[int]:
+    """Return the first values of a generator."""
+    return list(islice(GENERATORS[name].from_string(parameters), count))
+
+
+def generator_cases(repeat: int) -> Iterator[Result]:
+    """Measure the values per second of every generator."""
+    for name, parameters in PARAMETERS.items():
+        generator = GENERATORS[name].from_string(parameters)
+
+        scalar = fastest(repeat, lambda g=generator: consume(islice(g, GENERATED)))
+        yield Result(f"generate/{name}/scalar", "values/s", GENERATED / scalar)
+
+        bulk = fastest(repeat, generator.next_block, GENERATED)
+        yield Result(f"generate/{name}/bulk", "values/s", GENERATED / bulk)
+
+
+def reverser_cases(repeat: int) -> Iterator[Result]:
+    """Measure how long every reverser takes to find or reject a state."""
+    for case, (name, parameters) in REVERSALS.items():
+        reverse = getattr(generators, f"reverse_{name}")
+
+        for length in LENGTHS:
+            values = generate(name, parameters, length)
+            assert reverse(iter(values)) is not None, f"{case} was not reversed"
+
+            elapsed = fastest(repeat, lambda v=values, r=reverse: r(iter(v)))
+            yield Result(f"reverse/{case}/n={length}", "s", elapsed)
+
+    for name in PARAMETERS:
+        reverse = getattr(generators, f"reverse_{name}")
+
+        for length in LENGTHS:
+            values = noise(length)
+            elapsed = fastest(repeat, lambda v=values, r=reverse: r(iter(v)))
+            yield Result(f"reject/{name}/n={length}", "s", elapsed)
+
+
+def cli_cases(repeat: int) -> Iterator[Result]:
+    """Measure how long the command line takes to reverse a file."""
+    with tempfile.TemporaryDirectory() as directory:
+        for name, parameters in PARAMETERS.items():
+            path = Path(directory, f"{name}.txt")
+            values = generate(name, parameters, CLI_LENGTH)
+            _ = path.write_text("".join(f"{value}\n" for value in values))
+
+            command = [sys.executable, "-m", "seedseeker", "-r", "-i", str(path)]
+            elapsed = fastest(
+                repeat,
+                lambda c=command: subprocess.run(  # noqa: S603
+                    c, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                ),
+            )
+            yield Result(f"cli/reverse/{name}", "s", elapsed)
+
+
+SUITES = {
+    "generate": generator_cases,
+    "reverse": reverser_cases,
+    "cli": cli_cases,
+}
+
+
+def run(args: Namespace) -> None:
+    """Measure the selected suites and write the results as JSON."""
+    results = {}
+
+    for suite in args.suites or list(SUITES):
+        for result in SUITES[suite](args.repeat):
+            print(
+                f"{result.name:<40}{result.value:>16.4g} {result.unit}",
+                file=sys.stderr,
+            )
+            results[result.name] = {"unit": result.unit, "value": result.value}
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy() is not None,
+        "results": results,
+    }
+
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        _ = Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+def slowdown(unit: str, baseline: float, current: float) -> float:
+    """Return how many times slower the current result is, below 1 if faster."""
+    if unit in LOWER_IS_BETTER:
+        return current / baseline if baseline else 1.0
+
+    return baseline / current if current else float("inf")
+
+
+def compare(args: Namespace) -> None:
+    """Print the change of every result, exit with 1 if any regressed."""
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    current = json.loads(Path(args.current).read_text())["results"]
+    regressions = 0
+
+    print(f"{'case':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, after in current.items():
+        before = baseline.get(name)
+        if before is None or before["unit"] != after["unit"]:
+            continue
+
+        ratio = slowdown(after["unit"], before["value"], after["value"])
+        regressed = ratio > 1 + args.threshold
+        regressions += regressed
+        print(
+            f"{name:<40}{before['value']:>12.4g}{after['value']:>12.4g}"
+            f"{(ratio - 1) * 100:>+9.1f}%{'  REGRESSION' if regressed else ''}"
+        )
+
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:<40} missing from the current results")
+
+    if regressions:
+        print(f"{regressions} cases regressed", file=sys.stderr)
+        sys.exit(1)
+
+
+def main() -> None:
+    """Run or compare benchmarks."""
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure and write JSON results")
+    run_parser.add_argument(
+        "suites", nargs="*", choices=list(SUITES), help="Suites to run, all by default"
+    )
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs of every case")
+    run_parser.add_argument("--output", help="File to write, stdout by default")
+    run_parser.set_defaults(function=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Flag cases slower than in a baseline"
+    )
+    compare_parser.add_argument("baseline", help="Results to compare with")
+    compare_parser.add_argument("current", help="Results to check")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fraction a case may be slower by before it is flagged",
+    )
+    compare_parser.set_defaults(function=compare)
+
+    args = parser.parse_args()
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
-from seedseeker.generators import (
-    FibonacciRng,
-    FibonacciState,
-    Lcg,
-    LcgState,
-    MersenneTwister,
-    MersenneTwisterState,
-    Ran3,
-    Ran3State,
-    Xoshiro,
-    XoshiroState,
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from seedseeker.generators import (
+        FibonacciRng,
+        FibonacciState,
+        Lcg,
+        LcgState,
+        MersenneTwister,
+        MersenneTwisterState,
+        Ran3,
+        Ran3State,
+        Xoshiro,
+        XoshiroState,
+    )
 
 __all__ = [
     "FibonacciRng",
@@ -23,3 +28,13 @@ __all__ = [
     "Xoshiro",
     "XoshiroState",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported generator on first access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from seedseeker import generators  # noqa: PLC0415
+
+    return getattr(generators, name)
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from collections.abc import Iterable
+from typing import Any, NamedTuple, override
+
+from seedseeker.defs import IntegerRNG
+from seedseeker.feed import CONFIRM_SAMPLES, FeedReverser, Progress
+from seedseeker.utils.iterator import integers
+
+# number of consecutive values that have to match the predictions again after
+# an anomaly, a false match of 4 values of 32 bits is practically impossible
+RESYNC = 4
+
+# largest number of values dropped or inserted at once
+MAX_GAP = 16
+
+# modulus and base of the polynomial hash of `RESYNC` values
+HASH_MODULUS = 2**61 - 1
+HASH_BASE = 1_000_003
+
+
+class Anomaly(NamedTuple):
+    """A value that was not where the generator predicted it."""
+
+    # `corrupted` (a different value), `inserted` (a value the generator did
+    # not produce) or `dropped` (a predicted value missing from the input)
+    kind: str
+    # index of the value in the input, a dropped value is missing before it
+    position: int
+    expected: int | None
+    actual: int | None
+
+
+class Alignment(NamedTuple):
+    """State found on a sequence with anomalies, printed as the state."""
+
+    state: Any
+    # fraction of the verified values that the generator predicted
+    score: float
+    anomalies: list[Anomaly]
+
+    @override
+    def __str__(self) -> str:
+        """Print the state."""
+        return str(self.state)
+
+    def to_json(self) -> str:
+        """Return the score and the anomalies as a single line of JSON."""
+        anomalies = [anomaly._asdict() for anomaly in self.anomalies]
+        return json.dumps({"score": self.score, "anomalies": anomalies})
+
+
+class RollingHash:
+    """Hash of the last `RESYNC` values, updated one value at a time."""
+
+    values: deque[int]
+    hash: int
+
+    def __init__(self) -> None:
+        """Start with no values."""
+        self.values = deque(maxlen=RESYNC)
+        self.hash = 0
+
+    def push(self, value: int) -> int | None:
+        """Add a value, return the hash once there are `RESYNC` values."""
+        if len(self.values) == RESYNC:
+            oldest = self.values[0] * pow(HASH_BASE, RESYNC - 1, HASH_MODULUS)
+            self.hash -= oldest
+
+        self.values.append(value)
+        self.hash = (self.hash * HASH_BASE + value) % HASH_MODULUS
+        return self.hash if len(self.values) == RESYNC else None
+
+
+class TolerantVerifier[StateT](FeedReverser[Alignment]):
+    """
+    Checks the values against a generator, tolerating a few anomalies.
+
+    After a value differs from the prediction, the next values are collected
+    until the last `RESYNC` of them appear among the next predictions. The
+    predictions are indexed by a rolling hash when the mismatch happens, so
+    every value collected afterwards is a single lookup. The values skipped
+    on either side are the anomalies. More than `tolerance` anomalies, or a
+    gap of more than `MAX_GAP` values, reject the state.
+    """
+
+    # produces the predictions, ahead of the values by the ones not compared
+    generator: IntegerRNG[StateT]
+    confirm_samples: int
+    tolerance: int
+    # index of the next value in the whole input
+    position: int
+    matched: int
+    anomalies: list[Anomaly]
+    progress: Progress
+    # predictions not compared yet
+    predicted: deque[int]
+    # number of predictions compared, and a copy of the generator after some
+    # of them, to find the state when the generator is ahead
+    consumed: int
+    checkpoint: tuple[int, IntegerRNG[StateT]]
+    # values collected since the last mismatch, None when in sync
+    pending: list[int] | None
+    # offsets in `predicted` by the hash of the `RESYNC` values there
+    index: dict[int, list[int]]
+    observed: RollingHash
+
+    def __init__(
+        self,
+        generator: IntegerRNG[StateT],
+        confirm_samples: int = CONFIRM_SAMPLES,
+        tolerance: int = 1,
+        position: int = 0,
+    ) -> None:
+        """Verify `generator`, positioned before the value at `position`."""
+        self.generator = generator
+        self.confirm_samples = confirm_samples
+        self.tolerance = tolerance
+        self.position = position
+        self.matched = 0
+        self.anomalies = []
+        self.progress = Progress.CANDIDATE
+        self.predicted = deque()
+        self.consumed = 0
+        self.checkpoint = (0, generator.fork())
+        self.pending = None
+        self.index = {}
+        self.observed = RollingHash()
+        self.check()
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Compare the values with the predicted ones, aligning them if needed."""
+        if not self.predicted:
+            self.checkpoint = (self.consumed, self.generator.fork())
+
+        for value in integers(values):
+            if self.progress is Progress.REJECTED:
+                break
+            self.push(value)
+
+        self.check()
+        return self.progress
+
+    def push(self, value: int) -> None:
+        """Compare a single value."""
+        if self.pending is not None:
+            self.collect(value)
+        elif value == self.predict(0):
+            self.consume(1)
+            self.matched += 1
+            self.position += 1
+        else:
+            self.pending = []
+            self.index = self.resync_index()
+            self.observed = RollingHash()
+            self.collect(value)
+
+    def predict(self, offset: int) -> int:
+        """Return the prediction `offset` values after the next one."""
+        while len(self.predicted) <= offset:
+            self.predicted.append(next(self.generator))
+
+        return self.predicted[offset]
+
+    def consume(self, count: int) -> None:
+        """Drop the next predictions, which were compared."""
+        for _ in range(count):
+            _ = self.predicted.popleft()
+        self.consumed += count
+
+    def resync_index(self) -> dict[int, list[int]]:
+        """Index the predictions where the values may continue after a gap."""
+        _ = self.predict(MAX_GAP + RESYNC - 1)
+        hashed = RollingHash()
+        index: dict[int, list[int]] = {}
+
+        for offset, value in enumerate(self.predicted):
+            if (key := hashed.push(value)) is not None:
+                index.setdefault(key, []).append(offset + 1 - RESYNC)
+
+        return index
+
+    def collect(self, value: int) -> None:
+        """Collect a value after a mismatch, aligning once the predictions continue."""
+        assert self.pending is not None, "Must be out of sync"
+
+        self.pending.append(value)
+        skipped = len(self.pending) - RESYNC
+
+        if (key := self.observed.push(value)) is not None:
+            tail = self.pending[skipped:]
+            matches = [
+                offset
+                for offset in self.index.get(key, [])
+                if [self.predicted[offset + i] for i in range(RESYNC)] == tail
+            ]
+            if matches:
+                # the fewest anomalies, then the fewest dropped values
+                missed = min(matches, key=lambda o: (max(o, skipped), o))
+                self.align(skipped, missed)
+                return
+
+        if skipped >= MAX_GAP:
+            self.progress = Progress.REJECTED
+
+    def align(self, skipped: int, missed: int) -> None:
+        """Record the anomalies before `skipped` values and `missed` predictions."""
+        assert self.pending is not None, "Must be out of sync"
+
+        expected = [self.predict(offset) for offset in range(missed)]
+        self.anomalies.extend(
+            anomalies(self.pending[:skipped], expected, self.position)
+        )
+        if len(self.anomalies) > self.tolerance:
+            self.progress = Progress.REJECTED
+            return
+
+        self.position += skipped
+        self.consume(missed)
+
+        # the rest of the values continue in sync
+        rest, self.pending = self.pending[skipped:], None
+        for value in rest:
+            self.push(value)
+
+    def check(self) -> None:
+        """Confirm the candidate once it predicted enough values."""
+        if self.progress is Progress.CANDIDATE and self.matched >= self.confirm_samples:
+            self.progress = Progress.CONFIRMED
+
+    @override
+    def finish(self) -> Alignment | None:
+        """Return the state with the anomalies unless there were too many."""
+        if self.pending is not None and self.progress is not Progress.REJECTED:
+            # the values after the last mismatch are taken as corrupted
+            self.align(len(self.pending), len(self.pending))
+
+        if self.progress is Progress.REJECTED:
+            return None
+
+        inserted = sum(anomaly.kind != "dropped" for anomaly in self.anomalies)
+        total = self.matched + inserted
+        score = self.matched / total if total else 1.0
+        return Alignment(self.state(), score, self.anomalies)
+
+    def state(self) -> StateT:
+        """Return the state of the generator after the last compared prediction."""
+        if not self.predicted:
+            return self.generator.state()
+
+        consumed, checkpoint = self.checkpoint
+        generator = checkpoint.fork()
+        for _ in range(self.consumed - consumed):
+            _ = next(generator)
+
+        return generator.state()
+
+
+def anomalies(actual: list[int], expected: list[int], position: int) -> list[Anomaly]:
+    """Return the anomalies between the values and predictions skipped by a gap."""
+    corrupted = min(len(actual), len(expected))
+    found = [
+        Anomaly("corrupted", position + i, expected[i], actual[i])
+        for i in range(corrupted)
+    ]
+    found.extend(
+        Anomaly("inserted", position + i, None, actual[i])
+        for i in range(corrupted, len(actual))
+    )
+    found.extend(
+        Anomaly("dropped", position + len(actual), expected[i], None)
+        for i in range(corrupted, len(expected))
+    )
+    return found
+
+
+def align[StateT](
+    values: Iterable[int], generator: IntegerRNG[StateT], tolerance: int
+) -> Alignment | None:
+    """Align a sequence with the predictions of `generator`, positioned before it."""
+    return TolerantVerifier(generator, 0, tolerance).run(values)
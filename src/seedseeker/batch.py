@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from itertools import islice
+from typing import NamedTuple
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.feed import Reverser, as_feed
+from seedseeker.prescreen import SAMPLE_SIZE, rank
+from seedseeker.utils.binary import BinaryStream
+from seedseeker.utils.filestream import FileStream
+
+# number of captures queued per worker, bounds the memory used by the queue
+QUEUE_DEPTH = 4
+
+
+class Capture(NamedTuple):
+    """A sequence to reverse, given inline or as a path to a file."""
+
+    id: str
+    values: list[int] | None
+    path: str | None
+    # why the capture can not be read, for malformed manifest entries
+    error: str | None = None
+
+
+class Options(NamedTuple):
+    """How every capture of a batch is reversed."""
+
+    reversers: dict[str, Reverser]
+    # whether the reversers were selected explicitly and must not be skipped
+    explicit: bool
+    # number of values to reverse, 0 for all of them
+    limit: int
+    # format of capture files, see `--format`
+    layout: str
+    # stop after the first matching generator
+    first: bool
+
+
+class Result(NamedTuple):
+    """Outcome of reversing a capture with one generator."""
+
+    id: str
+    # None when no generator matched or the capture could not be read, the
+    # failing reverser when it raised an exception
+    generator: str | None
+    state: str | None
+    elapsed: float
+    error: str | None = None
+
+    def to_json(self) -> str:
+        """Return the result as a single line of JSON."""
+        return json.dumps(self._asdict())
+
+
+def captures(source: str) -> Iterator[Capture]:
+    """
+    Yield the captures in a directory or a JSONL manifest, lazily.
+
+    Every file in a directory is a capture identified by its name. Every line
+    of a manifest is an object with an `id` and either `values`, a list of
+    integers, or `path` to a file, relative to the manifest. A malformed line
+    is yielded as a capture without an id and with the error.
+    """
+    if os.path.isdir(source):
+        with os.scandir(source) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield Capture(entry.name, None, entry.path)
+        return
+
+    base = os.path.dirname(source)
+
+    with open(source) as manifest:
+        for line_number, line in enumerate(manifest, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                capture = parse_entry(line, line_number, base)
+            except InvalidFormatError as e:
+                capture = Capture("", None, None, str(e))
+
+            yield capture
+
+
+def parse_entry(line: str, line_number: int, base: str) -> Capture:
+    """Parse a single line of a manifest."""
+    try:
+        entry = json.loads(line)
+        capture_id = str(entry["id"])
+        values, path = entry.get("values"), entry.get("path")
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidFormatError(f"Invalid manifest entry on line {line_number}") from e
+
+    if (values is None) == (path is None):
+        raise InvalidFormatError(
+            f"Manifest entry on line {line_number} needs either values or a path"
+        )
+
+    if values is not None and not (
+        isinstance(values, list) and all(isinstance(v, int) for v in values)
+    ):
+        raise InvalidFormatError(
+            f"Manifest entry on line {line_number} needs a list of integer values"
+        )
+
+    return Capture(
+        capture_id, values, None if path is None else os.path.join(base, path)
+    )
+
+
+def read_capture(capture: Capture, options: Options) -> list[int]:
+    """Return the values of a capture to reverse."""
+    limit = options.limit if options.limit > 0 else None
+
+    if capture.error is not None:
+        raise InvalidFormatError(capture.error)
+
+    if capture.values is not None:
+        return capture.values[:limit]
+
+    assert capture.path is not None
+    if not os.path.isfile(capture.path):
+        raise InvalidFormatError(f"File `{capture.path}` does not exist")
+
+    if options.layout == "text":
+        with FileStream(capture.path) as stream:
+            return list(islice(stream.integers(), limit))
+
+    with BinaryStream(capture.path, options.layout) as binary:
+        return list(islice(binary, limit))
+
+
+def reverse_capture(capture: Capture, options: Options) -> list[Result]:
+    """Worker entry point, try every reverser on a single capture."""
+    started = time.perf_counter()
+
+    try:
+        values = read_capture(capture, options)
+    except (InvalidFormatError, OSError) as e:
+        elapsed = time.perf_counter() - started
+        return [Result(capture.id, None, None, elapsed, str(e))]
+
+    results = []
+    found = False
+
+    for verdict in rank(values[:SAMPLE_SIZE], list(options.reversers)):
+        if verdict.reason is not None and not options.explicit:
+            continue
+
+        reverser_started = time.perf_counter()
+        try:
+            state = as_feed(options.reversers[verdict.name]).run(values)
+        except Exception as e:
+            # a failing reverser does not abort the others or the batch
+            elapsed = time.perf_counter() - reverser_started
+            results.append(Result(capture.id, verdict.name, None, elapsed, repr(e)))
+            continue
+
+        if state is not None:
+            elapsed = time.perf_counter() - reverser_started
+            results.append(Result(capture.id, verdict.name, str(state), elapsed))
+            found = True
+
+            if options.first:
+                break
+
+    if not found:
+        results.append(Result(capture.id, None, None, time.perf_counter() - started))
+
+    return results
+
+
+def batch(
+    source: Iterator[Capture], options: Options, jobs: int | None = None
+) -> Iterator[Result]:
+    """
+    Reverse captures on a pool of worker processes.
+
+    Workers stay alive for the whole batch and take the next capture as soon
+    as they finish one. Only a few captures per worker are read ahead, so the
+    batch can be arbitrarily long. Results are yielded as captures finish.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    depth = QUEUE_DEPTH * jobs
+
+    with ProcessPoolExecutor(jobs) as pool:
+        running: set[Future[list[Result]]] = set()
+
+        for capture in source:
+            running.add(pool.submit(reverse_capture, capture, options))
+
+            if len(running) >= depth:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        for future in as_completed(running):
+            yield from future.result()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from functools import partial
+from hashlib import blake2b
+from itertools import batched, chain, islice
+from typing import Any, NamedTuple, override
+
+from seedseeker.feed import FeedReverser, Progress, Reverser, Verifier, as_feed
+from seedseeker.utils.fingerprint import FINGERPRINT_SIZE
+from seedseeker.utils.iterator import BLOCK_SIZE, integers
+
+# bump when the meaning of cached results changes
+CACHE_VERSION = 1
+
+# default cap on the total size of the cache directory
+CACHE_SIZE = 64 * 2**20
+
+# number of values at the beginning of a sequence that its key is made from
+KEY_SIZE = 64
+
+# most values of the input kept while comparing it with a cached sequence,
+# past them the original reverser is fed the input in case it differs
+HEAD_SIZE = 2**16
+
+
+class ValuesDigest:
+    """Incremental hash of a sequence of integers."""
+
+    hash: Any
+    count: int
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """Start hashing, optionally with some values."""
+        self.hash = blake2b(digest_size=FINGERPRINT_SIZE)
+        self.count = 0
+        self.update(values)
+
+    def update(self, values: Iterable[int]) -> None:
+        """Add values to the hash."""
+        for block in batched(values, BLOCK_SIZE):
+            self.hash.update("".join(f"{value}\n" for value in block).encode())
+            self.count += len(block)
+
+    def hexdigest(self) -> str:
+        """Return the hash of all values so far."""
+        return self.hash.hexdigest()
+
+    def digested(self, values: Iterable[int]) -> Iterator[int]:
+        """Iterate over `values`, adding them to the hash."""
+        for block in batched(values, BLOCK_SIZE):
+            self.update(block)
+            yield from block
+
+
+def qualified_name(reverser: Reverser) -> str:
+    """Return the name of a reverser, with the options it was given."""
+    if isinstance(reverser, partial):
+        options = [repr(arg) for arg in reverser.args]
+        options.extend(f"{k}={v!r}" for k, v in sorted(reverser.keywords.items()))
+        return f"{qualified_name(reverser.func)}({', '.join(options)})"
+
+    return f"{reverser.__module__}.{reverser.__qualname__}"
+
+
+class CacheEntry(NamedTuple):
+    """Result of a reverser on a whole sequence."""
+
+    # None when the reverser rejected the sequence
+    state: str | None
+    # length and hash of the sequence
+    count: int
+    digest: str
+
+
+class ResultCache:
+    """
+    On-disk cache of reverser results, keyed by the beginning of the input.
+
+    Every entry is a file named after the hash of the reverser, its version
+    and the first values of the sequence. When the cache grows over
+    `max_size` bytes, the least recently used entries are removed.
+    """
+
+    path: str
+    max_size: int
+    version: str
+
+    def __init__(
+        self, path: str, max_size: int = CACHE_SIZE, version: str = ""
+    ) -> None:
+        """Use directory `path`, created when missing."""
+        self.path = path
+        self.max_size = max_size
+        self.version = f"{CACHE_VERSION}:{version}"
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, name: str, reverser: Reverser, prefix: list[int]) -> str:
+        """Return the key of a reverser's result on a sequence with `prefix`."""
+        identity = f"{self.version}:{name}:{qualified_name(reverser)}"
+        digest = ValuesDigest(prefix[:KEY_SIZE])
+        digest.hash.update(identity.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for `key` and mark it as recently used."""
+        path = os.path.join(self.path, key)
+
+        try:
+            with open(path) as file:
+                entry = CacheEntry(**json.load(file))
+            os.utime(path)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting old ones if the cache is too big."""
+        fd, temporary = tempfile.mkstemp(dir=self.path, prefix=".")
+
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry._asdict(), file)
+            os.replace(temporary, os.path.join(self.path, key))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits."""
+        entries = []
+
+        with os.scandir(self.path) as files:
+            for file in files:
+                if not file.name.startswith("."):
+                    stat = file.stat()
+                    entries.append((stat.st_mtime, stat.st_size, file.path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+            total -= size
+
+
+class CachedReverser(FeedReverser[Any]):
+    """
+    Reuses a cached result when the input starts with its sequence.
+
+    The cached state is the state after the cached sequence, so only the rest
+    of the input has to be verified. When the beginning of the input differs,
+    the original reverser runs on the whole input instead. The beginning is
+    hashed as it arrives, only up to `HEAD_SIZE` values of it are kept for the
+    original reverser, which is fed the rest of a longer one right away.
+    """
+
+    entry: CacheEntry
+    reverser: Reverser
+    generator_class: Any
+    # values of the input that the original reverser was not fed yet
+    head: list[int]
+    # hash of the values compared with the cached sequence
+    digest: ValuesDigest
+    # whether the head of the input is the cached sequence, once it is known
+    matched: bool | None
+    # original reverser, fed the head in case it differs
+    speculative: FeedReverser[Any] | None
+    # reverser the rest of the input is passed to
+    delegate: FeedReverser[Any] | None
+
+    def __init__(
+        self, entry: CacheEntry, reverser: Reverser, generator_class: Any
+    ) -> None:
+        """Reuse `entry`, falling back to `reverser`."""
+        self.entry = entry
+        self.reverser = reverser
+        self.generator_class = generator_class
+        self.head = []
+        self.digest = ValuesDigest()
+        self.matched = None
+        self.speculative = None
+        self.delegate = None
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Compare the head with the cached sequence, then pass values on."""
+        values = integers(values)
+
+        if self.delegate is None:
+            self.compare(list(islice(values, self.entry.count - self.digest.count)))
+            if self.digest.count < self.entry.count:
+                return Progress.NOT_YET
+
+            if self.matched is None:
+                self.matched = self.digest.hexdigest() == self.entry.digest
+
+            if not self.matched:
+                self.delegate = self.fall_back()
+            elif self.entry.state is not None:
+                state = self.generator_class.state_from_string(self.entry.state)
+                # the state was confirmed when it was cached
+                generator = self.generator_class.from_state(state)
+                self.delegate = Verifier(generator, confirm_samples=0)
+                self.head, self.speculative = [], None
+            elif (extra := next(values, None)) is None:
+                # the sequence was rejected as a whole, unless more values come
+                return Progress.REJECTED
+            else:
+                self.delegate = self.fall_back()
+                values = chain([extra], values)
+
+        return self.delegate.feed(values)
+
+    def compare(self, values: list[int]) -> None:
+        """Hash values of the head, keeping them for the original reverser."""
+        self.digest.update(values)
+        self.head.extend(values)
+
+        if len(self.head) > HEAD_SIZE:
+            self.speculative = self.fall_back()
+
+    @override
+    def finish(self) -> Any:
+        """Return the state after the input."""
+        if self.delegate is None and self.digest.count < self.entry.count:
+            self.delegate = self.fall_back()
+
+        return None if self.delegate is None else self.delegate.finish()
+
+    def fall_back(self) -> FeedReverser[Any]:
+        """Return the original reverser, fed the head of the input."""
+        delegate = self.speculative
+        if delegate is None:
+            delegate = as_feed(self.reverser)
+        _ = delegate.feed(self.head)
+        self.head = []
+        return delegate
+
+
+def verify_cached(
+    entry: CacheEntry, reverser: Reverser, generator_class: Any, values: Iterable[int]
+) -> Any:
+    """Reverse `values`, reusing a cached result (see `CachedReverser`)."""
+    return CachedReverser(entry, reverser, generator_class).run(values)
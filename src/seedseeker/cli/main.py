@@ -1,41 +1,33 @@
+from __future__ import annotations
+
+import os
 import sys
+import time
 from argparse import ArgumentParser, Namespace
 from contextlib import nullcontext
+from functools import partial
 from itertools import islice
-from typing import Any, TextIO
+from typing import TYPE_CHECKING, Any, TextIO
 
 from seedseeker.defs import InvalidFormatError
-from seedseeker.generators import (
-    FibonacciRng,
-    Lcg,
-    MersenneTwister,
-    Ran3,
-    Xoshiro,
-    reverse_fibonacci,
-    reverse_lcg,
-    reverse_mersenne,
-    reverse_ran3,
-    reverse_xoshiro,
-)
-from seedseeker.utils.filestream import FileStream
+from seedseeker.registry import GENERATORS, REVERSERS
+from seedseeker.utils.binary import BINARY_FORMATS
 
-VERSION = "0.1.2"
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
-GENERATORS = {
-    "fibonacci": FibonacciRng,
-    "lcg": Lcg,
-    "ran3": Ran3,
-    "mersenne": MersenneTwister,
-    "xoshiro": Xoshiro,
-}
+    from seedseeker.cache import ResultCache, ValuesDigest
+    from seedseeker.dispatch import Outcome
+    from seedseeker.profiling import Usage
+    from seedseeker.utils.binary import BinaryStream
+    from seedseeker.utils.filestream import FileStream
+    from seedseeker.utils.stream import SharedStream
+    from seedseeker.utils.throughput import Meter
 
-REVERSERS = {
-    "fibonacci": reverse_fibonacci,
-    "lcg": reverse_lcg,
-    "ran3": reverse_ran3,
-    "xoshiro": reverse_xoshiro,
-    "mersenne": reverse_mersenne,
-}
+# modules used by a single command (multiprocessing, asyncio, ...) are imported
+# by that command, so that starting the program stays cheap
+
+VERSION = "0.1.2"
 
 
 def main() -> None:
@@ -78,8 +70,77 @@ def main() -> None:
         ),
     )
 
+    command_group.add_argument(
+        "--scan",
+        action="store_true",
+        help=(
+            "Searches the whole input for runs of generator output, which may start"
+            " anywhere, and prints every run with its offsets as JSON lines"
+        ),
+    )
+
+    command_group.add_argument(
+        "--sparse",
+        action="store_true",
+        help=(
+            "Reverses values observed only at known indices, given as pairs of an"
+            " index and a value, and prints all matching generator states"
+        ),
+    )
+
+    command_group.add_argument(
+        "--deinterleave",
+        action="store_true",
+        help=(
+            "Splits a sequence drawn from several generators in a fixed rotation"
+            " into streams and prints the state of every stream as JSON lines"
+        ),
+    )
+
+    command_group.add_argument(
+        "-m",
+        "--monitor",
+        action="store_true",
+        help=(
+            "Follows a growing input, identifies its generator and then checks every"
+            " new value against its predictions, printing events as JSON lines"
+        ),
+    )
+
+    command_group.add_argument(
+        "-b",
+        "--batch",
+        metavar="<source>",
+        help=(
+            "Reverses every capture in a directory or a JSONL manifest and prints"
+            " the results as JSON lines"
+        ),
+    )
+
+    command_group.add_argument(
+        "--daemon",
+        metavar="<address>",
+        help=(
+            "Serves reverse, predict and generate requests as JSON lines on a Unix"
+            " socket path, a localhost port or a loopback host:port"
+        ),
+    )
+
     parser.add_argument("-i", "--input", metavar="<file>", help="Reads input from file")
 
+    parser.add_argument(
+        "--format",
+        metavar="<format>",
+        choices=["text", *BINARY_FORMATS],
+        default="text",
+        help=(
+            "Format of the sequence read by --reverse and --scan or written by"
+            " --generate and --predict: text (one integer per line, default), raw"
+            " unsigned integers (u32le, u32be, u64le, u64be) or a NumPy .npy array"
+            " (npy)"
+        ),
+    )
+
     parser.add_argument(
         "-o", "--output", metavar="<file>", help="Writes output to file"
     )
@@ -90,7 +151,123 @@ def main() -> None:
         metavar="<total>",
         help=(
             "Length of the sequence to reverse or generate/predict. Defaults to 1024"
-            " or 16 respectively"
+            " or 16 respectively, 0 reverses the whole input. When scanning or"
+            " deinterleaving, defaults to the whole input, and so does the number"
+            " of pairs reversed by --sparse. When monitoring, the"
+            " number of values to identify the generator in, defaults to 4096"
+        ),
+    )
+
+    parser.add_argument(
+        "--generators",
+        metavar="<names>",
+        help=(
+            "Comma-separated list of generators to try when reversing. Defaults to"
+            " all generators that are not ruled out by the input"
+        ),
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="<count>",
+        type=int,
+        help="Number of reversers to run in parallel. Defaults to all of them",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        metavar="<seconds>",
+        type=float,
+        help="Stop each reverser after the given time",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--first",
+        action="store_true",
+        help="Stop the remaining reversers after the first matching state",
+    )
+
+    parser.add_argument(
+        "--tolerate",
+        metavar="<count>",
+        type=int,
+        default=0,
+        help=(
+            "Accept up to <count> dropped, inserted or corrupted values after the"
+            " reverser found a state, and print the match score and the anomalies"
+            " to stderr. Results are then not cached"
+        ),
+    )
+
+    parser.add_argument(
+        "--false-positive",
+        metavar="<probability>",
+        type=float,
+        help=(
+            "Verify each solved state on as many values as its generator needs for"
+            " random values to match it with at most the given probability, stop"
+            " reading then like --stop-early, and print the bound achieved to"
+            " stderr"
+        ),
+    )
+
+    parser.add_argument(
+        "--stop-early",
+        action="store_true",
+        help=(
+            "Stop each reverser once it confirmed or ruled out its generator,"
+            " instead of reading the whole sequence. The printed states are then"
+            " positioned where the reversers stopped, and no results are cached"
+        ),
+    )
+
+    parser.add_argument(
+        "--cache",
+        metavar="<directory>",
+        help=(
+            "Cache reversal results in the directory, so that reversing the same"
+            " sequence again only verifies the cached states"
+        ),
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        metavar="<MiB>",
+        type=int,
+        help=(
+            "Largest size of the cache, the least recently used results are"
+            " removed. Defaults to 64"
+        ),
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the throughput of every stage of the reversal to stderr",
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="<format>",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        help=(
+            "Print the wall and CPU time, values read, candidates tried and peak"
+            " memory of parsing, prescreening and every reverser to stderr, as a"
+            " table (default) or JSON"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile-dump",
+        metavar="<directory>",
+        help=(
+            "Profile every reverser with cProfile and write the statistics to"
+            " <directory>/<name>.prof, implies --profile"
         ),
     )
 
@@ -106,7 +283,7 @@ def main() -> None:
 
     try:
         with (
-            FileStream(args.input) as inp,
+            open_input(args) as inp,
             open(args.output, "w")
             if args.output is not None
             else nullcontext(sys.stdout) as out,
@@ -120,19 +297,49 @@ def main() -> None:
         sys.exit(2)
 
 
-def run_with_io(inp: FileStream, out: TextIO, args: Namespace) -> None:
+def open_input(args: Namespace) -> FileStream | BinaryStream:
+    """Return the input stream, only sequences to reverse can be binary."""
+    from seedseeker.utils.binary import BinaryStream  # noqa: PLC0415
+    from seedseeker.utils.filestream import FileStream  # noqa: PLC0415
+
+    if args.format == "text" or not (args.reverse or args.scan or args.deinterleave):
+        return FileStream(args.input, follow=args.monitor)
+
+    return BinaryStream(args.input, args.format)
+
+
+def run_with_io(inp: FileStream | BinaryStream, out: TextIO, args: Namespace) -> None:
     """Run the program with given IO."""
     if args.generate is not None:
         generate_numbers(out, args)
     elif args.reverse:
-        reverse_sequence(inp, out, args.length)
+        reverse_sequence(inp, out, args)
+    elif args.scan:
+        scan_sequence(inp, out, args)
+    elif args.sparse:
+        reverse_sparse(inp, out, args)
+    elif args.deinterleave:
+        deinterleave_sequence(inp, out, args)
+    elif args.monitor:
+        monitor_stream(inp, out, args)
+    elif args.batch is not None:
+        reverse_batch(out, args)
+    elif args.daemon is not None:
+        run_daemon(args)
     elif args.predict:
-        predict_numbers(inp, out, args.length)
+        predict_numbers(inp, out, args)
     else:
         print("Error: No command given", file=sys.stderr)
         sys.exit(1)
 
 
+def integers(inp: FileStream | BinaryStream) -> Iterator[int]:
+    """Return the values of the input, text is parsed in bulk."""
+    from seedseeker.utils.filestream import FileStream  # noqa: PLC0415
+
+    return inp.integers() if isinstance(inp, FileStream) else inp
+
+
 def int_or_default(value: Any, default: int) -> int:
     """Convert value to int if possible, otherwise return default."""
     try:
@@ -141,26 +348,485 @@ def int_or_default(value: Any, default: int) -> int:
         return default
 
 
-def reverse_sequence(inp: FileStream, out: TextIO, limit: str | None) -> None:
+def reverse_sequence(
+    inp: FileStream | BinaryStream, out: TextIO, args: Namespace
+) -> None:
     """Reverse the sequence and print all matching generator states."""
     try:
-        sequence = list(islice(map(int, inp), int_or_default(limit, 1024)))
-    except ValueError as e:
-        raise InvalidFormatError("Found non-integer value in input sequence") from e
+        found = reverse_values(inp, out, args)
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not found:
+        print("Error: No matching generator state found", file=sys.stderr)
+        sys.exit(1)
+
+
+def reverse_values(
+    inp: FileStream | BinaryStream, out: TextIO, args: Namespace
+) -> bool:
+    """
+    Print the states matching the input, return whether there were any.
+
+    The input is parsed as the reversers read it.
+    """
+    from seedseeker.cache import (  # noqa: PLC0415
+        CACHE_SIZE,
+        KEY_SIZE,
+        ResultCache,
+        ValuesDigest,
+    )
+    from seedseeker.dispatch import (  # noqa: PLC0415
+        EARLY_CHUNK_SIZE,
+        Status,
+        dispatch,
+    )
+    from seedseeker.prescreen import SAMPLE_SIZE  # noqa: PLC0415
+    from seedseeker.profiling import Clock, Profiling, Usage  # noqa: PLC0415
+    from seedseeker.utils.stream import CHUNK_SIZE, SharedStream  # noqa: PLC0415
+
+    options = verification_options(args)
+    profiling = (
+        Profiling(args.profile_dump)
+        if args.profile is not None or args.profile_dump is not None
+        else None
+    )
+
+    # reversers verifying for a probability stop once they reached it
+    early = args.stop_early or args.false_positive is not None
+
+    meter, source = counted_values(inp, args)
+
+    cache = None
+    digest = ValuesDigest()
+    # states found despite anomalies are not those of the exact sequence
+    if args.cache is not None and not args.tolerate:
+        size = CACHE_SIZE if args.cache_size is None else args.cache_size * 2**20
+        cache = ResultCache(args.cache, size, VERSION)
+        source = digest.digested(source)
+
+    # reversers stopping early stop at a chunk boundary, smaller chunks bring
+    # it closer to where they decided
+    stream = SharedStream(source, EARLY_CHUNK_SIZE if early else CHUNK_SIZE)
+
+    # the sample is parsed first, so that the prescreen time does not include it
+    sample = stream.peek(SAMPLE_SIZE)
+    prescreen = Clock()
+    with prescreen.measure():
+        reversers = select_reversers(stream, args.generators)
+
+    if options:
+        reversers = verifying(reversers, options)
+
+    keys = {}
+    if cache is not None:
+        keys = use_cache(cache, stream.peek(KEY_SIZE), reversers)
+
+    # states found by stopping early do not describe the whole sequence
+    store = cache is not None and not early
+
+    started = time.perf_counter()
+    found = False
+    outcomes: list[Outcome] = []
+    reported: list[Outcome] = []
+    for outcome in dispatch(
+        stream, reversers, args.jobs, args.timeout, early=early, profiling=profiling
+    ):
+        found = report_outcome(outcome, out) or found
+        reported.append(outcome)
+
+        if store and outcome.status in {Status.FOUND, Status.REJECTED}:
+            outcomes.append(outcome)
+
+        if found and args.first:
+            break
+
+    if store:
+        store_outcomes(cache, keys, source, digest, outcomes)
+
+    if args.stats:
+        meter.add(0, time.perf_counter() - started)
+        for stage in [*inp.meters, meter]:
+            print(stage, file=sys.stderr)
+
+    if profiling is not None:
+        prescreened = Usage("prescreen", prescreen.wall, prescreen.cpu, len(sample))
+        report_profile(inp.meters, prescreened, reported, args.profile or "table")
+
+    return found
+
+
+def counted_values(
+    inp: FileStream | BinaryStream, args: Namespace
+) -> tuple[Meter, Iterator[int]]:
+    """Return the values to reverse, up to the length limit, and their meter."""
+    from seedseeker.utils.throughput import Meter  # noqa: PLC0415
+
+    limit = int_or_default(args.length, 1024)
+    meter = Meter("reverse", "values")
+    return meter, meter.counted(islice(integers(inp), limit if limit > 0 else None))
+
+
+def store_outcomes(
+    cache: ResultCache,
+    keys: dict[str, str],
+    source: Iterator[int],
+    digest: ValuesDigest,
+    outcomes: list[Outcome],
+) -> None:
+    """Store the outcomes of the reversers for the whole sequence."""
+    from seedseeker.cache import CacheEntry  # noqa: PLC0415
+
+    # the entries describe the whole sequence, so the rest has to be hashed
+    for _ in source:
+        pass
+    for outcome in outcomes:
+        state = None if outcome.state is None else str(outcome.state)
+        entry = CacheEntry(state, digest.count, digest.hexdigest())
+        cache.put(keys[outcome.name], entry)
+
+
+def report_profile(
+    meters: list[Meter], prescreen: Usage, outcomes: list[Outcome], output_format: str
+) -> None:
+    """Print the time, values and memory used by every stage to stderr."""
+    from seedseeker.profiling import Usage, table, to_json  # noqa: PLC0415
+
+    stages = [
+        Usage(m.name, m.elapsed, m.cpu, m.amount if m.unit == "values" else None)
+        for m in meters
+    ]
+    stages.append(prescreen)
+    # reversers that timed out could not report
+    stages.extend(o.usage for o in outcomes if o.usage is not None)
+
+    print(
+        to_json(stages) if output_format == "json" else table(stages), file=sys.stderr
+    )
+
+
+def verification_options(args: Namespace) -> dict[str, Any]:
+    """Return the options for the reversers that verify a solved state."""
+    options: dict[str, Any] = {}
+
+    if args.tolerate:
+        options["tolerance"] = args.tolerate
+
+    if args.false_positive is not None:
+        if not 0 < args.false_positive < 1:
+            print(
+                "Error: False positive probability must be between 0 and 1",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        options["false_positive"] = args.false_positive
+
+    return options
+
+
+def verifying(reversers: dict[str, Any], options: dict[str, Any]) -> dict[str, Any]:
+    """Pass verification options to the reversers that verify a solved state."""
+    from seedseeker.feed import slides  # noqa: PLC0415
+
+    for name, reverser in reversers.items():
+        if slides(reverser):
+            reversers[name] = partial(reverser, **options)
+        elif "tolerance" in options:
+            print(
+                f"Warning: {name} reverser can not tolerate anomalies", file=sys.stderr
+            )
+        else:
+            print(
+                f"Warning: {name} reverser does not bound false positives",
+                file=sys.stderr,
+            )
+
+    return reversers
+
+
+def report_outcome(outcome: Outcome, out: TextIO) -> bool:
+    """Print the outcome of a reverser, return whether it found a state."""
+    from seedseeker.align import Alignment  # noqa: PLC0415
+    from seedseeker.dispatch import Status  # noqa: PLC0415
+    from seedseeker.feed import Confidence  # noqa: PLC0415
+
+    match outcome.status:
+        case Status.FOUND:
+            print(f"{outcome.name} {outcome.state}", file=out, flush=True)
+            if isinstance(outcome.state, Alignment) and outcome.state.anomalies:
+                print(
+                    f"Warning: {outcome.name} {outcome.state.to_json()}",
+                    file=sys.stderr,
+                )
+            if isinstance(outcome.state, Confidence):
+                print(
+                    f"Confidence: {outcome.name} {outcome.state.to_json()}",
+                    file=sys.stderr,
+                )
+            return True
+        case Status.TIMEOUT:
+            print(f"Warning: {outcome.name} reverser timed out", file=sys.stderr)
+        case Status.FAILED:
+            print(
+                f"Warning: {outcome.name} reverser failed: {outcome.state}",
+                file=sys.stderr,
+            )
+        case Status.REJECTED:
+            pass
+
+    return False
+
+
+def use_cache(
+    cache: ResultCache, prefix: list[int], reversers: dict[str, Any]
+) -> dict[str, str]:
+    """
+    Replace reversers that have a cached result by its verification.
+
+    Return the cache keys of all reversers.
+    """
+    from seedseeker.cache import CachedReverser  # noqa: PLC0415
+
+    keys = {}
+
+    for name, reverser in reversers.items():
+        keys[name] = cache.key(name, reverser, prefix)
+
+        if (entry := cache.get(keys[name])) is not None:
+            generator_class = GENERATORS[name]
+            reversers[name] = partial(CachedReverser, entry, reverser, generator_class)
+
+    return keys
+
+
+def select_reversers(stream: SharedStream, selection: str | None) -> dict[str, Any]:
+    """
+    Order the reversers by likelihood and skip the impossible ones.
+
+    Explicitly selected generators are never skipped.
+    """
+    from seedseeker.prescreen import SAMPLE_SIZE, rank  # noqa: PLC0415
+
+    names = generator_names(selection)
+    reversers: dict[str, Any] = {}
+
+    for verdict in rank(stream.peek(SAMPLE_SIZE), names):
+        if verdict.reason is None or selection is not None:
+            reversers[verdict.name] = REVERSERS[verdict.name]
+        else:
+            print(f"Skipping {verdict.name}: {verdict.reason}", file=sys.stderr)
+
+    return reversers
+
+
+def generator_names(selection: str | None) -> list[str]:
+    """Return the comma-separated generators, or all of them if None."""
+    names = list(REVERSERS) if selection is None else selection.split(",")
+
+    for name in names:
+        if name not in REVERSERS:
+            print(f"Error: Unknown generator {name}", file=sys.stderr)
+            sys.exit(1)
+
+    return names
+
+
+def scan_sequence(inp: FileStream | BinaryStream, out: TextIO, args: Namespace) -> None:
+    """Print every run of generator output found in the input."""
+    from seedseeker.feed import slides  # noqa: PLC0415
+    from seedseeker.scan import scan  # noqa: PLC0415
+
+    reversers = {}
+    for name in generator_names(args.generators):
+        if slides(REVERSERS[name]):
+            reversers[name] = REVERSERS[name]
+        else:
+            print(f"Skipping {name}: its reverser can not scan", file=sys.stderr)
+
+    limit = int_or_default(args.length, 0)
+    values = integers(inp)
+
+    try:
+        values = list(islice(values, limit if limit > 0 else None))
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
     found = False
-    for name, reverser in REVERSERS.items():
-        if (state := reverser(iter(sequence))) is not None:
-            print(f"{name} {state}", file=out)
+    for segment in scan(values, reversers):
+        print(segment.to_json(), file=out, flush=True)
+        found = True
+
+    if not found:
+        print("Error: No generator output found", file=sys.stderr)
+        sys.exit(1)
+
+
+def reverse_sparse(
+    inp: FileStream | BinaryStream, out: TextIO, args: Namespace
+) -> None:
+    """Reverse values at known indices and print all matching generator states."""
+    from itertools import batched  # noqa: PLC0415
+
+    from seedseeker.registry import PLUGINS, load  # noqa: PLC0415
+    from seedseeker.utils.filestream import FileStream  # noqa: PLC0415
+
+    assert isinstance(inp, FileStream), "Sparse input must be text"
+
+    reversers = {}
+    for name in generator_names(args.generators):
+        if (path := PLUGINS[name].sparse) is not None:
+            reversers[name] = load(path)
+        else:
+            print(
+                f"Skipping {name}: its reverser needs consecutive values",
+                file=sys.stderr,
+            )
+
+    limit = int_or_default(args.length, 0)
+
+    try:
+        values = list(islice(inp.integers(), 2 * limit if limit > 0 else None))
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if len(values) % 2 != 0:
+        print("Error: Expected an index and a value for every sample", file=sys.stderr)
+        sys.exit(1)
+
+    pairs = list(batched(values, 2))
+    found = False
+
+    for name, reverser in reversers.items():
+        if (state := reverser(pairs)) is not None:
+            print(f"{name} {state}", file=out, flush=True)
             found = True
 
+            if args.first:
+                break
+
     if not found:
         print("Error: No matching generator state found", file=sys.stderr)
         sys.exit(1)
 
 
+def deinterleave_sequence(
+    inp: FileStream | BinaryStream, out: TextIO, args: Namespace
+) -> None:
+    """Print the state of every interleaved stream."""
+    from seedseeker.batch import Options  # noqa: PLC0415
+    from seedseeker.interleave import separate  # noqa: PLC0415
+
+    options = Options(
+        {name: REVERSERS[name] for name in generator_names(args.generators)},
+        args.generators is not None,
+        0,
+        args.format,
+        first=True,
+    )
+
+    limit = int_or_default(args.length, 0)
+    values = integers(inp)
+
+    try:
+        values = list(islice(values, limit if limit > 0 else None))
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    streams = separate(values, options, args.jobs)
+
+    for stream in streams:
+        print(stream.to_json(), file=out, flush=True)
+
+    if not streams:
+        print("Error: No generator found for every stream", file=sys.stderr)
+        sys.exit(1)
+
+
+def monitor_stream(
+    inp: FileStream | BinaryStream, out: TextIO, args: Namespace
+) -> None:
+    """Follow the input until it ends or the user interrupts."""
+    from seedseeker.monitor import WINDOW, Monitor  # noqa: PLC0415
+    from seedseeker.utils.filestream import FileStream  # noqa: PLC0415
+
+    assert isinstance(inp, FileStream), "Monitored input must be text"
+
+    window = int_or_default(args.length, WINDOW)
+    monitor = Monitor(
+        {name: REVERSERS[name] for name in generator_names(args.generators)},
+        GENERATORS,
+        window if window > 0 else None,
+    )
+
+    try:
+        for event in monitor.run(inp.integer_blocks()):
+            print(event.to_json(), file=out, flush=True)
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+    if args.stats:
+        for stage in [*inp.meters, monitor.verify, monitor.latency]:
+            print(stage, file=sys.stderr)
+
+
+def reverse_batch(out: TextIO, args: Namespace) -> None:
+    """Reverse every capture of a batch, printing results as they finish."""
+    from seedseeker.batch import Options, batch, captures  # noqa: PLC0415
+
+    if args.timeout is not None:
+        # a capture can not be stopped without stopping its worker process
+        print("Error: --timeout can not be used with --batch", file=sys.stderr)
+        sys.exit(1)
+
+    options = Options(
+        {name: REVERSERS[name] for name in generator_names(args.generators)},
+        args.generators is not None,
+        int_or_default(args.length, 1024),
+        args.format,
+        args.first,
+    )
+
+    if not os.path.exists(args.batch):
+        print(
+            f"Error: File `{args.batch}` does not exist or is not accessible",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    for result in batch(captures(args.batch), options, args.jobs):
+        print(result.to_json(), file=out, flush=True)
+
+
+def run_daemon(args: Namespace) -> None:
+    """Serve requests until interrupted."""
+    from seedseeker.daemon import Daemon, serve  # noqa: PLC0415
+
+    daemon = Daemon(GENERATORS, REVERSERS, args.jobs)
+
+    try:
+        serve(
+            args.daemon,
+            daemon,
+            lambda: print(f"Listening on {args.daemon}", file=sys.stderr),
+        )
+    except (OSError, InvalidFormatError) as e:
+        print(f"Error: Can not listen on `{args.daemon}`: {e}", file=sys.stderr)
+        sys.exit(2)
+    except KeyboardInterrupt:
+        pass
+
+
 def generate_numbers(out: TextIO, args: Namespace) -> None:
     """Generate numbers from given generator args."""
+    from seedseeker.utils.writer import ValueWriter  # noqa: PLC0415
+
     name, parameters = args.generate
 
     count = int_or_default(args.length, 16)
@@ -169,24 +835,28 @@ def generate_numbers(out: TextIO, args: Namespace) -> None:
         print(f"Error: Unknown generator {name}", file=sys.stderr)
         sys.exit(1)
 
+    writer = ValueWriter(out, args.format)
+
     try:
-        print(
-            *islice(GENERATORS[name].from_string(parameters), count),
-            file=out,
-            sep="\n",
-        )
+        generator = GENERATORS[name].from_string(parameters)
+        writer.begin((count,))
+        writer.write(islice(generator, count))
+        writer.end()
     except (InvalidFormatError, AssertionError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def predict_numbers(inp: FileStream, out: TextIO, count: int | None) -> None:
+def predict_numbers(inp: FileStream, out: TextIO, args: Namespace) -> None:
     """Predict numbers from saved states."""
-    limit = int_or_default(count, 16)
+    from seedseeker.utils.writer import ValueWriter  # noqa: PLC0415
+
+    limit = int_or_default(args.length, 16)
+    generators: list[Any] = []
 
     for line in inp:
         try:
-            name, args = line.split()
+            name, state = line.split()
         except ValueError:
             print(
                 f"Error: Invalid input line '{line}', expected <name> <state>",
@@ -201,9 +871,20 @@ def predict_numbers(inp: FileStream, out: TextIO, count: int | None) -> None:
         generator_class = GENERATORS[name]
 
         try:
-            state = generator_class.state_from_string(args)
+            generators.append(
+                generator_class.from_state(generator_class.state_from_string(state))
+            )
         except InvalidFormatError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
 
-        print(*islice(generator_class.from_state(state), limit), file=out, sep=";")
+    writer = ValueWriter(out, args.format)
+
+    try:
+        writer.begin((len(generators), limit))
+        for generator in generators:
+            writer.write(islice(generator, limit), separator=";")
+        writer.end()
+    except InvalidFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
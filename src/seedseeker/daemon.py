@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import json
+import multiprocessing
+import os
+import signal
+from collections.abc import Callable
+from functools import partial
+from itertools import islice
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Any, NamedTuple
+
+from seedseeker.batch import Capture, Options, reverse_capture
+from seedseeker.defs import InvalidFormatError
+from seedseeker.feed import Reverser
+
+# largest number of values a single generate or predict request may ask for
+MAX_COUNT = 2**20
+
+# requests of a single connection that may be in flight before it is not read
+MAX_IN_FLIGHT = 64
+
+# longest accepted request line
+MAX_LINE = 2**24
+
+
+class Address(NamedTuple):
+    """Where the daemon listens, a Unix socket path or a TCP host and port."""
+
+    path: str | None
+    host: str | None
+    port: int | None
+
+    @staticmethod
+    def parse(address: str) -> Address:
+        """
+        Parse `path`, `port` or `host:port`.
+
+        A bare port listens on localhost only. Requests are not authenticated,
+        so hosts other than the loopback interface are refused.
+        """
+        if address.isdigit():
+            return Address(None, "127.0.0.1", int(address))
+
+        host, _, port = address.rpartition(":")
+        if host and port.isdigit():
+            host = host.removeprefix("[").removesuffix("]")
+            if not is_loopback(host):
+                raise InvalidFormatError(f"Can only listen on localhost, not {host}")
+            return Address(None, host, int(port))
+
+        return Address(address, None, None)
+
+    def __str__(self) -> str:
+        """Return the address as given on the command line."""
+        return self.path if self.path is not None else f"{self.host}:{self.port}"
+
+
+def is_loopback(host: str) -> bool:
+    """Return whether `host` is the loopback interface."""
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Request(NamedTuple):
+    """A single JSON request."""
+
+    id: Any
+    command: str
+    params: dict[str, Any]
+
+    @staticmethod
+    def parse(line: bytes) -> Request:
+        """Parse a request line, `{"id": ..., "command": ..., ...}`."""
+        try:
+            params = json.loads(line)
+            return Request(params.pop("id", None), str(params.pop("command")), params)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise InvalidFormatError("Invalid request") from e
+
+
+def reverse_values(
+    values: list[int], names: list[str] | None, reversers: dict[str, Reverser]
+) -> list[dict[str, Any]]:
+    """Worker entry point, reverse `values` with the selected reversers."""
+    if names is not None:
+        reversers = {name: reversers[name] for name in names}
+
+    options = Options(reversers, names is not None, 0, "text", first=False)
+    results = reverse_capture(Capture("", values, None), options)
+
+    # the matching generators, and the reversers that failed with their error
+    return [
+        {"generator": r.generator, "state": r.state, "elapsed": r.elapsed}
+        if r.error is None
+        else {"generator": r.generator, "state": None, "error": r.error}
+        for r in results
+        if r.generator is not None
+    ]
+
+
+def generate_values(generator_class: Any, arguments: str, count: int) -> list[int]:
+    """Worker entry point, generate values from generator arguments."""
+    return list(islice(generator_class.from_string(arguments), count))
+
+
+def predict_values(generator_class: Any, state: str, count: int) -> list[int]:
+    """Worker entry point, predict values from a saved state."""
+    generator = generator_class.from_state(generator_class.state_from_string(state))
+    return list(islice(generator, count))
+
+
+def work(conn: Connection) -> None:
+    """Worker process entry point, run jobs until the connection closes."""
+    # leave Ctrl+C to the daemon, which stops the workers
+    _ = signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while True:
+        try:
+            function, args = conn.recv()
+        except EOFError:
+            return
+
+        try:
+            conn.send((True, function(*args)))
+        except Exception as e:
+            conn.send((False, e))
+
+
+class WorkerStoppedError(Exception):
+    """Raised when a worker process stopped in the middle of a job."""
+
+
+class Worker:
+    """
+    A long-lived process running one job at a time.
+
+    Unlike a job on a process pool, a job on a worker can be stopped, by
+    killing the whole worker.
+    """
+
+    process: BaseProcess
+    conn: Connection
+
+    def __init__(self, context: BaseContext) -> None:
+        """Start the worker process."""
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=work, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def run[T](self, function: Callable[..., T], *args: Any) -> T:
+        """Run `function` in the worker and return its result."""
+        loop = asyncio.get_running_loop()
+        received: asyncio.Future[tuple[bool, Any]] = loop.create_future()
+        fd = self.conn.fileno()
+
+        def receive() -> None:
+            loop.remove_reader(fd)
+            if received.done():
+                return
+            try:
+                received.set_result(self.conn.recv())
+            except (EOFError, OSError):
+                received.set_exception(WorkerStoppedError("Worker process stopped"))
+
+        self.conn.send((function, args))
+        loop.add_reader(fd, receive)
+        try:
+            succeeded, result = await received
+        finally:
+            loop.remove_reader(fd)
+
+        if not succeeded:
+            raise result
+        return result
+
+    def stop(self) -> None:
+        """Kill the worker, also in the middle of a job, and wait for it."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def worker_context() -> BaseContext:
+    """
+    Return the multiprocessing context of the workers.
+
+    Workers started while serving must not inherit the client connections and
+    keep them open, so they are forked from a fork server where available.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["seedseeker.daemon"])
+        return context
+
+    return multiprocessing.get_context("spawn")
+
+
+class Daemon:
+    """
+    Serves reverse, predict and generate requests over a socket.
+
+    Every connection sends requests and receives responses as JSON lines.
+    Requests are answered out of order, as they finish, and carry an `id` to
+    match them. The work runs on `jobs` long-lived worker processes, which
+    keep their imports and precomputed tables between requests; requests wait
+    for an idle worker. A cancelled request that is running kills its worker,
+    which is replaced before another request can use it.
+    """
+
+    generators: dict[str, Any]
+    reversers: dict[str, Reverser]
+    jobs: int
+    context: BaseContext
+    workers: set[Worker]
+    # tasks serving the open connections
+    connections: set[asyncio.Task[None]]
+    # workers not running a job, None until serving
+    idle: asyncio.Queue[Worker] | None
+
+    def __init__(
+        self,
+        generators: dict[str, Any],
+        reversers: dict[str, Reverser],
+        jobs: int | None = None,
+    ) -> None:
+        """Prepare the daemon, the workers are started by `serve`."""
+        self.generators = generators
+        self.reversers = reversers
+        self.jobs = jobs or os.cpu_count() or 1
+        self.context = worker_context()
+        self.workers = set()
+        self.connections = set()
+        self.idle = None
+
+    async def serve(
+        self, address: Address, ready: Callable[[], None] | None = None
+    ) -> None:
+        """Listen on `address` until cancelled, call `ready` once listening."""
+        self.idle = asyncio.Queue()
+        for _ in range(self.jobs):
+            self.idle.put_nowait(self.start_worker())
+
+        try:
+            if address.path is not None:
+                server = await asyncio.start_unix_server(
+                    self.handle, address.path, limit=MAX_LINE
+                )
+            else:
+                server = await asyncio.start_server(
+                    self.handle, address.host, address.port, limit=MAX_LINE
+                )
+
+            try:
+                async with server:
+                    if ready is not None:
+                        ready()
+                    try:
+                        # not serve_forever, closing the server waits for the
+                        # open connections, which have to be cancelled first
+                        await asyncio.get_running_loop().create_future()
+                    finally:
+                        for connection in list(self.connections):
+                            _ = connection.cancel()
+            finally:
+                if address.path is not None:
+                    with contextlib.suppress(OSError):
+                        os.unlink(address.path)
+        finally:
+            for worker in list(self.workers):
+                self.stop_worker(worker)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve a single connection."""
+        connection = asyncio.current_task()
+        assert connection is not None, "Must run in a task"
+        self.connections.add(connection)
+
+        tasks: dict[Any, asyncio.Task[Any]] = {}
+        in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+        def respond(response: dict[str, Any]) -> None:
+            if not writer.is_closing():
+                writer.write(json.dumps(response).encode() + b"\n")
+
+        def finish(request: Request, task: asyncio.Task[Any]) -> None:
+            _ = tasks.pop(request.id, None)
+            in_flight.release()
+
+            if task.cancelled():
+                respond({"id": request.id, "status": "cancelled"})
+            elif (e := task.exception()) is not None:
+                respond({"id": request.id, "status": "error", "error": str(e)})
+            else:
+                respond({"id": request.id, "status": "ok", "result": task.result()})
+
+        try:
+            while line := await reader.readline():
+                await writer.drain()
+                if not line.strip():
+                    continue
+
+                try:
+                    request = Request.parse(line)
+                except InvalidFormatError as e:
+                    respond({"id": None, "status": "error", "error": str(e)})
+                    continue
+
+                if (error := admit(request, tasks)) is not None:
+                    respond({"id": request.id, "status": "error", "error": error})
+                    continue
+
+                if request.command == "cancel":
+                    _ = tasks[request.params["target"]].cancel()
+                    continue
+
+                await in_flight.acquire()
+                task = asyncio.create_task(self.run(request))
+                task.add_done_callback(partial(finish, request))
+                tasks[request.id] = task
+
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except (ConnectionError, ValueError):
+            pass  # the client went away or sent an overlong line
+        except asyncio.CancelledError:
+            pass  # the daemon is shutting down, the connection closes below
+        finally:
+            for task in list(tasks.values()):
+                _ = task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            writer.close()
+            self.connections.discard(connection)
+
+    async def run(self, request: Request) -> Any:
+        """Validate a request and run it on a worker."""
+        match request.command:
+            case "reverse":
+                return await self.submit(reverse_values, *self.reverse_args(request))
+            case "generate" | "predict":
+                return await self.submit(*self.generator_args(request))
+            case _:
+                raise InvalidFormatError(f"Unknown command {request.command}")
+
+    async def submit[T](self, function: Callable[..., T], *args: Any) -> T:
+        """Run `function` on a worker once one is idle."""
+        assert self.idle is not None, "Must be serving"
+
+        worker = await self.idle.get()
+        try:
+            return await worker.run(function, *args)
+        except (asyncio.CancelledError, WorkerStoppedError):
+            # the job may still be running, the worker is only idle once replaced
+            self.stop_worker(worker)
+            worker = self.start_worker()
+            raise
+        finally:
+            self.idle.put_nowait(worker)
+
+    def start_worker(self) -> Worker:
+        """Start a worker process."""
+        worker = Worker(self.context)
+        self.workers.add(worker)
+        return worker
+
+    def stop_worker(self, worker: Worker) -> None:
+        """Kill a worker process."""
+        worker.stop()
+        self.workers.discard(worker)
+
+    def reverse_args(self, request: Request) -> tuple[Any, ...]:
+        """Return the arguments of `reverse_values` for a request."""
+        values = request.params.get("values")
+        names = request.params.get("generators")
+
+        if not isinstance(values, list) or not all(isinstance(v, int) for v in values):
+            raise InvalidFormatError("Reverse needs a list of integer values")
+
+        for name in names or []:
+            if name not in self.reversers:
+                raise InvalidFormatError(f"Unknown generator {name}")
+
+        return values, names, self.reversers
+
+    def generator_args(self, request: Request) -> tuple[Any, ...]:
+        """Return the worker function and its arguments for a request."""
+        name = request.params.get("generator")
+        count = request.params.get("count", 16)
+
+        if name not in self.generators:
+            raise InvalidFormatError(f"Unknown generator {name}")
+        if not isinstance(count, int) or not 0 <= count <= MAX_COUNT:
+            raise InvalidFormatError(f"Count must be between 0 and {MAX_COUNT}")
+
+        if request.command == "generate":
+            arguments = str(request.params.get("arguments", ""))
+            return generate_values, self.generators[name], arguments, count
+
+        state = str(request.params.get("state", ""))
+        return predict_values, self.generators[name], state, count
+
+
+def admit(request: Request, tasks: dict[Any, asyncio.Task[Any]]) -> str | None:
+    """Return why a request can not be run next to `tasks`, None if it can."""
+    # responses are matched by id, so it has to tell the requests apart
+    if not isinstance(request.id, str | int):
+        return "Request needs a string or integer id"
+    if request.id in tasks:
+        return f"Request {request.id} is already running"
+
+    if request.command == "cancel":
+        target = request.params.get("target")
+        if not isinstance(target, str | int) or target not in tasks:
+            return "Unknown request"
+
+    return None
+
+
+def serve(
+    address: str,
+    daemon: Daemon,
+    ready: Callable[[], None] | None = None,
+) -> None:
+    """Run a daemon on `address` until interrupted."""
+    asyncio.run(daemon.serve(Address.parse(address), ready))
@@ -1,4 +1,4 @@
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
 from typing import Protocol, Self
 
 
@@ -23,6 +23,23 @@ class InvalidFormatError(Exception):
         return "\n".join(output)
 
 
+class CanonicalState(Protocol):
+    """
+    Generator state with a canonical encoding.
+
+    Two states that produce the same output have the same canonical encoding,
+    regardless of how the generator stores them internally.
+    """
+
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state."""
+        raise NotImplementedError
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        raise NotImplementedError
+
+
 class IntegerRNG[StateT](Protocol):
     """Integer random number generator protocol."""
 
@@ -34,10 +51,27 @@ class IntegerRNG[StateT](Protocol):
         """Return the next value."""
         raise NotImplementedError
 
+    def next_block(self, n: int) -> Sequence[int]:
+        """
+        Return the next n values at once.
+
+        Generators that compute blocks faster than value by value override
+        this, possibly returning a NumPy array.
+        """
+        return [next(self) for _ in range(n)]
+
     def state(self) -> StateT:
         """Return the inner state."""
         raise NotImplementedError
 
+    def fork(self) -> Self:
+        """
+        Return an independent copy of the generator.
+
+        Buffers are shared between the copies until one of them writes.
+        """
+        raise NotImplementedError
+
     @staticmethod
     def from_state(state: StateT) -> Self:
         """Set the inner state."""
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from enum import StrEnum
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from typing import TYPE_CHECKING, Any, NamedTuple, override
+
+from seedseeker.feed import FeedReverser, Reverser, as_feed, feeds
+from seedseeker.utils.stream import SharedStream
+
+if TYPE_CHECKING:
+    from seedseeker.profiling import Probe, Profiling, Usage
+
+# how many chunks a reverser may read ahead of the slowest one
+WINDOW = 64
+
+# chunk size of the shared stream when reversers stop early, which they can
+# only do between chunks
+EARLY_CHUNK_SIZE = 128
+
+
+class Status(StrEnum):
+    """Outcome of a single reverser run."""
+
+    FOUND = "found"
+    REJECTED = "rejected"
+    TIMEOUT = "timeout"
+    FAILED = "failed"
+
+
+class Outcome(NamedTuple):
+    """Result of a single reverser run."""
+
+    name: str
+    status: Status
+    state: Any
+    elapsed: float
+    # what the reverser used, when profiled
+    usage: Usage | None = None
+
+
+class Job(NamedTuple):
+    """A reverser running in a worker process."""
+
+    name: str
+    process: Process
+    started: float
+    reader: int
+
+
+class RemoteCursor(Iterator[int]):
+    """Iterator over a `SharedStream` owned by the parent process."""
+
+    conn: Connection
+    index: int
+    values: list[int]
+    offset: int
+
+    def __init__(self, conn: Connection, first: int = 0) -> None:
+        """Read chunks through `conn`, starting at chunk `first`."""
+        self.conn = conn
+        self.index = first - 1
+        self.values = []
+        self.offset = 0
+
+    @override
+    def __iter__(self) -> Iterator[int]:
+        """Return the iterator."""
+        return self
+
+    @override
+    def __next__(self) -> int:
+        """Return the next value, requesting the next chunk when needed."""
+        if self.offset >= len(self.values):
+            if (values := self.next_chunk()) is None:
+                raise StopIteration
+
+            self.values = values
+            self.offset = 0
+
+        self.offset += 1
+        return self.values[self.offset - 1]
+
+    def next_chunk(self) -> list[int] | None:
+        """Request the next chunk, None at the end of the stream."""
+        self.conn.send(self.index + 1)
+
+        if (values := self.conn.recv()) is not None:
+            self.index += 1
+
+        return values
+
+    def chunks(self) -> Iterator[list[int]]:
+        """Iterate over the remaining chunks."""
+        while (values := self.next_chunk()) is not None:
+            yield values
+
+
+def run_reverser(
+    name: str,
+    reverser: Reverser,
+    conn: Connection,
+    early: bool = False,
+    profiling: Profiling | None = None,
+    *,
+    first: int = 0,
+) -> None:
+    """
+    Worker process entry point, sends the outcome back through `conn`.
+
+    The reverser reads the stream from chunk `first`.
+    """
+    started = time.perf_counter()
+    cursor = RemoteCursor(conn, first)
+
+    probe = None
+    if profiling is not None:
+        from seedseeker.profiling import Probe  # noqa: PLC0415
+
+        probe = Probe(profiling.dump(name))
+
+    try:
+        with nullcontext() if probe is None else probe.running():
+            state = reverse(reverser, cursor, early, probe)
+        status = Status.REJECTED if state is None else Status.FOUND
+    except Exception as e:
+        state, status = repr(e), Status.FAILED
+
+    usage = None if probe is None else probe.finish(name)
+    conn.send(Outcome(name, status, state, time.perf_counter() - started, usage))
+    conn.close()
+
+
+def reverse(
+    reverser: Reverser, cursor: RemoteCursor, early: bool, probe: Probe | None
+) -> Any:
+    """Run a reverser on the values of `cursor`, measured by `probe` if any."""
+    if feeds(reverser):
+        feed = as_feed(reverser)
+        if probe is not None:
+            feed = probe.instrument(feed)
+        return feed_chunks(feed, cursor.chunks(), early)
+
+    return reverser(cursor if probe is None else probe.counted(cursor))
+
+
+def feed_chunks(
+    reverser: FeedReverser[Any], chunks: Iterable[list[int]], early: bool
+) -> Any:
+    """Feed a reverser chunk by chunk, if `early`, only until it is decided."""
+    for chunk in chunks:
+        if reverser.feed(chunk).decided and early:
+            break
+
+    return reverser.finish()
+
+
+class Dispatcher:
+    """
+    Runs reversers concurrently, each in its own process.
+
+    Every reverser reads the shared stream through its own cursor, the chunks
+    are sent to the workers on demand. A reverser that gets `WINDOW` chunks
+    ahead of the slowest running one waits, which bounds the memory usage.
+    Reversers waiting for a job keep at most the `WINDOW` chunks behind the
+    one last read: a reverser started later reads the input from the oldest
+    chunk still kept, so that it still reports the state after the last
+    value, but verifies it on fewer values. With
+    `early`, reversers that can be fed stop reading once they confirmed or
+    rejected a state, so the stream is only read as far as needed. With
+    `profiling`, every worker measures its reverser (see `Probe`).
+    """
+
+    stream: SharedStream
+    jobs: int
+    timeout: float | None
+    early: bool
+    profiling: Profiling | None
+    pending: list[tuple[str, Reverser, int]]
+    running: dict[Connection, Job]
+    # chunk requests waiting for the slowest reader to catch up
+    deferred: dict[Connection, int]
+
+    def __init__(
+        self,
+        stream: SharedStream,
+        reversers: dict[str, Reverser],
+        jobs: int | None = None,
+        timeout: float | None = None,
+        *,
+        early: bool = False,
+        profiling: Profiling | None = None,
+    ) -> None:
+        """Prepare the reversers, waiting for a job at the beginning of `stream`."""
+        self.stream = stream
+        self.jobs = max(1, jobs or len(reversers))
+        self.timeout = timeout
+        self.early = early
+        self.profiling = profiling
+        self.pending = [(name, r, stream.register()) for name, r in reversers.items()]
+        self.running = {}
+        self.deferred = {}
+
+    def __iter__(self) -> Iterator[Outcome]:
+        """Run the reversers, yielding outcomes as soon as they finish."""
+        try:
+            while self.pending or self.running:
+                self.start()
+                yield from self.collect()
+                yield from self.expire()
+        finally:
+            for conn in list(self.running):
+                stop(conn, self.finish(conn))
+
+    def start(self) -> None:
+        """Start pending reversers up to the job limit."""
+        while self.pending and len(self.running) < self.jobs:
+            name, reverser, reader = self.pending.pop(0)
+            first = self.stream.positions[reader]
+            parent, child = Pipe()
+            process = Process(
+                target=run_reverser,
+                args=(name, reverser, child, self.early, self.profiling),
+                kwargs={"first": first},
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.running[parent] = Job(name, process, time.perf_counter(), reader)
+
+    def collect(self) -> Iterator[Outcome]:
+        """Wait for messages from the workers, serving chunks and outcomes."""
+        wait_for = None
+        if self.timeout is not None:
+            oldest = min(job.started for job in self.running.values())
+            wait_for = max(0.0, oldest + self.timeout - time.perf_counter())
+
+        for conn in wait(list(self.running), wait_for):
+            assert isinstance(conn, Connection)
+
+            try:
+                message = conn.recv()
+            except EOFError:
+                # the worker died without reporting
+                job = self.finish(conn)
+                job.process.join()
+                elapsed = time.perf_counter() - job.started
+                message = Outcome(job.name, Status.FAILED, None, elapsed)
+
+            if isinstance(message, int):
+                self.serve(conn, message)
+                continue
+
+            if conn in self.running:
+                self.finish(conn).process.join()
+
+            conn.close()
+            yield message
+
+        for conn, index in list(self.deferred.items()):
+            del self.deferred[conn]
+            self.serve(conn, index)
+
+    def expire(self) -> Iterator[Outcome]:
+        """Terminate reversers that ran out of time."""
+        if self.timeout is None:
+            return
+
+        now = time.perf_counter()
+        for conn, job in list(self.running.items()):
+            if now - job.started >= self.timeout:
+                stop(conn, self.finish(conn))
+                yield Outcome(job.name, Status.TIMEOUT, None, now - job.started)
+
+    def serve(self, conn: Connection, index: int) -> None:
+        """Send chunk `index` to a worker, unless it is too far ahead."""
+        if index - self.slowest() >= WINDOW:
+            self.deferred[conn] = index
+            return
+
+        # reversers waiting for a job do not hold back the running ones
+        for _, _, reader in self.pending:
+            self.stream.skip(reader, index - WINDOW + 1)
+
+        conn.send(self.stream.chunk(self.running[conn].reader, index))
+
+    def slowest(self) -> int:
+        """Return the oldest chunk a running reverser still needs."""
+        # pending reversers are not waited for, they only start once a
+        # running one finishes, and the slowest running one is never deferred
+        positions = self.stream.positions
+        return min(
+            (positions[job.reader] for job in self.running.values()),
+            default=self.stream.filled,
+        )
+
+    def finish(self, conn: Connection) -> Job:
+        """Forget a finished reverser."""
+        job = self.running.pop(conn)
+        _ = self.deferred.pop(conn, None)
+        self.stream.unregister(job.reader)
+        return job
+
+
+def dispatch(
+    stream: SharedStream,
+    reversers: dict[str, Reverser],
+    jobs: int | None = None,
+    timeout: float | None = None,
+    *,
+    early: bool = False,
+    profiling: Profiling | None = None,
+) -> Iterator[Outcome]:
+    """
+    Run reversers concurrently, each in its own process.
+
+    Outcomes are yielded as soon as each reverser finishes. At most `jobs`
+    reversers run at once (defaults to all of them) and every reverser is
+    terminated after `timeout` seconds. With `early`, reversers stop reading
+    once they are decided (see `FeedReverser`) and report the state after the
+    last value they read. With `profiling`, every outcome has the usage of its
+    reverser. Closing the iterator terminates all reversers that are still
+    running.
+    """
+    return iter(
+        Dispatcher(stream, reversers, jobs, timeout, early=early, profiling=profiling)
+    )
+
+
+def stop(conn: Connection, job: Job) -> None:
+    """Terminate a running reverser."""
+    job.process.terminate()
+    job.process.join()
+    conn.close()
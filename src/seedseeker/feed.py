@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from enum import StrEnum
+from functools import partial
+from itertools import islice
+from math import ceil, log2
+from typing import Any, ClassVar, NamedTuple, override
+
+from seedseeker.defs import IntegerRNG
+from seedseeker.utils.iterator import blocks, first_mismatch, integers
+from seedseeker.utils.optional import numpy
+
+# number of values a candidate has to predict before it is confirmed
+CONFIRM_SAMPLES = 64
+
+
+class Progress(StrEnum):
+    """How far a reverser got with the values fed so far."""
+
+    # more values are needed to find a candidate
+    NOT_YET = "not yet"
+    # a state was found, but it did not predict enough values to be sure
+    CANDIDATE = "candidate"
+    # the state predicted enough values, later values are still checked
+    CONFIRMED = "confirmed"
+    # no state of the generator can produce the values
+    REJECTED = "rejected"
+
+    @property
+    def decided(self) -> bool:
+        """Return whether further values are unlikely to change the outcome."""
+        return self in {Progress.CONFIRMED, Progress.REJECTED}
+
+
+class FeedReverser[StateT](ABC):
+    """
+    Reverser that is pushed the values of a sequence as they arrive.
+
+    Every call to `feed` reports the progress, so the caller can stop reading
+    once it is decided instead of reading a fixed number of values. `finish`
+    marks the end of the input and returns the state after the last value
+    fed, or None. An object reverses a single sequence.
+    """
+
+    # fewer values can never be reversed
+    min_samples: ClassVar[int] = 0
+
+    @abstractmethod
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Push the next values of the sequence, return the progress so far."""
+
+    @abstractmethod
+    def finish(self) -> StateT | None:
+        """End the sequence, return the state after it if one was found."""
+
+    def run(self, values: Iterable[int]) -> StateT | None:
+        """Reverse a whole sequence, like a reverser taking an iterator."""
+        _ = self.feed(values)
+        return self.finish()
+
+
+# a function taking an iterator and returning a state or None, or a callable
+# creating a FeedReverser, such as its class (see `feeds`)
+type Reverser = Callable[[Iterator[int]], Any] | Callable[[], FeedReverser[Any]]
+
+
+class Verifier[StateT](FeedReverser[StateT]):
+    """Checks the values against the ones predicted by a generator."""
+
+    generator: IntegerRNG[StateT]
+    confirm_samples: int
+    verified: int
+    progress: Progress
+
+    def __init__(
+        self, generator: IntegerRNG[StateT], confirm_samples: int = CONFIRM_SAMPLES
+    ) -> None:
+        """Verify `generator`, positioned before the next value to be fed."""
+        self.generator = generator
+        self.confirm_samples = confirm_samples
+        self.verified = 0
+        self.progress = Progress.CANDIDATE
+        self.check()
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Compare the values with the predicted ones."""
+        if self.progress is Progress.REJECTED:
+            return self.progress
+
+        # the generator computes a block of predictions at once, a block with
+        # a mismatch rejects the state, so where exactly does not matter
+        for block in blocks(values):
+            if first_mismatch(block, self.generator.next_block(len(block))) is not None:
+                self.progress = Progress.REJECTED
+                return self.progress
+            self.verified += len(block)
+
+        self.check()
+        return self.progress
+
+    def check(self) -> None:
+        """Confirm the candidate once it predicted enough values."""
+        if (
+            self.progress is Progress.CANDIDATE
+            and self.verified >= self.confirm_samples
+        ):
+            self.progress = Progress.CONFIRMED
+
+    @override
+    def finish(self) -> StateT | None:
+        """Return the state of the generator unless a value did not match."""
+        if self.progress is Progress.REJECTED:
+            return None
+
+        return self.generator.state()
+
+
+class Lockstep[StateT](FeedReverser[StateT]):
+    """
+    Checks the values against several candidate generators side by side.
+
+    Every block of values is predicted by all remaining candidates and
+    compared with all of their predictions at once, the candidates that
+    mismatch are dropped. This verifies all candidates of a search in a
+    single pass over the values. The candidates are in order of preference,
+    `finish` returns the state of the first one left.
+    """
+
+    candidates: list[IntegerRNG[StateT]]
+    confirm_samples: int
+    verified: int
+    progress: Progress
+
+    def __init__(
+        self,
+        candidates: Iterable[IntegerRNG[StateT]],
+        confirm_samples: int = CONFIRM_SAMPLES,
+    ) -> None:
+        """Verify `candidates`, positioned before the next value to be fed."""
+        self.candidates = list(candidates)
+        self.confirm_samples = confirm_samples
+        self.verified = 0
+        self.progress = Progress.CANDIDATE if self.candidates else Progress.REJECTED
+        self.check()
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Compare the values with the predictions of every candidate."""
+        if self.progress is Progress.REJECTED:
+            return self.progress
+
+        for block in blocks(values):
+            predictions = [c.next_block(len(block)) for c in self.candidates]
+            matches = matching(block, predictions)
+            self.candidates = [
+                c for c, m in zip(self.candidates, matches, strict=True) if m
+            ]
+
+            if not self.candidates:
+                self.progress = Progress.REJECTED
+                return self.progress
+            self.verified += len(block)
+
+        self.check()
+        return self.progress
+
+    def check(self) -> None:
+        """Confirm once a single candidate predicted enough values."""
+        if (
+            self.progress is Progress.CANDIDATE
+            and self.verified >= self.confirm_samples
+            and len(self.candidates) == 1
+        ):
+            self.progress = Progress.CONFIRMED
+
+    def survivors(self) -> list[StateT]:
+        """Return the states of all candidates that predicted every value."""
+        return [candidate.state() for candidate in self.candidates]
+
+    @override
+    def finish(self) -> StateT | None:
+        """Return the state of the preferred candidate left, if any."""
+        return self.candidates[0].state() if self.candidates else None
+
+
+def matching(block: Sequence[int], predictions: list[Sequence[int]]) -> list[bool]:
+    """
+    Return which predictions are equal to the block.
+
+    Predictions computed as NumPy arrays of the same type are compared as the
+    rows of a single array.
+    """
+    np = numpy()
+
+    if (
+        np is not None
+        and len(predictions) > 1
+        and all(isinstance(p, np.ndarray) for p in predictions)
+        and len({p.dtype for p in predictions}) == 1
+    ):
+        lanes = np.stack(predictions)
+        try:
+            observed = np.asarray(block, dtype=lanes.dtype)
+        except OverflowError:
+            # a value out of the range of the predictions matches none of them
+            return [False] * len(predictions)
+        return (lanes == observed).all(axis=1).tolist()
+
+    return [first_mismatch(block, predicted) is None for predicted in predictions]
+
+
+class Confidence(NamedTuple):
+    """State found by a reverser and how likely it is wrong, printed as the state."""
+
+    state: Any
+    # number of values predicted after the state was solved
+    verified: int
+    # the probability that values the generator did not produce are taken
+    # for its output is at most 2^-bits
+    bits: float
+
+    @override
+    def __str__(self) -> str:
+        """Print the state."""
+        return str(self.state)
+
+    def to_json(self) -> str:
+        """Return the verified values and the bound as a single line of JSON."""
+        import json  # noqa: PLC0415
+
+        return json.dumps(
+            {
+                "verified": self.verified,
+                "bits": round(self.bits, 2),
+                "false_positive": 2.0**-self.bits,
+            }
+        )
+
+
+def confidence_bits(candidates: int, value_bits: float, verified: int) -> float:
+    """
+    Return the bits of confidence that random values match none of the candidates.
+
+    Values the candidates were not solved from, each with `value_bits` bits
+    of entropy, match a single candidate's predictions with a probability of
+    2^-value_bits each.
+    """
+    return max(0.0, value_bits * verified - log2(candidates))
+
+
+def verification_length(candidates: int, value_bits: float, probability: float) -> int:
+    """Return how many values make a false positive less likely than `probability`."""
+    return max(0, ceil(log2(candidates / probability) / value_bits))
+
+
+def unicity_distance(state_bits: float, value_bits: float, probability: float) -> int:
+    """
+    Return how many values only one state in `probability` could produce.
+
+    A sequence of that many random values is produced by any of the 2^state_bits
+    states with a probability below `probability`, fewer values may be
+    matched by some state just by chance.
+    """
+    return ceil((state_bits - log2(probability)) / value_bits)
+
+
+class SolvingReverser[StateT](FeedReverser[StateT]):
+    """
+    Collects values until `solve` finds a candidate, then verifies it.
+
+    `solve` is first called once `solve_samples` values arrived. It may ask
+    for more values, and is called one last time at the end of the input if
+    there are at least `min_samples` values.
+
+    With a `false_positive` probability, the number of values verified is not
+    fixed but computed for each solution, from the number of candidates and
+    the entropy of the values, and at least the `unicity_distance` of the
+    state space if the reverser knows its size. The state is then returned as
+    a `Confidence`.
+    """
+
+    # number of values collected before the first attempt to solve
+    solve_samples: ClassVar[int] = 1
+
+    confirm_samples: int
+    # number of anomalies the verification tolerates, see `TolerantVerifier`
+    tolerance: int
+    # chance of a false positive the verification has to get below
+    false_positive: float | None
+    # number of candidates solved and bits of entropy per value, for the
+    # chance of a false positive
+    solutions: int
+    entropy: float
+    values: list[int]
+    # number of values collected before the next attempt to solve
+    needed: int
+    verifier: FeedReverser[Any] | None
+    rejected: bool
+    # last `solve_samples` values pushed by `slide`
+    window: deque[int]
+
+    def __init__(
+        self,
+        confirm_samples: int = CONFIRM_SAMPLES,
+        tolerance: int = 0,
+        false_positive: float | None = None,
+    ) -> None:
+        """Start with no values."""
+        assert false_positive is None or 0 < false_positive < 1, (
+            "False positive probability must be between 0 and 1"
+        )
+
+        self.confirm_samples = confirm_samples
+        self.tolerance = tolerance
+        self.false_positive = false_positive
+        self.solutions = 1
+        self.entropy = 0.0
+        self.values = []
+        self.needed = max(1, self.solve_samples)
+        self.verifier = None
+        self.rejected = False
+        self.window = deque(maxlen=max(1, self.solve_samples))
+
+    @abstractmethod
+    def solve(
+        self, values: list[int], final: bool
+    ) -> IntegerRNG[StateT] | list[IntegerRNG[StateT]] | Progress:
+        """
+        Find the generator that produced `values`.
+
+        Return it positioned after the values, or all candidates that agree
+        with them in order of preference, which are then verified side by
+        side. Return `Progress.REJECTED` if no generator can have produced
+        them, or `Progress.NOT_YET` to try again once `needed` values
+        arrived (by default, one more). When `final`, no more values will
+        arrive.
+        """
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Collect values until a candidate is found, then verify the rest."""
+        values = integers(values)
+
+        while self.verifier is None and not self.rejected:
+            self.values.extend(islice(values, self.needed - len(self.values)))
+            if len(self.values) < self.needed:
+                return Progress.NOT_YET
+            self.attempt(final=False)
+
+        if self.verifier is None:
+            return Progress.REJECTED
+
+        return self.verifier.feed(values)
+
+    @override
+    def finish(self) -> StateT | None:
+        """Make a last attempt with the values collected so far."""
+        if self.verifier is None and not self.rejected:
+            if len(self.values) >= self.min_samples:
+                self.attempt(final=True)
+            else:
+                self.rejected = True
+
+        if self.verifier is None:
+            return None
+
+        state = self.verifier.finish()
+        if (
+            state is None
+            or self.false_positive is None
+            or not isinstance(self.verifier, Verifier | Lockstep)
+        ):
+            return state
+
+        verified = self.verifier.verified
+        bits = confidence_bits(self.solutions, self.entropy, verified)
+        return Confidence(state, verified, bits)
+
+    def state_bits(self, values: list[int]) -> float | None:  # noqa: ARG002
+        """Return the bits of state and parameters of the generator, if known."""
+        return None
+
+    def value_bits(self, values: list[int]) -> float:
+        """Return the bits of entropy of each value, at least one."""
+        return max(1.0, log2(max(values, default=0) + 1))
+
+    def verification(self, solution: Any) -> int:
+        """Return how many values the solution has to predict to be confirmed."""
+        if self.false_positive is None:
+            return self.confirm_samples
+
+        self.solutions = len(solution) if isinstance(solution, list) else 1
+        self.entropy = self.value_bits(self.values)
+        length = verification_length(self.solutions, self.entropy, self.false_positive)
+
+        # the values solved from may not determine the state on their own
+        if (state_bits := self.state_bits(self.values)) is not None:
+            unicity = unicity_distance(state_bits, self.entropy, self.false_positive)
+            length = max(length, unicity - len(self.values))
+
+        return length
+
+    def attempt(self, final: bool) -> None:
+        """Try to solve the values collected so far."""
+        solution = self.solve(self.values, final)
+
+        if solution is Progress.NOT_YET and not final:
+            self.needed = max(self.needed, len(self.values) + 1)
+            return
+
+        if isinstance(solution, Progress):
+            self.rejected = True
+            self.values = []
+            return
+
+        confirm_samples = self.verification(solution)
+
+        if self.tolerance > 0:
+            from seedseeker.align import TolerantVerifier  # noqa: PLC0415
+
+            # anomalies are told apart from wrong candidates by the preferred one
+            if isinstance(solution, list):
+                solution = solution[0]
+            self.verifier = TolerantVerifier(
+                solution, confirm_samples, self.tolerance, len(self.values)
+            )
+        elif isinstance(solution, list):
+            self.verifier = Lockstep(solution, confirm_samples)
+        else:
+            self.verifier = Verifier(solution, confirm_samples)
+
+        self.values = []
+
+    def slide(self, value: int) -> IntegerRNG[StateT] | None:
+        """
+        Push a value and solve the last `solve_samples` values.
+
+        Return the generator that produced them, positioned after them, or
+        None. This is used to find where a generator's output starts in a
+        longer input, one offset after another; subclasses reuse the work done
+        for the previous offset where they can.
+        """
+        self.window.append(value)
+        if len(self.window) < self.solve_samples:
+            return None
+
+        solution = self.solve(list(self.window), final=True)
+        if isinstance(solution, list):
+            return solution[0] if solution else None
+        return None if isinstance(solution, Progress) else solution
+
+
+class PullReverser(FeedReverser[Any]):
+    """Adapts a reverser taking an iterator, which runs at the end of the input."""
+
+    reverser: Callable[[Iterator[int]], Any]
+    values: list[int]
+
+    def __init__(self, reverser: Callable[[Iterator[int]], Any]) -> None:
+        """Wrap `reverser`."""
+        self.reverser = reverser
+        self.values = []
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Collect the values."""
+        self.values.extend(integers(values))
+        return Progress.NOT_YET
+
+    @override
+    def finish(self) -> Any:
+        """Run the reverser on all values."""
+        return self.reverser(iter(self.values))
+
+
+def feeds(reverser: Reverser) -> bool:
+    """Return whether `reverser` creates FeedReverser objects."""
+    factory = reverser.func if isinstance(reverser, partial) else reverser
+    return isinstance(factory, type) and issubclass(factory, FeedReverser)
+
+
+def slides(reverser: Reverser) -> bool:
+    """Return whether `reverser` can search for where its output starts."""
+    factory = reverser.func if isinstance(reverser, partial) else reverser
+    return isinstance(factory, type) and issubclass(factory, SolvingReverser)
+
+
+def as_feed(reverser: Reverser) -> FeedReverser[Any]:
+    """Return a FeedReverser running `reverser`, whichever kind it is."""
+    factory: Any = reverser
+    return factory() if feeds(reverser) else PullReverser(factory)
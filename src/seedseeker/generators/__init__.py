@@ -1,32 +1,101 @@
-from seedseeker.generators.fibonacci import (
-    FibonacciRng,
-    FibonacciState,
-    reverse_fibonacci,
-)
-from seedseeker.generators.lcg import Lcg, LcgState, reverse_lcg
-from seedseeker.generators.mersenne import (
-    MersenneTwister,
-    MersenneTwisterState,
-    reverse_mersenne,
-)
-from seedseeker.generators.ran3 import Ran3, Ran3State, reverse_ran3
-from seedseeker.generators.xoshiro import Xoshiro, XoshiroState, reverse_xoshiro
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from seedseeker.generators.fibonacci import (
+        FibonacciReverser,
+        FibonacciRng,
+        FibonacciState,
+        reverse_fibonacci,
+    )
+    from seedseeker.generators.lcg import (
+        Lcg,
+        LcgReverser,
+        LcgState,
+        reverse_lcg,
+        reverse_lcg_sparse,
+    )
+    from seedseeker.generators.mersenne import (
+        MersenneReverser,
+        MersenneTwister,
+        MersenneTwisterState,
+        reverse_mersenne,
+    )
+    from seedseeker.generators.ran3 import (
+        Ran3,
+        Ran3Reverser,
+        Ran3State,
+        reverse_ran3,
+    )
+    from seedseeker.generators.xoshiro import (
+        Xoshiro,
+        XoshiroReverser,
+        XoshiroState,
+        reverse_xoshiro,
+        reverse_xoshiro_sparse,
+    )
 
 __all__ = [
+    "FibonacciReverser",
     "FibonacciRng",
     "FibonacciState",
     "Lcg",
+    "LcgReverser",
     "LcgState",
+    "MersenneReverser",
     "MersenneTwister",
     "MersenneTwisterState",
     "Ran3",
+    "Ran3Reverser",
     "Ran3State",
     "Xoshiro",
     "Xoshiro",
+    "XoshiroReverser",
     "XoshiroState",
     "reverse_fibonacci",
     "reverse_lcg",
+    "reverse_lcg_sparse",
     "reverse_mersenne",
     "reverse_ran3",
     "reverse_xoshiro",
+    "reverse_xoshiro_sparse",
 ]
+
+# submodule defining every exported name, imported on first access so that
+# using one generator does not import the dependencies of all the others
+MODULES = {
+    "FibonacciRng": "fibonacci",
+    "FibonacciState": "fibonacci",
+    "FibonacciReverser": "fibonacci",
+    "reverse_fibonacci": "fibonacci",
+    "Lcg": "lcg",
+    "LcgState": "lcg",
+    "LcgReverser": "lcg",
+    "reverse_lcg": "lcg",
+    "reverse_lcg_sparse": "lcg",
+    "MersenneTwister": "mersenne",
+    "MersenneTwisterState": "mersenne",
+    "MersenneReverser": "mersenne",
+    "reverse_mersenne": "mersenne",
+    "Ran3": "ran3",
+    "Ran3State": "ran3",
+    "Ran3Reverser": "ran3",
+    "reverse_ran3": "ran3",
+    "Xoshiro": "xoshiro",
+    "XoshiroState": "xoshiro",
+    "XoshiroReverser": "xoshiro",
+    "reverse_xoshiro": "xoshiro",
+    "reverse_xoshiro_sparse": "xoshiro",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its submodule."""
+    if name not in MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f"{__name__}.{MODULES[name]}"), name)
+    globals()[name] = value
+    return value
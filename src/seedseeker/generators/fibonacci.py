@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from collections import deque
-from collections.abc import Iterator
+from collections.abc import Iterable
 from itertools import islice
 from typing import NamedTuple, override
 
 from mod import Mod
 
 from seedseeker.defs import IntegerRNG, InvalidFormatError
+from seedseeker.feed import Progress, SolvingReverser
 from seedseeker.generators.lcg import Lcg
-from seedseeker.utils.iterator import BufferingIterator, CountingIterator, drop
+from seedseeker.utils.fingerprint import ENCODINGS, pack_ints
 
 
 class FibonacciState(NamedTuple):
@@ -26,6 +27,36 @@ class FibonacciState(NamedTuple):
         seed = ",".join(map(str, self.seed))
         return f"{self.r};{self.s};{self.m};{seed};{self.carry}"
 
+    @override
+    def __eq__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        if not isinstance(other, FibonacciState):
+            return NotImplemented
+        return self.canonical() == other.canonical()
+
+    @override
+    def __ne__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash the canonical encoding."""
+        return hash(self.canonical())
+
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state, cached in `ENCODINGS`."""
+        return ENCODINGS.canonical(self, self.encode)
+
+    def encode(self) -> bytes:
+        """Encode the state canonically."""
+        # None, False and True map to distinct codes
+        carry = 0 if self.carry is None else 1 + int(self.carry)
+        return pack_ints(b"fibonacci", [self.r, self.s, self.m, carry, *self.seed])
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return ENCODINGS.fingerprint(self, self.encode)
+
 
 class FibonacciRng(IntegerRNG[FibonacciState]):
     """
@@ -40,6 +71,8 @@ class FibonacciRng(IntegerRNG[FibonacciState]):
     m: int
     queue: deque[Mod]
     carry: bool | None
+    # the queue is also referenced by a fork
+    shared: bool
 
     DEFAULT_SEED: int = 19780503
 
@@ -72,12 +105,17 @@ class FibonacciRng(IntegerRNG[FibonacciState]):
 
         self.queue = deque(Mod(n, m) for n in seed)
         self.carry = False if with_carry else None
+        self.shared = False
 
     @override
     def __next__(self) -> int:
         """Return the next value."""
         r, s = self.r, self.s
 
+        if self.shared:
+            self.queue = self.queue.copy()
+            self.shared = False
+
         value = self.queue[-r] + self.queue[-s] + int(self.carry is True)
 
         if self.carry is not None:
@@ -95,6 +133,16 @@ class FibonacciRng(IntegerRNG[FibonacciState]):
         queue = [int(n) for n in self.queue]
         return FibonacciState(self.r, self.s, self.m, queue, self.carry)
 
+    @override
+    def fork(self) -> FibonacciRng:
+        """Return an independent copy of the generator."""
+        rng = FibonacciRng.__new__(FibonacciRng)
+        rng.r, rng.s, rng.m = self.r, self.s, self.m
+        rng.queue = self.queue
+        rng.carry = self.carry
+        rng.shared = self.shared = True
+        return rng
+
     @override
     @staticmethod
     def from_state(state: FibonacciState) -> FibonacciRng:
@@ -108,7 +156,7 @@ class FibonacciRng(IntegerRNG[FibonacciState]):
     @staticmethod
     def is_state_equal(state1: FibonacciState, state2: FibonacciState) -> bool:
         """Check if two FibonacciRng states are equal."""
-        return state1 == state2
+        return state1.canonical() == state2.canonical()
 
     @override
     @staticmethod
@@ -186,47 +234,98 @@ class FibonacciRng(IntegerRNG[FibonacciState]):
 MAX_LAG = 1000
 VALUES_NEEDED = 5
 
+# largest number of lags verified side by side
+MAX_CANDIDATES = 16
 
-def reverse_fibonacci(generator: Iterator[int]) -> FibonacciState | None:
-    """Reverse enginner additive Lagged Fibonacci parameters."""
-    counting = CountingIterator(generator)
-    buff = BufferingIterator(counting)
-    drop(buff, MAX_LAG + VALUES_NEEDED)
-    data = list(buff.buffer)
-
-    for s in range(counting.count - VALUES_NEEDED):
-        for r in range(1, s):
-            assumed_mod = None
-            with_carry = False
-
-            for i in range(s, len(data)):
-                new_assumed_mod = data[i - s] + data[i - r] - data[i]
-                if abs(new_assumed_mod) <= 1:
-                    continue
 
-                if assumed_mod is None:
-                    assumed_mod = new_assumed_mod
-                    continue
-                if assumed_mod == new_assumed_mod:
-                    continue
-                if new_assumed_mod - assumed_mod == 1:
-                    assumed_mod = new_assumed_mod
-                    with_carry = True
-                    continue
-                if new_assumed_mod - assumed_mod == -1:
-                    with_carry = True
+class FibonacciReverser(SolvingReverser[FibonacciState]):
+    """
+    Finds the lags and modulus from the relation between the values.
+
+    A first attempt is made on a few values, which is enough for small lags,
+    then on enough values for any lag up to `MAX_LAG`.
+    """
+
+    solve_samples = 64
+
+    @override
+    def solve(self, values: list[int], final: bool) -> list[FibonacciRng] | Progress:
+        """Look for all lags that the values agree with, the smallest first."""
+        data = values
+        found = []
+
+        for s in range(len(data) - VALUES_NEEDED):
+            for r in range(1, s):
+                if (relation := self.relation(data, r, s)) is None:
                     continue
 
-                break
-            else:
+                assumed_mod, with_carry = relation
                 if assumed_mod is None:
                     # probably not an additive lagged fibonacci sequence
-                    return None
+                    return found or Progress.REJECTED
+
+                if assumed_mod <= max(r, s):
+                    # a spurious relation, no generator has such a modulus
+                    continue
 
                 carry = data[-1 - s] + data[-1 - r] >= assumed_mod
 
-                return FibonacciState(
-                    r, s, assumed_mod, data[-max(s, r) :], carry if with_carry else None
+                state = FibonacciState(
+                    r,
+                    s,
+                    assumed_mod,
+                    data[-max(s, r) :],
+                    carry if with_carry else None,
                 )
+                found.append(FibonacciRng.from_state(state))
+
+                if len(found) == MAX_CANDIDATES:
+                    return found
+
+        if found:
+            return found
 
-    return None
+        if len(data) >= MAX_LAG + VALUES_NEEDED:
+            return Progress.REJECTED
+
+        # the lags may be larger than the values seen so far
+        self.needed = MAX_LAG + VALUES_NEEDED
+        return Progress.NOT_YET
+
+    @staticmethod
+    def relation(data: list[int], r: int, s: int) -> tuple[int | None, bool] | None:
+        """
+        Return the modulus and whether there is carry for lags r < s.
+
+        Return None if the values do not agree with the lags, and no modulus
+        if every value is the sum of the lagged ones.
+        """
+        assumed_mod = None
+        with_carry = False
+
+        for i in range(s, len(data)):
+            new_assumed_mod = data[i - s] + data[i - r] - data[i]
+            if abs(new_assumed_mod) <= 1:
+                continue
+
+            if assumed_mod is None:
+                assumed_mod = new_assumed_mod
+                continue
+            if assumed_mod == new_assumed_mod:
+                continue
+            if new_assumed_mod - assumed_mod == 1:
+                assumed_mod = new_assumed_mod
+                with_carry = True
+                continue
+            if new_assumed_mod - assumed_mod == -1:
+                with_carry = True
+                continue
+
+            return None
+
+        return assumed_mod, with_carry
+
+
+def reverse_fibonacci(generator: Iterable[int]) -> FibonacciState | None:
+    """Reverse enginner additive Lagged Fibonacci parameters."""
+    return FibonacciReverser().run(generator)
@@ -1,13 +1,16 @@
-from collections.abc import Iterator
-from itertools import islice, pairwise
-from math import gcd
-from typing import NamedTuple, override
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from itertools import pairwise
+from math import gcd, lcm
+from typing import Any, NamedTuple, override
 
 from mod import Mod
 
 from seedseeker.defs import IntegerRNG, InvalidFormatError
-from seedseeker.utils.iterator import BufferingIterator, drop, synchronize
-from seedseeker.utils.primes import divisors
+from seedseeker.feed import CONFIRM_SAMPLES, Progress, SolvingReverser
+from seedseeker.utils.fingerprint import digest, pack_ints
+from seedseeker.utils.optional import numpy
+from seedseeker.utils.primes import divisors, factorize
 
 
 class LcgState(NamedTuple):
@@ -21,6 +24,14 @@ class LcgState(NamedTuple):
         """Print LCG state as string."""
         return f"{self.x_n.modulus};{self.a};{self.c};{int(self.x_n)}"
 
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state."""
+        return pack_ints(b"lcg", [self.x_n.modulus, self.a, self.c, int(self.x_n)])
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return digest(self.canonical())
+
 
 class Lcg(IntegerRNG[LcgState]):
     """
@@ -52,11 +63,46 @@ class Lcg(IntegerRNG[LcgState]):
         self.x_n = self.a * self.x_n + self.c
         return int(self.x_n)
 
+    @override
+    def next_block(self, n: int) -> Sequence[int]:
+        """
+        Return the next n values at once.
+
+        With NumPy and a modulus of at most 32 bits, every value is computed
+        from the current one by its own power of the step, which fits in 64
+        bits, so the block is a single vectorized expression.
+        """
+        if n == 0:
+            return []
+
+        x, m = int(self.x_n), self.m
+        np = numpy()
+
+        if np is not None and m <= 2**32:
+            multipliers, increments = block_powers(self.a, self.c, m, n)
+            block = (multipliers * np.uint64(x) + increments) % np.uint64(m)
+            self.x_n = Mod(int(block[-1]), m)
+            return block
+
+        a, c = self.a, self.c
+        values = []
+        for _ in range(n):
+            x = (a * x + c) % m
+            values.append(x)
+
+        self.x_n = Mod(x, m)
+        return values
+
     @override
     def state(self) -> LcgState:
         """Return the inner state."""
         return LcgState(self.a, self.c, self.x_n)
 
+    @override
+    def fork(self) -> "Lcg":
+        """Return an independent copy of the generator."""
+        return Lcg.from_state(self.state())
+
     @override
     @staticmethod
     def from_state(state: LcgState) -> "Lcg":
@@ -68,7 +114,7 @@ class Lcg(IntegerRNG[LcgState]):
     @staticmethod
     def is_state_equal(state1: LcgState, state2: LcgState) -> bool:
         """Check if two LCG states are equal."""
-        return state1 == state2
+        return state1.canonical() == state2.canonical()
 
     @override
     @staticmethod
@@ -93,43 +139,175 @@ class Lcg(IntegerRNG[LcgState]):
         return LcgState(a, c, Mod(x_0, m))
 
 
-def reverse_lcg(gen: Iterator[int]) -> LcgState | None:
-    """Attempt to reverse-engineer LCG parameters."""
-    buffered_lcg = BufferingIterator(gen, max_size=3)
+@lru_cache(maxsize=16)
+def block_powers(a: int, c: int, m: int, n: int) -> tuple[Any, Any]:
+    """Return the multipliers and increments of 1 to n steps as NumPy arrays."""
+    np = numpy()
+    assert np is not None, "NumPy is required"
 
-    differences = BufferingIterator(
-        (b - a for a, b in pairwise(buffered_lcg)), max_size=4
-    )
-    drop(differences, 4)  # fill the buffer
+    multipliers, increments = [], []
+    multiplier, increment = 1, 0
+    for _ in range(n):
+        multiplier, increment = multiplier * a % m, (increment * a + c) % m
+        multipliers.append(multiplier)
+        increments.append(increment)
+
+    return np.array(multipliers, np.uint64), np.array(increments, np.uint64)
 
-    if len(differences.buffer) < 4:
-        return None
 
-    guesses: list[int] = []
+class SlidingGcd:
+    """
+    Queue of integers that keeps the gcd of its contents.
 
-    while True:
-        x1, x2, x3, x4 = differences.buffer
+    Two stacks store running gcds, so pushing and popping take an amortized
+    constant number of gcd operations.
+    """
 
-        guess = x4 * x1 - x2 * x3
+    # newest values, with the gcd of each value and the ones pushed before it
+    back: list[tuple[int, int]]
+    # oldest values, with the gcd of each value and the ones pushed after it
+    front: list[tuple[int, int]]
+    # number of non-zero values
+    nonzero: int
+
+    def __init__(self) -> None:
+        """Start empty."""
+        self.back = []
+        self.front = []
+        self.nonzero = 0
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self.back) + len(self.front)
+
+    def push(self, value: int) -> None:
+        """Add the newest value."""
+        self.back.append((value, gcd(value, self.back[-1][1] if self.back else 0)))
+        self.nonzero += value != 0
+
+    def pop(self) -> int:
+        """Remove and return the oldest value."""
+        if not self.front:
+            while self.back:
+                value, _ = self.back.pop()
+                running = self.front[-1][1] if self.front else 0
+                self.front.append((value, gcd(value, running)))
+
+        value, _ = self.front.pop()
+        self.nonzero -= value != 0
+        return value
+
+    def gcd(self) -> int:
+        """Return the gcd of all values, 0 when empty."""
+        back = self.back[-1][1] if self.back else 0
+        front = self.front[-1][1] if self.front else 0
+        return gcd(back, front)
+
+
+class LcgReverser(SolvingReverser[LcgState]):
+    """
+    Finds LCG parameters from multiples of the modulus.
 
-        if guess > 0:
-            guesses.append(guess)
+    For differences dₙ = Xₙ₊₁ - Xₙ, every dₙ₊₃·dₙ - dₙ₊₁·dₙ₊₂ is a multiple of
+    the modulus, so their greatest common divisor is the modulus or a small
+    multiple of it.
+    """
 
-        try:
-            next(differences)
-            if len(guesses) < 30:
-                continue
-        except StopIteration:
-            if len(guesses) < 8:
-                return None
+    # 4 differences per guess and enough guesses for a reliable divisor
+    min_samples = 12
+    solve_samples = 34
+
+    # number of positive guesses wanted, and needed at the end of the input
+    GUESSES = 30
+    MIN_GUESSES = 8
+
+    # guesses of the values pushed by `slide`
+    guesses: SlidingGcd
+
+    def __init__(
+        self,
+        confirm_samples: int = CONFIRM_SAMPLES,
+        tolerance: int = 0,
+        false_positive: float | None = None,
+    ) -> None:
+        """Start with no values."""
+        super().__init__(confirm_samples, tolerance, false_positive)
+        self.guesses = SlidingGcd()
+
+    @override
+    def state_bits(self, values: list[int]) -> float:
+        """Return the bits of the modulus, multiplier, increment and state."""
+        return 4 * self.value_bits(values)
+
+    @override
+    def solve(self, values: list[int], final: bool) -> list[Lcg] | Progress:
+        """Guess the modulus, then the multiplier and increment."""
+        d = [b - a for a, b in pairwise(values)]
+        guesses = [
+            guess
+            for x1, x2, x3, x4 in zip(d, d[1:], d[2:], d[3:], strict=False)
+            if (guess := x4 * x1 - x2 * x3) > 0
+        ]
+
+        if len(guesses) < self.GUESSES and not final:
+            return Progress.NOT_YET
+        if len(guesses) < self.MIN_GUESSES:
+            return Progress.REJECTED
+
+        return self.candidates(values[-3:], gcd(*guesses))
+
+    @override
+    def slide(self, value: int) -> Lcg | None:
+        """Add the guess of the newest differences, drop the oldest one."""
+        self.window.append(value)
+
+        if len(self.window) >= 5:
+            a, b, c, d, e = (self.window[i] for i in range(-5, 0))
+            guess = (e - d) * (b - a) - (c - b) * (d - c)
+            # non-positive guesses count as 0, which does not change the gcd
+            self.guesses.push(max(guess, 0))
+            if len(self.guesses) > self.solve_samples - 4:
+                self.guesses.pop()
+
+        if self.guesses.nonzero < self.MIN_GUESSES:
+            return None
+
+        last = [self.window[i] for i in range(-3, 0)]
+        solution = self.parameters(last, self.guesses.gcd())
+        if isinstance(solution, Progress):
+            return None
+
+        # values before the output of the LCG may only give non-positive
+        # guesses, so the window is checked as a whole
+        a, c, x_n = solution.state()
+        modulus = x_n.modulus
+        if self.window[0] >= modulus or any(
+            (a * x + c) % modulus != y for x, y in pairwise(self.window)
+        ):
+            return None
 
-        upper_modulus = gcd(*guesses)
+        return solution
 
+    @staticmethod
+    def parameters(last: list[int], upper_modulus: int) -> Lcg | Progress:
+        """Find the parameters from the last 3 values and a multiple of the modulus."""
+        candidates = LcgReverser.candidates(last, upper_modulus)
+        return candidates[0] if isinstance(candidates, list) else candidates
+
+    @staticmethod
+    def candidates(last: list[int], upper_modulus: int) -> list[Lcg] | Progress:
+        """
+        Find the parameters for every divisor of a multiple of the modulus.
+
+        The last 3 values determine the multiplier and increment for each
+        modulus. Return the candidates from the largest modulus down.
+        """
         if upper_modulus <= 1:
             # not an LCG sequence
-            return None
+            return Progress.REJECTED
 
-        a1, a2, a3 = islice(buffered_lcg.buffer, 3)
+        a1, a2, a3 = last
+        found = []
 
         for modulus in divisors(upper_modulus):
             try:
@@ -142,13 +320,135 @@ def reverse_lcg(gen: Iterator[int]) -> LcgState | None:
             if not 0 < multiple < modulus:
                 continue
 
-            a1, a2 = islice(buffered_lcg.buffer, 2)
             increment = (a2 - a1 * multiple) % modulus
+            found.append(
+                Lcg.from_state(LcgState(multiple, increment, Mod(a3, modulus)))
+            )
 
-            if not 0 <= increment < modulus:
-                continue
+        if not found:
+            # the last values do not determine the parameters, try with later ones
+            return Progress.NOT_YET
 
-            guessed_gen = Lcg.from_state(
-                LcgState(multiple, increment, Mod(a3, modulus))
-            )
-            return synchronize(gen, guessed_gen)
+        return found
+
+
+def reverse_lcg(values: Iterable[int]) -> LcgState | None:
+    """Attempt to reverse-engineer LCG parameters."""
+    return LcgReverser().run(values)
+
+
+def affine_power(a: int, c: int, k: int, m: int) -> tuple[int, int]:
+    """Return the multiplier and increment of k steps of the LCG."""
+    multiplier, increment = 1, 0
+
+    # compose the maps of 1, 2, 4, 8, ... steps by the bits of k
+    while k:
+        if k & 1:
+            multiplier, increment = multiplier * a % m, (increment * a + c) % m
+        a, c = a * a % m, (c * a + c) % m
+        k >>= 1
+
+    return multiplier, increment
+
+
+def carmichael(factors: dict[int, int]) -> int:
+    """Return the exponent of the multiplicative group, given the factors of m."""
+    exponent = 1
+
+    for prime, power in factors.items():
+        if prime == 2 and power >= 3:
+            exponent = lcm(exponent, 2 ** (power - 2))
+        else:
+            exponent = lcm(exponent, prime ** (power - 1) * (prime - 1))
+
+    return exponent
+
+
+def unit_step(a: int, c: int, k: int, m: int) -> tuple[int, int] | None:
+    """
+    Return the only parameters whose k steps have multiplier a and increment c.
+
+    The multiplier is the k-th root of a, which is unique when k is coprime
+    to the exponent of the multiplicative group (e.g. any odd k for a power
+    of two), and the increment then follows unless a geometric series is not
+    invertible. Return None if the parameters are not unique.
+    """
+    if gcd(a, m) != 1 or (factors := factorize(m)) is None:
+        return None
+
+    exponent = carmichael(factors)
+    if gcd(k, exponent) != 1:
+        return None
+
+    multiplier = pow(a, pow(k, -1, exponent), m)
+
+    # k steps add the increment times 1 + a + a² + ... + aᵏ⁻¹
+    _, series = affine_power(multiplier, 1, k, m)
+    try:
+        increment = c * pow(series, -1, m) % m
+    except ValueError:
+        return None
+
+    return multiplier, increment
+
+
+def reverse_lcg_sparse(pairs: Iterable[tuple[int, int]]) -> LcgState | None:
+    """
+    Attempt to reverse-engineer LCG parameters from values at known indices.
+
+    Every stride-th value of an LCG is again an LCG, where the stride is the
+    greatest common divisor of the distances between the indices. Its
+    modulus is guessed from runs of five values a stride apart, and the
+    values between runs are checked by jumping with powers of its parameters.
+    Return the state after the last index, if the parameters of a single
+    step are unique.
+    """
+    samples = sorted(dict(pairs).items())
+    if len(samples) < 2:
+        return None
+
+    first = samples[0][0]
+    stride = gcd(*(index - first for index, _ in samples))
+    # values by the number of strides after the first index
+    values = {(index - first) // stride: value for index, value in samples}
+
+    guesses = []
+    for position in values:
+        run = [values.get(position + i) for i in range(5)]
+        if None not in run:
+            a, b, c, d, e = run
+            if (guess := (e - d) * (b - a) - (c - b) * (d - c)) > 0:
+                guesses.append(guess)
+
+    if len(guesses) < LcgReverser.MIN_GUESSES:
+        return None
+
+    last = next(
+        [values[p], values[p + 1], values[p + 2]]
+        for p in reversed(values)
+        if p + 1 in values and p + 2 in values
+    )
+    strided = LcgReverser.parameters(last, gcd(*guesses))
+    if isinstance(strided, Progress):
+        return None
+
+    multiplier, increment, x_n = strided.state()
+    modulus = x_n.modulus
+    # every distance between samples is jumped with its own power
+    jumps: dict[int, tuple[int, int]] = {}
+
+    for (previous, x), (position, y) in pairwise(values.items()):
+        distance = position - previous
+        if distance not in jumps:
+            jumps[distance] = affine_power(multiplier, increment, distance, modulus)
+
+        a, c = jumps[distance]
+        if x >= modulus or (a * x + c) % modulus != y:
+            return None
+
+    if stride > 1:
+        if (step := unit_step(multiplier, increment, stride, modulus)) is None:
+            return None
+        multiplier, increment = step
+
+    return LcgState(multiplier, increment, Mod(samples[-1][1], modulus))
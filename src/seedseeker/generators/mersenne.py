@@ -1,11 +1,12 @@
-from collections.abc import Iterator
-from itertools import islice
+from collections.abc import Iterable
+from functools import lru_cache
 from typing import NamedTuple, override
 
 from randcrack import RandCrack
 
 from seedseeker.defs import IntegerRNG, InvalidFormatError
-from seedseeker.utils.iterator import CountingIterator
+from seedseeker.feed import CONFIRM_SAMPLES, SolvingReverser
+from seedseeker.utils.fingerprint import ENCODINGS, pack_words
 
 
 class MersenneTwisterState(NamedTuple):
@@ -18,6 +19,41 @@ class MersenneTwisterState(NamedTuple):
         """Print Mersenne Twister state as string."""
         return f"{self.array};{self.pointer}"
 
+    @override
+    def __eq__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        if not isinstance(other, MersenneTwisterState | RandCrackState):
+            return NotImplemented
+        return self.canonical() == other.canonical()
+
+    @override
+    def __ne__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash the canonical encoding."""
+        return hash(self.canonical())
+
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state, cached in `ENCODINGS`."""
+        return ENCODINGS.canonical(self, self.encode)
+
+    def encode(self) -> bytes:
+        """
+        Encode the state canonically.
+
+        The encoding is the block of the next 624 untempered words, which is
+        the same for both the incremental and the RandCrack representation.
+        """
+        # positions from the pointer onwards hold the oldest words of the window
+        words = self.array[self.pointer :] + self.array[: self.pointer]
+        return pack_words(b"mersenne", regenerated(tuple(words)), "I")
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return ENCODINGS.fingerprint(self, self.encode)
+
 
 class RandCrackState(NamedTuple):
     """State of RandCrack reverser."""
@@ -27,14 +63,51 @@ class RandCrackState(NamedTuple):
 
     def __str__(self) -> str:
         """Print RandCrack state as string."""
-
-        def bits_to_int(bits: list[int]) -> int:
-            return int("".join(map(str, bits)), 2)
-
         hex_encoded = ",".join(f"{bits_to_int(i32):X}" for i32 in self.mt)
 
         return f"{hex_encoded};{self.counter}"
 
+    @override
+    def __eq__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        if not isinstance(other, MersenneTwisterState | RandCrackState):
+            return NotImplemented
+        return self.canonical() == other.canonical()
+
+    @override
+    def __ne__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash the canonical encoding."""
+        return hash(self.canonical())
+
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state, cached in `ENCODINGS`."""
+        return ENCODINGS.canonical(self, self.encode)
+
+    def encode(self) -> bytes:
+        """
+        Encode the state canonically.
+
+        See `MersenneTwisterState.encode`.
+        """
+        words = [bits_to_int(bits) for bits in self.mt]
+
+        # RandCrack keeps the whole generated block and a counter into it
+        if self.counter >= MersenneTwister.N:
+            words = regenerated(tuple(words))
+        elif self.counter > 0:
+            block = regenerated(tuple(words))
+            words = [*words[self.counter :], *block[: self.counter]]
+
+        return pack_words(b"mersenne", words, "I")
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return ENCODINGS.fingerprint(self, self.encode)
+
 
 class MersenneTwister(IntegerRNG[MersenneTwisterState]):
     """Mersenne Twister 19937 PRNG."""
@@ -58,6 +131,8 @@ class MersenneTwister(IntegerRNG[MersenneTwisterState]):
     state_array: list[int]
     state_index: int
     rand_crack: RandCrack | None
+    # the state array is also referenced by a fork or a returned state
+    shared: bool
 
     def __init__(self, seed: int):
         """Create a new Mersenne Twister 19937 PRNG from given seed."""
@@ -66,17 +141,34 @@ class MersenneTwister(IntegerRNG[MersenneTwisterState]):
         self.state_index = 0
         self.state_array = [seed] + [0] * (self.N - 1)
         self.rand_crack = None
+        self.shared = False
 
         for i in range(1, self.N):
             seed = self.F * (seed ^ (seed >> (self.W - 2))) % self.MODULO + i
             self.state_array[i] = seed
 
+    @staticmethod
+    def unseeded(
+        array: list[int], index: int, rand_crack: RandCrack | None = None
+    ) -> "MersenneTwister":
+        """Create a generator sharing `array`, skipping the seeding procedure."""
+        rng = MersenneTwister.__new__(MersenneTwister)
+        rng.state_array = array
+        rng.state_index = index
+        rng.rand_crack = rand_crack
+        rng.shared = True
+        return rng
+
     @override
     def __next__(self) -> int:
         """Return the next value."""
         if self.rand_crack is not None:
             return self.rand_crack.predict_getrandbits(32)
 
+        if self.shared:
+            self.state_array = self.state_array.copy()
+            self.shared = False
+
         k = self.state_index
         j = k - (self.N - 1)
         if j < 0:
@@ -108,26 +200,42 @@ class MersenneTwister(IntegerRNG[MersenneTwisterState]):
     def state(self) -> MersenneTwisterState | RandCrackState:
         """Return the inner state."""
         if self.rand_crack is None:
+            self.shared = True
             return MersenneTwisterState(self.state_array, self.state_index)
 
-        return RandCrackState(self.rand_crack.mt, self.rand_crack.counter)
+        # RandCrack regenerates its block in place
+        return RandCrackState(list(self.rand_crack.mt), self.rand_crack.counter)
+
+    @override
+    def fork(self) -> "MersenneTwister":
+        """Return an independent copy of the generator."""
+        if self.rand_crack is not None:
+            return MersenneTwister.from_state(self.state())
+
+        self.shared = True
+        return MersenneTwister.unseeded(self.state_array, self.state_index)
 
     @override
     @staticmethod
-    def from_state(state: RandCrackState) -> "MersenneTwister":
+    def from_state(state: MersenneTwisterState | RandCrackState) -> "MersenneTwister":
         """Set the inner state."""
-        rng = MersenneTwister(0)
-        rng.rand_crack = RandCrack()
-        rng.rand_crack.mt, rng.rand_crack.counter = state
-        rng.rand_crack.state = True
-        return rng
+        if isinstance(state, MersenneTwisterState):
+            return MersenneTwister.unseeded(*state)
+
+        rand_crack = RandCrack()
+        rand_crack.mt = list(state.mt)
+        rand_crack.counter = state.counter
+        rand_crack.state = True
+        return MersenneTwister.unseeded([], 0, rand_crack)
 
     @override
     @staticmethod
     def is_state_equal(
-        state1: MersenneTwisterState, state2: MersenneTwisterState
+        state1: MersenneTwisterState | RandCrackState,
+        state2: MersenneTwisterState | RandCrackState,
     ) -> bool:
-        raise NotImplementedError
+        """Check if two Mersenne Twister states are equal."""
+        return state1.canonical() == state2.canonical()
 
     @override
     @staticmethod
@@ -167,19 +275,110 @@ class MersenneTwister(IntegerRNG[MersenneTwisterState]):
         return RandCrackState(array, counter)
 
 
-def reverse_mersenne(mersenne: Iterator[int]) -> RandCrackState | None:
-    """Find state using RandCrack algorithm from an iterator."""
-    predictor = RandCrack()
-    counting = CountingIterator(mersenne)
+def bits_to_int(bits: list[int]) -> int:
+    """Convert a RandCrack bit list (most significant bit first) to an integer."""
+    return int("".join(map(str, bits)), 2)
 
-    for value in islice(counting, 624):
-        predictor.submit(value)
 
-    if counting.count < 624:
-        return None
+def regenerate(words: list[int]) -> list[int]:
+    """Return the next block of 624 untempered words following `words`."""
+    n, m = MersenneTwister.N, MersenneTwister.M
+    upper, lower, a = MersenneTwister.UMASK, MersenneTwister.LMASK, MersenneTwister.A
 
-    for value in counting:
-        if value != predictor.predict_getrandbits(32):
-            return None
+    block = list(words)
+    for k in range(n):
+        x = (block[k] & upper) | (block[(k + 1) % n] & lower)
+        x_a = x >> 1
+        if x & 1:
+            x_a ^= a
+        block[k] = block[(k + m) % n] ^ x_a
+
+    return block
+
+
+@lru_cache(maxsize=64)
+def regenerated(words: tuple[int, ...]) -> tuple[int, ...]:
+    """Return `regenerate` of the words, computed once for states compared often."""
+    return tuple(regenerate(list(words)))
+
+
+def untemper(y: int) -> int:
+    """Return the state word that is tempered into output `y`."""
+    mt = MersenneTwister
+    y ^= y >> mt.L
+    y ^= (y << mt.T) & mt.C
+    # the left shift by 7 is undone 7 bits at a time
+    x = y
+    for _ in range(4):
+        x = y ^ ((x << mt.S) & mt.B)
+    y = x & 0xFFFFFFFF
+    # and the right shift by 11, 11 bits at a time
+    x = y
+    for _ in range(2):
+        x = y ^ (x >> mt.U)
+    return x
+
+
+class MersenneReverser(SolvingReverser[RandCrackState]):
+    """Untempers 624 consecutive outputs into the state array with RandCrack."""
+
+    min_samples = 624
+    solve_samples = 624
+
+    # untempered words of the values pushed by `slide`, a circular buffer
+    ring: list[int]
+    # position in `ring` of the oldest word
+    oldest: int
+    # generator returned by the last call to `slide`
+    candidate: MersenneTwister | None
+
+    def __init__(
+        self,
+        confirm_samples: int = CONFIRM_SAMPLES,
+        tolerance: int = 0,
+        false_positive: float | None = None,
+    ) -> None:
+        """Start with no values."""
+        super().__init__(confirm_samples, tolerance, false_positive)
+        self.ring = []
+        self.oldest = 0
+        self.candidate = None
+
+    @override
+    def slide(self, value: int) -> MersenneTwister | None:
+        """Untemper the value in place of the oldest one."""
+        self.window.append(value)
+
+        if len(self.ring) < MersenneTwister.N:
+            self.ring.append(untemper(value))
+            if len(self.ring) < MersenneTwister.N:
+                return None
+        else:
+            # the last generator still shares the ring if it was not advanced
+            if self.candidate is not None and self.candidate.state_array is self.ring:
+                self.ring = self.ring.copy()
+            self.ring[self.oldest] = untemper(value)
+            self.oldest = (self.oldest + 1) % MersenneTwister.N
+
+        self.candidate = MersenneTwister.unseeded(self.ring, self.oldest)
+        return self.candidate
 
-    return RandCrackState(predictor.mt, predictor.counter)
+    @override
+    def state_bits(self, values: list[int]) -> float:
+        """Return the bits of the state array, of its first word only the top one."""
+        return 32 * MersenneTwister.N - 31
+
+    @override
+    def solve(self, values: list[int], final: bool) -> MersenneTwister:
+        """Return a generator predicting the values after these."""
+        predictor = RandCrack()
+
+        for value in values[:624]:
+            predictor.submit(value)
+
+        return MersenneTwister.unseeded([], 0, predictor)
+
+
+def reverse_mersenne(mersenne: Iterable[int]) -> RandCrackState | None:
+    """Find state using RandCrack algorithm from an iterator."""
+    return MersenneReverser().run(mersenne)
@@ -1,9 +1,11 @@
 import itertools
-from collections.abc import Iterator
+from collections.abc import Iterable
+from math import log2
 from typing import NamedTuple, override
 
 from seedseeker.defs import IntegerRNG, InvalidFormatError
-from seedseeker.utils.iterator import synchronize
+from seedseeker.feed import SolvingReverser
+from seedseeker.utils.fingerprint import ENCODINGS, pack_words
 
 
 class Ran3State(NamedTuple):
@@ -18,6 +20,41 @@ class Ran3State(NamedTuple):
         array = ",".join(map(str, self.array))
         return f"{array};{self.pointer_a};{self.pointer_b}"
 
+    @override
+    def __eq__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        if not isinstance(other, Ran3State):
+            return NotImplemented
+        return self.canonical() == other.canonical()
+
+    @override
+    def __ne__(self, other: object) -> bool:
+        """Compare the canonical encodings, like the hash."""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash the canonical encoding."""
+        return hash(self.canonical())
+
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state, cached in `ENCODINGS`."""
+        return ENCODINGS.canonical(self, self.encode)
+
+    def encode(self) -> bytes:
+        """
+        Encode the state canonically.
+
+        The circular buffer is rotated to start at the next value to be
+        overwritten, followed by the distance between the two pointers.
+        """
+        pointer_a, pointer_b = self.pointer_a, self.pointer_b
+        rotated = [self.array[(pointer_a + i) % 55 + 1] for i in range(55)]
+        return pack_words(b"ran3", [(pointer_b - pointer_a) % 55, *rotated], "i")
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return ENCODINGS.fingerprint(self, self.encode)
+
 
 class Ran3(IntegerRNG[Ran3State]):
     """
@@ -36,9 +73,13 @@ class Ran3(IntegerRNG[Ran3State]):
     seed_array: list[int]
     pointer_a: int
     pointer_b: int
+    # the seed array is also referenced by a fork or a returned state
+    shared: bool
 
     def __init__(self, seed: int) -> None:
         """Create a new Ran3 PRNG from the given seed."""
+        self.shared = False
+
         # simulate Int32's native overflow
         if not (self.MIN_INT <= seed < self.MAX_INT + 1):
             seed %= 2**32
@@ -85,9 +126,23 @@ class Ran3(IntegerRNG[Ran3State]):
             "Seed array overflowed"
         )
 
+    @staticmethod
+    def unseeded(array: list[int], pointer_a: int, pointer_b: int) -> "Ran3":
+        """Create a Ran3 PRNG sharing `array`, skipping the seeding procedure."""
+        rng = Ran3.__new__(Ran3)
+        rng.seed_array = array
+        rng.pointer_a = pointer_a
+        rng.pointer_b = pointer_b
+        rng.shared = True
+        return rng
+
     @override
     def __next__(self) -> int:
         """Return the next value."""
+        if self.shared:
+            self.seed_array = self.seed_array.copy()
+            self.shared = False
+
         self.pointer_a += 1
         if self.pointer_a >= 56:
             self.pointer_a = 1
@@ -107,45 +162,56 @@ class Ran3(IntegerRNG[Ran3State]):
 
         return value
 
+    @override
+    def next_block(self, n: int) -> list[int]:
+        """Return the next n values at once, stepping in local variables."""
+        if self.shared:
+            self.seed_array = self.seed_array.copy()
+            self.shared = False
+
+        array, a, b = self.seed_array, self.pointer_a, self.pointer_b
+        max_int = self.MAX_INT
+        values = []
+
+        for _ in range(n):
+            a = a + 1 if a < 55 else 1
+            b = b + 1 if b < 55 else 1
+
+            value = array[a] - array[b]
+            if value == max_int:
+                value -= 1
+            if value < 0:
+                value += max_int
+
+            array[a] = value
+            values.append(value)
+
+        self.pointer_a, self.pointer_b = a, b
+        return values
+
     @override
     def state(self) -> Ran3State:
         """Return the inner state."""
+        self.shared = True
         return Ran3State(self.seed_array, self.pointer_a, self.pointer_b)
 
+    @override
+    def fork(self) -> "Ran3":
+        """Return an independent copy of the generator."""
+        self.shared = True
+        return Ran3.unseeded(self.seed_array, self.pointer_a, self.pointer_b)
+
     @override
     @staticmethod
     def from_state(state: Ran3State) -> "Ran3":
         """Create a new Ran3 PRNG from the given state."""
-        rng = Ran3(0)
-        rng.seed_array, rng.pointer_a, rng.pointer_b = state
-        return rng
+        return Ran3.unseeded(*state)
 
     @override
     @staticmethod
     def is_state_equal(state1: Ran3State, state2: Ran3State) -> bool:
         """Check if two Ran3 PRNG states are equal."""
-        array1, pointer_a1, pointer_b1 = state1
-        array2, pointer_a2, pointer_b2 = state2
-
-        # This is more complex than a simple
-        # equality check because the internal state is a circular buffer.
-        if ((pointer_b1 - pointer_b2) - (pointer_a1 - pointer_a2)) % 55 != 0:
-            return False
-
-        for _ in range(55):
-            pointer_a1 += 1
-            pointer_a2 += 1
-
-            if pointer_a1 >= 56:
-                pointer_a1 = 1
-
-            if pointer_a2 >= 56:
-                pointer_a2 = 1
-
-            if array1[pointer_a1] != array2[pointer_a2]:
-                return False
-
-        return True
+        return state1.canonical() == state2.canonical()
 
     @override
     @staticmethod
@@ -182,11 +248,23 @@ class Ran3(IntegerRNG[Ran3State]):
         return Ran3State(array, pointer_a, pointer_b)
 
 
-def reverse_ran3(gen: Iterator[int]) -> Ran3State | None:
-    """Reverse a ran3 parameters."""
-    try:
-        state = Ran3State([0] + [next(gen) for _ in range(55)], 55, 21)
-    except StopIteration:
-        return None
+class Ran3Reverser(SolvingReverser[Ran3State]):
+    """Uses the first 55 values as the state array, the rest verifies it."""
+
+    min_samples = 55
+    solve_samples = 55
+
+    @override
+    def state_bits(self, values: list[int]) -> float:
+        """Return the bits of the 55 values of the state array."""
+        return 55 * log2(Ran3.MAX_INT)
 
-    return synchronize(gen, Ran3.from_state(state))
+    @override
+    def solve(self, values: list[int], final: bool) -> Ran3:
+        """Return the generator whose array holds the values."""
+        return Ran3.from_state(Ran3State([0, *values[:55]], 55, 21))
+
+
+def reverse_ran3(values: Iterable[int]) -> Ran3State | None:
+    """Reverse a ran3 parameters."""
+    return Ran3Reverser().run(values)
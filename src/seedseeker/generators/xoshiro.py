@@ -1,8 +1,13 @@
-from collections.abc import Iterator
+from collections import Counter
+from collections.abc import Iterable
+from functools import cache
+from itertools import pairwise
 from typing import NamedTuple, override
 
 from seedseeker.defs import IntegerRNG, InvalidFormatError
-from seedseeker.utils.iterator import synchronize
+from seedseeker.feed import SolvingReverser
+from seedseeker.utils.fingerprint import digest, pack_words
+from seedseeker.utils.gf2 import Transition, solve
 
 
 class XoshiroState(NamedTuple):
@@ -17,6 +22,14 @@ class XoshiroState(NamedTuple):
         """Print state as string."""
         return f"{self.s0};{self.s1};{self.s2};{self.s3}"
 
+    def canonical(self) -> bytes:
+        """Return the canonical encoding of the state."""
+        return pack_words(b"xoshiro", self, "Q")
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the canonical encoding."""
+        return digest(self.canonical())
+
 
 class Xoshiro(IntegerRNG[XoshiroState]):
     """Xoshiro256** PRNG."""
@@ -51,11 +64,37 @@ class Xoshiro(IntegerRNG[XoshiroState]):
         self.s3 = rot(self.s3, 45)
         return r
 
+    @override
+    def next_block(self, n: int) -> list[int]:
+        """Return the next n values at once, stepping in local variables."""
+        mask = self.MODULO - 1
+        s0, s1, s2, s3 = self.s0, self.s1, self.s2, self.s3
+        values = []
+
+        for _ in range(n):
+            r = s1 * 5 & mask
+            values.append(((r << 7 | r >> 57) & mask) * 9 & mask)
+            t = s1 << 17 & mask
+            s2 ^= s0
+            s3 ^= s1
+            s1 ^= s2
+            s0 ^= s3
+            s2 ^= t
+            s3 = (s3 << 45 | s3 >> 19) & mask
+
+        self.s0, self.s1, self.s2, self.s3 = s0, s1, s2, s3
+        return values
+
     @override
     def state(self) -> XoshiroState:
         """Return the inner state."""
         return XoshiroState(self.s0, self.s1, self.s2, self.s3)
 
+    @override
+    def fork(self) -> "Xoshiro":
+        """Return an independent copy of the generator."""
+        return Xoshiro.from_state(self.state())
+
     @override
     @staticmethod
     def from_state(state: XoshiroState) -> "Xoshiro":
@@ -66,7 +105,7 @@ class Xoshiro(IntegerRNG[XoshiroState]):
     @staticmethod
     def is_state_equal(state1: XoshiroState, state2: XoshiroState) -> bool:
         """Check if two Xoshiro256** states are equal."""
-        return state1 == state2
+        return state1.canonical() == state2.canonical()
 
     @override
     @staticmethod
@@ -99,44 +138,130 @@ def rot(x: int, k: int, bit_size: int = 64) -> int:
     return ((x << k) | (x >> (bit_size - k))) % 2**bit_size
 
 
-def reverse_xoshiro(gen: Iterator[int]) -> XoshiroState | None:
-    """Attempt to reverse-engineer Xoshiro256** parameters."""
+def unscramble(x: int) -> int:
+    """Return the word s1 that the output function turned into x."""
     inv9 = pow(9, -1, 2**64)
     inv5 = pow(5, -1, 2**64)
+    return (rot((x * inv9) % 2**64, 64 - 7) * inv5) % 2**64
+
+
+class XoshiroReverser(SolvingReverser[XoshiroState]):
+    """Inverts the output function on four consecutive values."""
+
+    min_samples = 4
+    solve_samples = 4
+
+    @override
+    def state_bits(self, values: list[int]) -> float:
+        """Return the bits of the four state words."""
+        return STATE_BITS
+
+    @override
+    def solve(self, values: list[int], final: bool) -> Xoshiro:
+        """Recover the state before the values from the first four of them."""
+        a, b, c, d = values[:4]
+
+        # sX is the inital state
+        s1 = unscramble(a)
+        s0s2 = s1 ^ unscramble(b)
+        s0s3 = ((s1 << 17) ^ unscramble(c)) % 2**64
+
+        # tX us the state after one iteration
+        t0 = s1 ^ s0s3
+        t1 = s1 ^ s0s2
+        _t2 = s0s2 ^ (s1 << 17) % 2**64
+        t3 = t0 ^ unscramble(d) ^ (t1 << 17) % 2**64
+
+        s3 = rot(t3, 64 - 45) ^ s1
+        s0 = t0 ^ s1 ^ s3
+        s2 = t1 ^ s0 ^ s1
+
+        state = XoshiroState(s0, s1, s2, s3)
 
-    def helper(x: int) -> int:
-        return (rot((x * inv9) % 2**64, 64 - 7) * inv5) % 2**64
+        # advance to the same position we left the input in
+        reversed_gen = Xoshiro.from_state(state)
+        for _ in values:
+            _ = next(reversed_gen)
 
-    try:
-        a = next(gen)
-        b = next(gen)
-        c = next(gen)
-        d = next(gen)
-    except StopIteration:
+        return reversed_gen
+
+
+def reverse_xoshiro(values: Iterable[int]) -> XoshiroState | None:
+    """Attempt to reverse-engineer Xoshiro256** parameters."""
+    return XoshiroReverser().run(values)
+
+
+# bits of the state vector, s0 in the lowest 64 bits and s3 in the highest
+STATE_BITS = 256
+
+# number of times a distance between samples must occur for its power of the
+# transition to be worth computing, instead of jumping by repeated squares
+POWER_REUSE = 256
+
+
+def to_vector(state: XoshiroState) -> int:
+    """Return the state as a vector of 256 bits."""
+    return sum(word << (64 * i) for i, word in enumerate(state))
+
+
+def from_vector(vector: int) -> XoshiroState:
+    """Return the state of a vector of 256 bits."""
+    return XoshiroState(*((vector >> (64 * i)) % 2**64 for i in range(4)))
+
+
+@cache
+def transition() -> Transition:
+    """Return the map from a state to the next one, with its powers kept."""
+    columns = []
+
+    for bit in range(STATE_BITS):
+        generator = Xoshiro.from_state(from_vector(1 << bit))
+        _ = next(generator)
+        columns.append(to_vector(generator.state()))
+
+    rows = [
+        sum(((column >> row) & 1) << bit for bit, column in enumerate(columns))
+        for row in range(STATE_BITS)
+    ]
+    return Transition(rows)
+
+
+def reverse_xoshiro_sparse(pairs: Iterable[tuple[int, int]]) -> XoshiroState | None:
+    """
+    Attempt to reverse-engineer Xoshiro256** from values at known indices.
+
+    The output function is inverted on every value, which gives the word s1
+    at its index. The words are linear in the state at the first index, with
+    the transition raised to the distance between the indices, so four
+    values usually determine it. Return the state after the last index, if
+    it also predicts the other values.
+    """
+    samples = sorted(dict(pairs).items())
+    if len(samples) < 4:
         return None
 
-    # sX is the inital state
-    s1 = helper(a)
-    s0s2 = s1 ^ helper(b)
-    s0s3 = ((s1 << 17) ^ helper(c)) % 2**64
+    steps = transition()
+    first = samples[0][0]
+    # the word s1 as linear forms of the state
+    words = [1 << bit for bit in range(64, 128)]
 
-    # tX us the state after one iteration
-    t0 = s1 ^ s0s3
-    t1 = s1 ^ s0s2
-    _t2 = s0s2 ^ (s1 << 17) % 2**64
-    t3 = t0 ^ helper(d) ^ (t1 << 17) % 2**64
+    def equations() -> Iterable[tuple[int, int]]:
+        for index, value in samples:
+            word = unscramble(value)
+            rows = steps.after(words, index - first)
+            yield from ((row, (word >> bit) & 1) for bit, row in enumerate(rows))
 
-    s3 = rot(t3, 64 - 45) ^ s1
-    s0 = t0 ^ s1 ^ s3
-    s2 = t1 ^ s0 ^ s1
+    if (vector := solve(equations(), STATE_BITS)) is None or vector == 0:
+        return None
 
-    state = XoshiroState(s0, s1, s2, s3)
+    distances = [b - a for (a, _), (b, _) in pairwise(samples)]
+    for distance, count in Counter(distances).items():
+        if count >= POWER_REUSE:
+            _ = steps.power(distance)
 
-    # advance to the same position we left the input in
-    reversed_gen = Xoshiro.from_state(state)
-    _ = next(reversed_gen)
-    _ = next(reversed_gen)
-    _ = next(reversed_gen)
-    _ = next(reversed_gen)
+    for (_, value), distance in zip(samples, [0, *distances], strict=True):
+        vector = steps.jump(vector, distance)
+        if unscramble(value) != from_vector(vector).s1:
+            return None
 
-    return synchronize(gen, reversed_gen)
+    return from_vector(steps.jump(vector, 1))
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from seedseeker.batch import Capture, Options, batch
+
+# largest number of interleaved streams tried
+MAX_STRIDE = 8
+
+
+class Stream(NamedTuple):
+    """A generator producing every `stride`-th value, starting at `phase`."""
+
+    stride: int
+    phase: int
+    generator: str
+    # state after the last value of the stream
+    state: str
+
+    def to_json(self) -> str:
+        """Return the stream as a single line of JSON."""
+        return json.dumps(self._asdict())
+
+
+def substreams(values: list[int], max_stride: int) -> Iterator[Capture]:
+    """Yield every value of every stride and phase as a capture."""
+    for stride in range(1, max_stride + 1):
+        for phase in range(stride):
+            yield Capture(f"{stride}:{phase}", values[phase::stride], None)
+
+
+def separate(
+    values: list[int],
+    options: Options,
+    jobs: int | None = None,
+    max_stride: int = MAX_STRIDE,
+) -> list[Stream]:
+    """
+    Split a sequence drawn from several generators in a fixed rotation.
+
+    Every stride up to `max_stride` and each of its phases is reversed
+    on its own, all of them at once on a pool of worker processes. Return
+    the streams of the smallest stride where every phase has a generator,
+    or no streams if there is no such stride. Stride 1 is the sequence
+    itself.
+    """
+    found: dict[int, dict[int, Stream]] = {}
+
+    for result in batch(substreams(values, max_stride), options, jobs):
+        if result.generator is not None and result.state is not None:
+            stride, phase = map(int, result.id.split(":"))
+            stream = Stream(stride, phase, result.generator, result.state)
+            # the reversers are tried by likelihood, keep the first match
+            _ = found.setdefault(stride, {}).setdefault(phase, stream)
+
+    for stride in sorted(found):
+        if len(found[stride]) == stride:
+            return [found[stride][phase] for phase in range(stride)]
+
+    return []
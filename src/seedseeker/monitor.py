@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Generator, Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+from seedseeker.feed import FeedReverser, Progress, Reverser, as_feed
+from seedseeker.utils.iterator import first_mismatch
+from seedseeker.utils.throughput import Latency, Meter
+
+# number of values the reversers get to identify the generator, after which
+# they are restarted on the following values
+WINDOW = 4096
+
+# number of values fed to the reversers at once, so that they lock on before
+# a reseed later in a large block mixes two sequences
+STEP = 128
+
+
+class Event(NamedTuple):
+    """Something that happened on a monitored stream."""
+
+    # `locked`, `diverged` or `unidentified`
+    event: str
+    # number of values of the stream before the event, a locked state is the
+    # state after them and a diverging value is the next one
+    position: int
+    generator: str | None
+    state: str | None
+    # seconds between reading the block that caused the event and reporting it
+    latency: float
+    # predicted and actual value, when diverged
+    expected: int | None = None
+    actual: int | None = None
+
+    def to_json(self) -> str:
+        """Return the event as a single line of JSON."""
+        return json.dumps(self._asdict())
+
+
+class Locked(NamedTuple):
+    """The generator a monitor follows."""
+
+    name: str
+    generator: Any
+
+
+class Monitor:
+    """
+    Identifies the generator of a live stream, then follows it.
+
+    Every block of values is fed to all reversers until one of them confirms
+    a state. From then on every value is only compared with the prediction of
+    that generator, and the first one that differs (usually a reseed) is
+    reported and starts a new identification. Reversers that do not decide
+    within `window` values are finished on what they got.
+    """
+
+    reversers: dict[str, Reverser]
+    generators: Mapping[str, Any]
+    window: int | None
+    position: int
+    # reversers trying to identify the generator and the values fed to them
+    candidates: dict[str, FeedReverser[Any]]
+    fed: int
+    locked: Locked | None
+    # whether the current identification already reported a failure
+    reported: bool
+    verify: Meter
+    latency: Latency
+
+    def __init__(
+        self,
+        reversers: dict[str, Reverser],
+        generators: Mapping[str, Any],
+        window: int | None = WINDOW,
+    ) -> None:
+        """Monitor with `reversers`, following the matching `generators`."""
+        self.reversers = reversers
+        self.generators = generators
+        self.window = window
+        self.position = 0
+        self.candidates = {}
+        self.fed = 0
+        self.locked = None
+        self.reported = False
+        self.verify = Meter("verify", "values")
+        self.latency = Latency("latency")
+
+    def run(self, blocks: Iterable[list[int]]) -> Iterator[Event]:
+        """Process blocks as they arrive, yielding events as they happen."""
+        for block in blocks:
+            read = time.perf_counter()
+            yield from self.process(block, read)
+            self.latency.add(time.perf_counter() - read)
+
+        if self.candidates:
+            yield from self.conclude(time.perf_counter())
+
+    def process(self, block: list[int], read: float) -> Iterator[Event]:
+        """Identify or verify the values of a block."""
+        offset = 0
+
+        while offset < len(block):
+            if self.locked is None:
+                offset = yield from self.identify(block, offset, read)
+            else:
+                offset = yield from self.follow(block, offset, read)
+
+    def identify(
+        self, block: list[int], offset: int, read: float
+    ) -> Generator[Event, None, int]:
+        """Feed the reversers, return the offset of the first value left."""
+        if not self.candidates:
+            self.candidates = {n: as_feed(r) for n, r in self.reversers.items()}
+            self.fed = 0
+
+        end = min(len(block), offset + STEP)
+        if self.window is not None:
+            end = min(end, offset + self.window - self.fed)
+
+        values = block[offset:end]
+        self.fed += len(values)
+        self.position += len(values)
+
+        for name, reverser in list(self.candidates.items()):
+            progress = reverser.feed(values)
+
+            if progress is Progress.REJECTED:
+                del self.candidates[name]
+            elif progress is Progress.CONFIRMED and self.lock(name, reverser):
+                yield self.locked_event(read)
+                return end
+
+        if not self.candidates:
+            yield from self.unidentified(read)
+        elif self.fed == self.window:
+            yield from self.conclude(read)
+
+        return end
+
+    def conclude(self, read: float) -> Iterator[Event]:
+        """Finish the reversers on the values they got."""
+        for name, reverser in self.candidates.items():
+            if self.lock(name, reverser):
+                yield self.locked_event(read)
+                return
+
+        yield from self.unidentified(read)
+
+    def lock(self, name: str, reverser: FeedReverser[Any]) -> bool:
+        """Follow the generator of a reverser, return whether it found one."""
+        if (state := reverser.finish()) is None:
+            return False
+
+        generator = self.generators[name].from_state(state)
+        self.locked = Locked(name, generator)
+        self.candidates = {}
+        self.reported = False
+        return True
+
+    def unidentified(self, read: float) -> Iterator[Event]:
+        """Restart the identification, reporting the first failure only."""
+        self.candidates = {}
+
+        if not self.reported:
+            self.reported = True
+            latency = time.perf_counter() - read
+            yield Event("unidentified", self.position, None, None, latency)
+
+    def locked_event(self, read: float) -> Event:
+        """Return the event of locking on the followed generator."""
+        assert self.locked is not None, "Must be locked"
+
+        name, generator = self.locked
+        latency = time.perf_counter() - read
+        return Event("locked", self.position, name, str(generator.state()), latency)
+
+    def follow(
+        self, block: list[int], offset: int, read: float
+    ) -> Generator[Event, None, int]:
+        """Compare the values with the predictions, stop at the first mismatch."""
+        assert self.locked is not None, "Must be locked"
+
+        started = time.perf_counter()
+        name, generator = self.locked
+
+        # the generator is dropped at a mismatch, so it may predict past it
+        predicted = generator.next_block(len(block) - offset)
+
+        if (mismatch := first_mismatch(block[offset:], predicted)) is not None:
+            index = offset + mismatch
+            self.verify.add(mismatch, time.perf_counter() - started)
+            self.position += mismatch
+            self.locked = None
+
+            latency = time.perf_counter() - read
+            yield Event(
+                "diverged",
+                self.position,
+                name,
+                None,
+                latency,
+                int(predicted[mismatch]),
+                block[index],
+            )
+            return index
+
+        self.verify.add(len(block) - offset, time.perf_counter() - started)
+        self.position += len(block) - offset
+        return len(block)
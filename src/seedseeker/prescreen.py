@@ -0,0 +1,174 @@
+from collections.abc import Iterable
+from itertools import combinations, pairwise
+from typing import NamedTuple
+
+from seedseeker.registry import PLUGINS, Profile
+from seedseeker.utils.optional import numpy
+
+# number of values the features are computed from
+SAMPLE_SIZE = 4096
+
+# below this many values, unused high bits are not considered significant
+SIGNIFICANT_COUNT = 64
+
+# largest lag and number of values used to look for Fibonacci relations
+FIBONACCI_LAG = 32
+FIBONACCI_SAMPLE = 512
+
+# largest period of the lowest bit that is considered LCG-like
+LOW_BIT_PERIOD = 8
+
+
+class Features(NamedTuple):
+    """Cheap statistics of the beginning of a sequence."""
+
+    count: int
+    minimum: int
+    maximum: int
+    # smallest period of the lowest bit, if it is at most LOW_BIT_PERIOD
+    low_bit_period: int | None
+    # whether no value is followed by two different values
+    functional: bool
+    # small lags (r, s) that satisfy the additive Fibonacci relation
+    fibonacci_lags: tuple[int, int] | None
+
+
+# profile of generators that do not declare one
+DEFAULT_PROFILE = Profile(0, None, None)
+
+
+class Verdict(NamedTuple):
+    """Likelihood that a generator produced the sequence."""
+
+    name: str
+    score: float
+    # why the generator can not have produced the sequence
+    reason: str | None
+
+
+def low_bit_period(values: list[int]) -> int | None:
+    """Return the smallest period of the lowest bit of the values."""
+    np = numpy()
+
+    if np is not None and min(values) >= 0 and max(values) < 2**64:
+        bits = np.array(values, dtype=np.uint64) & 1
+        periods = (p for p in range(1, LOW_BIT_PERIOD + 1) if p < len(bits))
+        return next((p for p in periods if (bits[p:] == bits[:-p]).all()), None)
+
+    bits = [value & 1 for value in values]
+    periods = (p for p in range(1, LOW_BIT_PERIOD + 1) if p < len(bits))
+    return next((p for p in periods if bits[p:] == bits[:-p]), None)
+
+
+def is_functional(values: list[int]) -> bool:
+    """Check that every value is always followed by the same value."""
+    successors: dict[int, int] = {}
+
+    for value, successor in pairwise(values):
+        if successors.setdefault(value, successor) != successor:
+            return False
+
+    return True
+
+
+def fibonacci_lags(values: list[int]) -> tuple[int, int] | None:
+    """
+    Find small lags r < s for which Xₙ₋ᵣ + Xₙ₋ₛ - Xₙ takes at most 4 values.
+
+    These are 0 and the modulus, shifted by one when the generator uses carry.
+    """
+    values = values[:FIBONACCI_SAMPLE]
+    lags = combinations(range(1, min(FIBONACCI_LAG, len(values) - 1) + 1), 2)
+    np = numpy()
+
+    if np is not None and min(values) >= 0 and max(values) < 2**62:
+        array = np.array(values, dtype=np.int64)
+
+        for r, s in lags:
+            relation = array[s - r : -r] + array[:-s] - array[s:]
+            if len(np.unique(relation)) <= 4:
+                return r, s
+
+        return None
+
+    for r, s in lags:
+        relation = {
+            values[i - r] + values[i - s] - values[i] for i in range(s, len(values))
+        }
+        if len(relation) <= 4:
+            return r, s
+
+    return None
+
+
+def features(values: list[int]) -> Features:
+    """Compute the features of a non-empty sequence."""
+    return Features(
+        len(values),
+        min(values),
+        max(values),
+        low_bit_period(values),
+        is_functional(values),
+        fibonacci_lags(values),
+    )
+
+
+def profile_of(name: str) -> Profile:
+    """Return the profile of the generator `name`."""
+    return PLUGINS[name].profile if name in PLUGINS else DEFAULT_PROFILE
+
+
+def rule_out(name: str, f: Features) -> str | None:
+    """Return why the generator `name` can not have produced the sequence."""
+    profile = profile_of(name)
+
+    if f.minimum < 0:
+        return "sequence contains negative values"
+    if f.count < profile.min_samples:
+        return f"needs at least {profile.min_samples} values"
+    if profile.limit is not None and f.maximum >= profile.limit:
+        return f"values exceed {profile.limit - 1}"
+
+    width = f.maximum.bit_length()
+    if (
+        profile.bits is not None
+        and f.count >= SIGNIFICANT_COUNT
+        and width < profile.bits
+    ):
+        return f"values use only {width} of {profile.bits} bits"
+
+    if name == "lcg" and not f.functional:
+        return "a value is followed by different values"
+
+    return None
+
+
+def score(name: str, f: Features) -> float:
+    """Score how likely the generator `name` is to have produced the sequence."""
+    profile = profile_of(name)
+    total = 0.0
+
+    if profile.bits is not None and f.maximum.bit_length() == profile.bits:
+        total += 2
+    if name == "lcg" and f.low_bit_period is not None:
+        total += 1
+    if name == "fibonacci" and f.fibonacci_lags is not None:
+        total += 3
+
+    return total
+
+
+def rank(values: list[int], names: Iterable[str]) -> list[Verdict]:
+    """
+    Judge every generator on the beginning of a sequence.
+
+    The verdicts are ordered from the most to the least likely generator, and
+    from the cheapest to the most costly reverser among equally likely ones.
+    Only the declared profiles are used, no generator is imported.
+    """
+    if not values:
+        return [Verdict(name, 0, "sequence is empty") for name in names]
+
+    f = features(values[:SAMPLE_SIZE])
+    verdicts = (Verdict(name, score(name, f), rule_out(name, f)) for name in names)
+    return sorted(verdicts, key=lambda v: (-v.score, profile_of(v.name).cost))
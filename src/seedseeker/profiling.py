@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator, Sized
+from contextlib import contextmanager
+from typing import Any, NamedTuple, override
+
+from seedseeker.feed import FeedReverser, Progress, SolvingReverser
+from seedseeker.utils.iterator import CountingIterator
+
+
+class Profiling(NamedTuple):
+    """How the reversers are profiled."""
+
+    # directory to write the cProfile statistics of every reverser to
+    directory: str | None = None
+
+    def dump(self, name: str) -> str | None:
+        """Return the path of the statistics of reverser `name`, if written."""
+        if self.directory is None:
+            return None
+
+        return os.path.join(self.directory, f"{name}.prof")
+
+
+class Timing(NamedTuple):
+    """Wall and CPU time in seconds."""
+
+    wall: float
+    cpu: float
+
+
+class Usage(NamedTuple):
+    """Time, values and memory used by a stage of the reversal."""
+
+    name: str
+    wall: float
+    cpu: float
+    # values read by the stage, None if it does not read values
+    values: int | None = None
+    # candidate states solved, None if the stage does not solve
+    candidates: int | None = None
+    # most memory allocated at once in bytes, None if not traced
+    peak_memory: int | None = None
+    # time of the parts of the stage, in order
+    phases: tuple[tuple[str, Timing], ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the usage with the phases as a dictionary."""
+        usage = self._asdict()
+        usage["phases"] = {name: timing._asdict() for name, timing in self.phases}
+        return usage
+
+
+class Clock:
+    """Wall and CPU time spent in a stage, over any number of measurements."""
+
+    wall: float
+    cpu: float
+
+    def __init__(self) -> None:
+        """Start with no time spent."""
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Add the time spent in the block."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall += time.perf_counter() - wall
+            self.cpu += time.process_time() - cpu
+
+    def timing(self) -> Timing:
+        """Return the time spent so far."""
+        return Timing(self.wall, self.cpu)
+
+
+class Instrumented[StateT](FeedReverser[StateT]):
+    """
+    Measures where a reverser spends its time.
+
+    The time spent in `solve` of a `SolvingReverser` is told apart from the
+    rest, which verifies the candidates. Other reversers are measured as a
+    whole.
+    """
+
+    reverser: FeedReverser[StateT]
+    work: Clock
+    # time in `solve`, None if the reverser does not solve
+    solving: Clock | None
+    values: int
+    candidates: int
+
+    def __init__(self, reverser: FeedReverser[StateT]) -> None:
+        """Measure `reverser`, replacing its `solve` by a measured one."""
+        self.reverser = reverser
+        self.work = Clock()
+        self.solving = None
+        self.values = 0
+        self.candidates = 0
+
+        if isinstance(reverser, SolvingReverser):
+            self.solving = Clock()
+            reverser.solve = self.measured(reverser.solve)
+
+    def measured(self, solve: Callable[[list[int], bool], Any]) -> Any:
+        """Return `solve` measuring its time and counting the candidates."""
+        assert self.solving is not None, "Reverser must solve"
+        clock = self.solving
+
+        def measured_solve(values: list[int], final: bool) -> Any:
+            with clock.measure():
+                solution = solve(values, final)
+
+            if isinstance(solution, list):
+                self.candidates += len(solution)
+            elif not isinstance(solution, Progress):
+                self.candidates += 1
+            return solution
+
+        return measured_solve
+
+    @override
+    def feed(self, values: Iterable[int]) -> Progress:
+        """Feed the values to the reverser, counting them."""
+        # lists are passed on as they are, reversers may read them in bulk
+        if isinstance(values, Sized):
+            self.values += len(values)
+            with self.work.measure():
+                return self.reverser.feed(values)
+
+        counted = CountingIterator(iter(values))
+        with self.work.measure():
+            progress = self.reverser.feed(counted)
+
+        self.values += counted.count
+        return progress
+
+    @override
+    def finish(self) -> StateT | None:
+        """Finish the reverser."""
+        with self.work.measure():
+            return self.reverser.finish()
+
+    def phases(self) -> tuple[tuple[str, Timing], ...]:
+        """Return the time spent solving and verifying."""
+        if self.solving is None:
+            return ()
+
+        solve = self.solving.timing()
+        verify = Timing(self.work.wall - solve.wall, self.work.cpu - solve.cpu)
+        return (("solve", solve), ("verify", verify))
+
+
+class Probe:
+    """
+    Measures a whole reverser run, in the process running it.
+
+    Memory allocations are traced from the start, and with a `dump` path
+    the run is profiled with cProfile and the statistics written there.
+    Both slow the reverser down, so its times are only comparable to those
+    of other reversers measured the same way.
+    """
+
+    clock: Clock
+    profiler: cProfile.Profile | None
+    dump: str | None
+    instrumented: Instrumented[Any] | None
+    counter: CountingIterator[int] | None
+
+    def __init__(self, dump: str | None = None) -> None:
+        """Start measuring."""
+        self.dump = dump
+        self.instrumented = None
+        self.counter = None
+        self.clock = Clock()
+
+        tracemalloc.start()
+        self.profiler = None
+        if dump is not None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def instrument[StateT](
+        self, reverser: FeedReverser[StateT]
+    ) -> FeedReverser[StateT]:
+        """Return the reverser measuring its phases."""
+        self.instrumented = Instrumented(reverser)
+        return self.instrumented
+
+    def counted(self, values: Iterator[int]) -> Iterator[int]:
+        """Return the values counting how many the reverser reads."""
+        self.counter = CountingIterator(values)
+        return self.counter
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        """Measure the time of the run."""
+        with self.clock.measure():
+            yield
+
+    def finish(self, name: str) -> Usage:
+        """Stop measuring, return what the reverser `name` used."""
+        if self.profiler is not None and self.dump is not None:
+            self.profiler.disable()
+            os.makedirs(os.path.dirname(self.dump) or ".", exist_ok=True)
+            self.profiler.dump_stats(self.dump)
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        values = None
+        candidates = None
+        phases: tuple[tuple[str, Timing], ...] = ()
+
+        if self.instrumented is not None:
+            values = self.instrumented.values
+            phases = self.instrumented.phases()
+            if self.instrumented.solving is not None:
+                candidates = self.instrumented.candidates
+        elif self.counter is not None:
+            values = self.counter.count
+
+        return Usage(
+            name, self.clock.wall, self.clock.cpu, values, candidates, peak, phases
+        )
+
+
+def table(usages: Iterable[Usage]) -> str:
+    """Return the usage of every stage as a human readable table."""
+    header = (
+        f"{'stage':<16}{'wall s':>10}{'cpu s':>10}{'values':>10}"
+        f"{'candidates':>12}{'peak MiB':>10}"
+    )
+    lines = [header]
+
+    def cell(value: float | None, width: int, spec: str) -> str:
+        return f"{'-' if value is None else format(value, spec):>{width}}"
+
+    for usage in usages:
+        peak = None if usage.peak_memory is None else usage.peak_memory / 2**20
+        lines.append(
+            f"{usage.name:<16}{usage.wall:>10.3f}{usage.cpu:>10.3f}"
+            f"{cell(usage.values, 10, ',')}{cell(usage.candidates, 12, ',')}"
+            f"{cell(peak, 10, '.1f')}"
+        )
+        lines.extend(
+            f"  {phase:<14}{timing.wall:>10.3f}{timing.cpu:>10.3f}"
+            for phase, timing in usage.phases
+        )
+
+    return "\n".join(lines)
+
+
+def to_json(usages: Iterable[Usage]) -> str:
+    """Return the usage of every stage as a single line of JSON."""
+    return json.dumps([usage.to_dict() for usage in usages])
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator, Mapping
+from importlib import import_module
+from typing import Any, NamedTuple, override
+
+# entry point group that third-party generators are installed in
+ENTRY_POINT_GROUP = "seedseeker.plugins"
+
+
+class Profile(NamedTuple):
+    """What a generator's output looks like and how costly it is to reverse."""
+
+    # number of values the reverser needs
+    min_samples: int
+    # number of bits of every output value
+    bits: int | None
+    # exclusive upper bound on the output values
+    limit: int | None
+    # rough time in milliseconds to reverse 1024 values, cheaper reversers
+    # are tried first among equally likely ones
+    cost: float = 100
+
+
+class Plugin(NamedTuple):
+    """
+    A generator and its reverser.
+
+    The reverser is a `FeedReverser` class, or a function taking an iterator
+    and returning the state or None. Both are given as `module:attribute`
+    paths, so declaring a plugin imports neither of them. Third-party plugins
+    are entry points in the `seedseeker.plugins` group that refer to a
+    `Plugin`, e.g.
+
+        [project.entry-points."seedseeker.plugins"]
+        mine = "mypackage.seedseeker:PLUGIN"
+
+    The module holding the declaration should not import the generator.
+    A plugin may also have a function reversing (index, value) pairs of
+    values observed only at those indices.
+    """
+
+    generator: str
+    reverser: str
+    profile: Profile
+    sparse: str | None = None
+
+
+BUILTINS = {
+    "fibonacci": Plugin(
+        "seedseeker.generators.fibonacci:FibonacciRng",
+        "seedseeker.generators.fibonacci:FibonacciReverser",
+        Profile(0, None, None, cost=400),
+    ),
+    "lcg": Plugin(
+        "seedseeker.generators.lcg:Lcg",
+        "seedseeker.generators.lcg:LcgReverser",
+        Profile(12, None, None, cost=10),
+        "seedseeker.generators.lcg:reverse_lcg_sparse",
+    ),
+    "ran3": Plugin(
+        "seedseeker.generators.ran3:Ran3",
+        "seedseeker.generators.ran3:Ran3Reverser",
+        Profile(55, 31, 2**31 - 1, cost=1),
+    ),
+    "xoshiro": Plugin(
+        "seedseeker.generators.xoshiro:Xoshiro",
+        "seedseeker.generators.xoshiro:XoshiroReverser",
+        Profile(4, 64, 2**64, cost=2),
+        "seedseeker.generators.xoshiro:reverse_xoshiro_sparse",
+    ),
+    "mersenne": Plugin(
+        "seedseeker.generators.mersenne:MersenneTwister",
+        "seedseeker.generators.mersenne:MersenneReverser",
+        Profile(624, 32, 2**32, cost=60),
+    ),
+}
+
+
+def load(path: str) -> Any:
+    """Import the object at a `module:attribute` path."""
+    module, _, attribute = path.partition(":")
+    return getattr(import_module(module), attribute)
+
+
+class PluginRegistry(Mapping[str, Plugin]):
+    """
+    Built-in plugins followed by the installed ones.
+
+    Installed plugins are discovered the first time a name that is not
+    built in is needed, so using a built-in generator does not scan the
+    installed packages. Plugins that can not be loaded, or that reuse a
+    built-in name, are skipped with a warning.
+    """
+
+    builtin: dict[str, Plugin]
+    group: str | None
+    discovered: dict[str, Plugin] | None
+
+    def __init__(self, builtin: dict[str, Plugin], group: str | None = None) -> None:
+        """Register built-in plugins, and discover more in entry point `group`."""
+        self.builtin = builtin
+        self.group = group
+        self.discovered = None
+
+    def plugins(self) -> dict[str, Plugin]:
+        """Return all plugins, discovering the installed ones on first use."""
+        if self.discovered is None:
+            self.discovered = {**self.builtin, **self.discover()}
+
+        return self.discovered
+
+    def discover(self) -> dict[str, Plugin]:
+        """Load the plugin declarations of the entry point group."""
+        if self.group is None:
+            return {}
+
+        from importlib.metadata import entry_points  # noqa: PLC0415
+
+        plugins = {}
+
+        for entry_point in entry_points(group=self.group):
+            try:
+                plugin = entry_point.load()
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if not isinstance(plugin, Plugin):
+                    reason = f"{entry_point.value} is not a Plugin"
+                elif entry_point.name in self.builtin:
+                    reason = "a built-in generator has the same name"
+                else:
+                    plugins[entry_point.name] = plugin
+                    continue
+
+            print(
+                f"Warning: Ignoring plugin {entry_point.name}: {reason}",
+                file=sys.stderr,
+            )
+
+        return plugins
+
+    @override
+    def __getitem__(self, name: str) -> Plugin:
+        """Return the plugin registered under `name`."""
+        if name in self.builtin:
+            return self.builtin[name]
+
+        return self.plugins()[name]
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names in registration order."""
+        return iter(self.plugins())
+
+    @override
+    def __len__(self) -> int:
+        """Return the number of plugins."""
+        return len(self.plugins())
+
+    @override
+    def __contains__(self, name: object) -> bool:
+        """Return whether a plugin is registered under `name`."""
+        return name in self.builtin or name in self.plugins()
+
+
+class LazyRegistry(Mapping[str, Any]):
+    """
+    Maps names to the generators or reversers of plugins.
+
+    Every object is imported on first use, so looking one up imports only its
+    own module and what that module depends on. Listing the names imports
+    nothing.
+    """
+
+    plugins: Mapping[str, Plugin]
+    # which path of the plugins to load, `generator` or `reverser`
+    attribute: str
+    loaded: dict[str, Any]
+
+    def __init__(self, plugins: Mapping[str, Plugin], attribute: str) -> None:
+        """Load the `attribute` path of every plugin."""
+        assert attribute in Plugin._fields, f"Unknown plugin attribute {attribute}"
+
+        self.plugins = plugins
+        self.attribute = attribute
+        self.loaded = {}
+
+    @override
+    def __getitem__(self, name: str) -> Any:
+        """Return the object registered under `name`, importing it if needed."""
+        if name not in self.loaded:
+            self.loaded[name] = load(getattr(self.plugins[name], self.attribute))
+
+        return self.loaded[name]
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names in registration order."""
+        return iter(self.plugins)
+
+    @override
+    def __len__(self) -> int:
+        """Return the number of registered names."""
+        return len(self.plugins)
+
+    @override
+    def __contains__(self, name: object) -> bool:
+        """Return whether `name` is registered, without importing it."""
+        return name in self.plugins
+
+
+PLUGINS = PluginRegistry(BUILTINS, ENTRY_POINT_GROUP)
+
+GENERATORS = LazyRegistry(PLUGINS, "generator")
+
+REVERSERS = LazyRegistry(PLUGINS, "reverser")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from seedseeker.defs import IntegerRNG
+from seedseeker.feed import CONFIRM_SAMPLES, Reverser, SolvingReverser
+
+
+class Segment(NamedTuple):
+    """A run of values produced by a single generator."""
+
+    generator: str
+    # index of the first value of the run and of the first value after it
+    start: int
+    end: int
+    # state after the last value of the run
+    state: Any
+
+    def to_json(self) -> str:
+        """Return the segment as a single line of JSON."""
+        return json.dumps({**self._asdict(), "state": str(self.state)})
+
+
+def scan(
+    values: list[int],
+    reversers: dict[str, Reverser],
+    confirm_samples: int = CONFIRM_SAMPLES,
+) -> Iterator[Segment]:
+    """
+    Find the runs of generator output in `values`, wherever they start.
+
+    The reversers must be `SolvingReverser` classes (see `feed.slides`).
+    Each of them slides a window over the values and every candidate it
+    finds is confirmed once it predicted the next `confirm_samples` values.
+    As the windows only move forward, the first confirmed window starts
+    where the run does, give or take values the generator barely depends on
+    (only the top bit of the oldest Mersenne Twister word is ever used). The
+    search restarts at the first value a confirmed generator did not predict.
+    """
+    position = 0
+
+    while (
+        segment := find_segment(values, position, reversers, confirm_samples)
+    ) is not None:
+        yield segment
+        position = segment.end
+
+
+def find_segment(
+    values: list[int],
+    position: int,
+    reversers: dict[str, Reverser],
+    confirm_samples: int,
+) -> Segment | None:
+    """Return the run of generator output that starts first after `position`."""
+    sliders: dict[str, SolvingReverser[Any]] = {
+        name: reverser() for name, reverser in reversers.items()
+    }
+
+    for index in range(position, len(values)):
+        for name, slider in sliders.items():
+            if (candidate := slider.slide(values[index])) is None:
+                continue
+
+            start = index + 1 - len(slider.window)
+            stop = index + 1 + confirm_samples
+            if (
+                stop > len(values)
+                or predicted(candidate, values, index + 1, stop) < confirm_samples
+            ):
+                continue
+
+            # the candidate advances past the first value it does not predict
+            confirmed = candidate.fork()
+            matched = predicted(candidate, values, stop, len(values))
+            for _ in range(matched):
+                _ = next(confirmed)
+
+            return Segment(name, start, stop + matched, confirmed.state())
+
+    return None
+
+
+def predicted(
+    generator: IntegerRNG[Any], values: list[int], start: int, stop: int
+) -> int:
+    """Return how many of `values[start:stop]` the generator predicts in a row."""
+    for index in range(start, stop):
+        if next(generator) != values[index]:
+            return index - start
+
+    return stop - start
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import chain
+from typing import Any, BinaryIO, Literal, NamedTuple, override
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils.magic import detect
+from seedseeker.utils.optional import numpy
+from seedseeker.utils.stream import CHUNK_SIZE
+from seedseeker.utils.throughput import Meter
+
+
+class BinaryFormat(NamedTuple):
+    """Layout of fixed-width unsigned integers."""
+
+    # numpy dtype string
+    dtype: str
+    # `array` type code of the same width
+    typecode: str
+    size: int
+    byteorder: Literal["little", "big"]
+
+
+FORMATS = {
+    "u32le": BinaryFormat("<u4", "I", 4, "little"),
+    "u32be": BinaryFormat(">u4", "I", 4, "big"),
+    "u64le": BinaryFormat("<u8", "Q", 8, "little"),
+    "u64be": BinaryFormat(">u8", "Q", 8, "big"),
+}
+
+# formats understood by BinaryStream, raw integers and NumPy arrays
+BINARY_FORMATS = [*FORMATS, "npy"]
+
+
+class BinaryStream(Iterator[int]):
+    """
+    Streams integers from a binary file or stdin.
+
+    Files are memory-mapped when NumPy is available, `blocks` hands out views
+    into the mapping of `chunk_size` values without copying them. Stdin,
+    compressed input (and files without NumPy) are read into a single reused
+    buffer. Iterating converts the values to Python ints a block at a time.
+    """
+
+    path: str | None
+    layout: str
+    chunk_size: int
+    stream: BinaryIO | None
+    raw: BinaryIO | None
+    values: Iterator[int]
+    # throughput of the decompression stage, if the input is compressed
+    meters: list[Meter]
+
+    def __init__(
+        self, path: str | None, layout: str, chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Read from file `path` if provided, otherwise from `stdin`.
+
+        `layout` is one of `BINARY_FORMATS`.
+        """
+        assert layout in BINARY_FORMATS, f"Unknown binary format {layout}"
+
+        self.path = path
+        self.layout = layout
+        self.chunk_size = chunk_size
+        self.stream = None
+        self.raw = None
+        self.values = iter(())
+        self.meters = []
+
+    def __enter__(self) -> BinaryStream:
+        """Enter context and open the stream."""
+        if self.path is None:
+            self.raw = sys.stdin.buffer
+        else:
+            try:
+                self.raw = open(self.path, "rb")
+            except OSError:
+                print(
+                    f"Error: File `{self.path}` does not exist or is not accessible",
+                    file=sys.stderr,
+                )
+                sys.exit(2)
+
+        self.stream = self.raw
+        if detect(self.raw) is not None:
+            # decompressing needs threads and the codecs, only load them if used
+            from seedseeker.utils.compression import decompressed  # noqa: PLC0415
+
+            meter = Meter("decompress", "B")
+            self.stream = decompressed(self.raw, meter)
+            self.meters.append(meter)
+
+        self.values = chain.from_iterable(block.tolist() for block in self.blocks())
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Exit context and close stream."""
+        assert self.stream is not None and self.raw is not None, (
+            "Must be used in context"
+        )
+        self.values = iter(())
+        if self.stream is not self.raw:
+            self.stream.close()
+        if self.path is not None:
+            self.raw.close()
+
+    @override
+    def __next__(self) -> int:
+        """Next value."""
+        return next(self.values)
+
+    @override
+    def __iter__(self) -> Iterator[int]:
+        """Return the iterator."""
+        return self
+
+    def blocks(self) -> Iterator[Sequence[int]]:
+        """
+        Yield the input in blocks of at most `chunk_size` values.
+
+        Blocks read from a stream are only valid until the next one is read.
+        """
+        assert self.stream is not None, "Must be used in context"
+        np = numpy()
+
+        if self.layout == "npy":
+            if np is None:
+                raise InvalidFormatError("Reading .npy input requires NumPy")
+            dtype = self.npy_dtype(self.stream)
+        else:
+            dtype = FORMATS[self.layout].dtype
+
+        if np is not None and self.path is not None and self.stream.seekable():
+            yield from self.mapped_blocks(np.dtype(dtype))
+            return
+
+        if np is not None:
+            dtype = np.dtype(dtype)
+            for buffer in self.read_buffers(dtype.itemsize):
+                yield np.frombuffer(buffer, dtype)
+            return
+
+        binary_format = FORMATS[self.layout]
+        native = binary_format.byteorder == sys.byteorder
+
+        for buffer in self.read_buffers(binary_format.size):
+            if native:
+                yield buffer.cast(binary_format.typecode)
+            else:
+                values = array(binary_format.typecode)
+                values.frombytes(buffer)
+                values.byteswap()
+                yield values
+
+    def mapped_blocks(self, dtype: Any) -> Iterator[Sequence[int]]:
+        """Memory-map the input file as values of `dtype`, yield views into it."""
+        np = numpy()
+        assert np is not None and self.path is not None
+
+        if self.layout == "npy":
+            # the header was already read, the mapped array has its dtype
+            try:
+                values = np.load(self.path, mmap_mode="r", allow_pickle=False)
+            except ValueError as e:
+                raise InvalidFormatError("Invalid .npy file") from e
+        else:
+            size = self.stream.seek(0, 2) if self.stream is not None else 0
+
+            if size % dtype.itemsize != 0:
+                raise InvalidFormatError(
+                    f"Input size is not a multiple of {dtype.itemsize} bytes"
+                )
+            if size == 0:
+                return
+
+            values = np.memmap(self.path, dtype, mode="r")
+
+        values = values.reshape(-1)
+        for start in range(0, len(values), self.chunk_size):
+            yield values[start : start + self.chunk_size]
+
+    def read_buffers(self, itemsize: int) -> Iterator[memoryview]:
+        """Read the stream into a reused buffer of whole values."""
+        assert self.stream is not None, "Must be used in context"
+
+        buffer = bytearray(self.chunk_size * itemsize)
+        view = memoryview(buffer)
+
+        while True:
+            filled = 0
+            while filled < len(buffer):
+                if not (read := self.stream.readinto(view[filled:])):
+                    break
+                filled += read
+
+            if filled % itemsize != 0:
+                raise InvalidFormatError(
+                    f"Input size is not a multiple of {itemsize} bytes"
+                )
+            if filled > 0:
+                yield view[:filled]
+            if filled < len(buffer):
+                return
+
+    @staticmethod
+    def npy_dtype(stream: BinaryIO) -> str:
+        """Read the header of a .npy stream and return its dtype."""
+        np = numpy()
+        assert np is not None
+
+        try:
+            version = np.lib.format.read_magic(stream)
+            header = np.lib.format.read_array_header_1_0
+            if version != (1, 0):
+                header = np.lib.format.read_array_header_2_0
+            _, _, dtype = header(stream)
+        except ValueError as e:
+            raise InvalidFormatError("Invalid .npy header") from e
+
+        if dtype.kind not in "iu":
+            raise InvalidFormatError("Input array must contain integers")
+
+        return dtype.str
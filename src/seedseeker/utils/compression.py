@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Any, BinaryIO, override
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils.magic import detect
+from seedseeker.utils.throughput import Meter
+
+type Opener = Callable[[BinaryIO], Any]
+
+# openers of the formats told apart by their magic bytes
+OPENERS: dict[str, Opener] = {
+    "gzip": gzip.open,
+    "xz": lzma.open,
+    "bz2": bz2.open,
+}
+
+# size of the decompressed chunks and how many of them may be queued
+READ_SIZE = 2**18
+QUEUE_SIZE = 16
+
+# how often a blocked decompression thread checks whether it was stopped
+POLL_INTERVAL = 0.1
+
+
+def decompressed(raw: BinaryIO, meter: Meter | None = None) -> BinaryIO:
+    """
+    Return a stream of the decompressed data if `raw` is compressed.
+
+    Uncompressed streams are returned as they are. Compressed ones are
+    decompressed on a background thread, which is stopped by closing the
+    returned stream; `raw` itself is left open.
+    """
+    if (name := detect(raw)) is None:
+        return raw
+
+    reader = DecompressingReader(name, OPENERS[name](raw), meter)
+    return io.BufferedReader(reader, READ_SIZE)
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Raw stream decompressed ahead of time by a background thread.
+
+    The thread fills a bounded queue of chunks, so decompression overlaps
+    with whatever consumes the stream while memory usage stays bounded.
+    """
+
+    name: str
+    source: BinaryIO
+    meter: Meter
+    chunks: Queue[bytes | Exception]
+    pending: memoryview
+    finished: bool
+    stopped: Event
+    thread: Thread
+
+    def __init__(self, name: str, source: BinaryIO, meter: Meter | None) -> None:
+        """Start decompressing `source`, a decompressing file object."""
+        super().__init__()
+        self.name = name
+        self.source = source
+        self.meter = meter if meter is not None else Meter("decompress", "B")
+        self.chunks = Queue(QUEUE_SIZE)
+        self.pending = memoryview(b"")
+        self.finished = False
+        self.stopped = Event()
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Thread entry point, queue decompressed chunks until EOF."""
+        try:
+            while not self.stopped.is_set():
+                started, cpu = time.perf_counter(), time.thread_time()
+                chunk = self.source.read(READ_SIZE)
+                self.meter.add(
+                    len(chunk),
+                    time.perf_counter() - started,
+                    time.thread_time() - cpu,
+                )
+
+                self.put(chunk)
+                if not chunk:
+                    return
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            self.put(e)
+        finally:
+            self.source.close()
+
+    def put(self, item: bytes | Exception) -> None:
+        """Queue an item, giving up when the reader is closed."""
+        while not self.stopped.is_set():
+            with suppress(Full):
+                self.chunks.put(item, timeout=POLL_INTERVAL)
+                return
+
+    @override
+    def readable(self) -> bool:
+        """Return True, the stream is readable."""
+        return True
+
+    @override
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        """Read decompressed data into `buffer`, return 0 at EOF."""
+        if not self.pending and not self.finished:
+            item = self.chunks.get()
+
+            if isinstance(item, Exception):
+                self.finished = True
+                raise InvalidFormatError(f"Invalid {self.name} input: {item}") from item
+
+            self.finished = not item
+            self.pending = memoryview(item)
+
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    @override
+    def close(self) -> None:
+        """Stop the background thread and close the stream."""
+        self.stopped.set()
+        self.thread.join()
+        super().close()
@@ -1,28 +1,66 @@
 from __future__ import annotations
 
+import io
+import re
 import sys
-from collections.abc import Iterator
-from typing import Any, TextIO, override
+import time
+import warnings
+from codecs import getincrementaldecoder
+from collections.abc import Callable, Iterator
+from itertools import chain
+from typing import Any, BinaryIO, TextIO, override
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils.magic import detect
+from seedseeker.utils.optional import numpy
+from seedseeker.utils.throughput import Meter
+
+# number of characters parsed at once by `FileStream.integers`
+BLOCK_SIZE = 2**20
+
+# seconds to wait before checking whether a followed file grew
+POLL_INTERVAL = 0.1
+
+# a line containing only whitespace ends the input, unless it is followed
+BLANK_LINE = re.compile(r"^[^\S\n]*\n", re.MULTILINE)
+
+# anything that NumPy's decimal parser can not be trusted with: signs, hex
+# digits and numbers that do not fit in 64 bits
+NOT_UINT64 = re.compile(r"[-+xX]|\d{20}")
 
 
 class FileStream(Iterator[str]):
-    """Streams lines from a file or stdin."""
+    """
+    Streams lines from a file or stdin.
+
+    Input compressed with gzip, xz or bzip2 is detected by its magic bytes
+    and decompressed on a background thread. A followed file is read like
+    `tail -f`: reaching the end of a regular file waits for it to grow.
+    """
 
     stream: TextIO | None
     path: str | None
+    raw: BinaryIO | None
+    # whether to wait for more data at the end of the file
+    follow: bool
+    # throughput of the decompression and parsing stages
+    meters: list[Meter]
 
-    def __init__(self, path: str | None = None) -> None:
+    def __init__(self, path: str | None = None, follow: bool = False) -> None:
         """Read from file `path` if provided, otherwise from `stdin`."""
         self.path = path
         self.stream = None
+        self.raw = None
+        self.follow = follow
+        self.meters = []
 
     def __enter__(self) -> FileStream:
         """Enter context and open the stream."""
         if self.path is None:
-            self.stream = sys.stdin
+            self.raw = sys.stdin.buffer
         else:
             try:
-                self.stream = open(self.path)
+                self.raw = open(self.path, "rb")
             except OSError:
                 print(
                     f"Error: File `{self.path}` does not exist or is not accessible",
@@ -34,17 +72,45 @@ class FileStream(Iterator[str]):
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """Exit context and close stream."""
-        assert self.stream is not None, "Must be used in context"
-        if self.path is not None:
+        assert self.raw is not None, "Must be used in context"
+        if self.stream is not None and self.stream is not sys.stdin:
             self.stream.close()
+        if self.path is not None:
+            self.raw.close()
+
+    def text(self) -> TextIO:
+        """
+        Return the decoded input stream.
+
+        Compression is detected on first use, so that opening stdin does not
+        wait for input that is never read.
+        """
+        if self.stream is not None:
+            return self.stream
+
+        assert self.raw is not None, "Must be used in context"
+        binary = self.raw
+
+        if detect(self.raw) is not None:
+            # decompressing needs threads and the codecs, only load them if used
+            from seedseeker.utils.compression import decompressed  # noqa: PLC0415
+
+            meter = Meter("decompress", "B")
+            binary = decompressed(self.raw, meter)
+            self.meters.append(meter)
+
+        if binary is self.raw and self.path is None:
+            self.stream = sys.stdin
+        else:
+            self.stream = io.TextIOWrapper(binary)
+
+        return self.stream
 
     @override
     def __next__(self) -> str:
         """Next item."""
-        assert self.stream is not None, "Muse be used in context"
-
         try:
-            line = self.stream.readline().strip()
+            line = self.text().readline().strip()
         except EOFError:
             raise StopIteration from None
 
@@ -57,3 +123,131 @@ class FileStream(Iterator[str]):
     def __iter__(self) -> Iterator[str]:
         """Return the iterator."""
         return self
+
+    def integers(self, block_size: int = BLOCK_SIZE) -> Iterator[int]:
+        """
+        Parse the rest of the stream as integers.
+
+        Integers may be decimal or hexadecimal (`0x`) and separated by commas
+        or any whitespace, the input ends at EOF or the first empty line (only
+        at the end of a pipe when following the stream). The
+        stream is read in blocks of `block_size` characters, which are split
+        and converted in bulk, so this can not be mixed with reading lines.
+        """
+        return chain.from_iterable(self.integer_blocks(block_size))
+
+    def integer_blocks(self, block_size: int = BLOCK_SIZE) -> Iterator[list[int]]:
+        """Parse the rest of the stream as blocks of integers."""
+        _ = self.text()
+        meter = Meter("parse", "values")
+        self.meters.append(meter)
+        line = 1
+        carry = ""
+
+        for block in self.read_blocks(block_size):
+            text = carry + block
+
+            # only parse whole lines, the rest is carried over to the next block
+            if block and (end := text.rfind("\n") + 1) > 0:
+                text, carry = text[:end], text[end:]
+            elif block:
+                carry = text
+                continue
+
+            blank = None if self.follow else BLANK_LINE.search(text)
+            if blank is not None:
+                text = text[: blank.start()]
+
+            started, cpu = time.perf_counter(), time.thread_time()
+            values = parse_integers(text, line)
+            meter.add(
+                len(values), time.perf_counter() - started, time.thread_time() - cpu
+            )
+            yield values
+
+            if blank is not None:
+                return
+            line += text.count("\n")
+
+    def read_blocks(self, block_size: int) -> Iterator[str]:
+        """
+        Read the stream in blocks of at most `block_size` characters.
+
+        Data is returned as soon as it is available, the last block is empty.
+        When following a regular file, its end is polled for more data.
+        """
+        stream = self.text()
+        raw = getattr(stream, "buffer", None)
+
+        if raw is None or not hasattr(raw, "read1"):
+            while block := self.poll(stream.read, block_size):
+                yield block
+            yield ""
+            return
+
+        decoder = getincrementaldecoder(stream.encoding or "utf-8")()
+
+        while data := self.poll(raw.read1, block_size):
+            yield decoder.decode(data)
+        yield decoder.decode(b"", final=True)
+
+    def poll[T: (str, bytes)](self, read: Callable[[int], T], size: int) -> T:
+        """Read up to `size` characters or bytes, waiting for a followed file."""
+        data = read(size)
+        seekable = self.follow and self.text().seekable()
+
+        while not data and seekable:
+            time.sleep(POLL_INTERVAL)
+            data = read(size)
+
+        return data
+
+
+def parse_integers(text: str, first_line: int = 1) -> list[int]:
+    """
+    Parse integers separated by commas or whitespace.
+
+    Invalid tokens are reported with their line number, counting from
+    `first_line`.
+    """
+    text = text.replace(",", " ")
+    # NumPy parses text without any token as a single 0
+    if not text or text.isspace():
+        return []
+
+    np = numpy()
+
+    if np is not None and NOT_UINT64.search(text) is None:
+        try:
+            with warnings.catch_warnings():
+                # older NumPy versions only warn about invalid data
+                warnings.simplefilter("error", DeprecationWarning)
+                return np.fromstring(text, dtype=np.uint64, sep=" ").tolist()
+        except (ValueError, DeprecationWarning):
+            pass  # report the invalid token below
+
+    tokens = text.split()
+
+    try:
+        return list(map(parse_integer, tokens))
+    except ValueError:
+        pass
+
+    for token in tokens:
+        try:
+            _ = parse_integer(token)
+        except ValueError as e:
+            position = re.search(rf"(?<!\S){re.escape(token)}(?!\S)", text)
+            offset = position.start() if position is not None else 0
+            line = first_line + text.count("\n", 0, offset)
+            raise InvalidFormatError(f"Invalid integer `{token}` on line {line}") from e
+
+    raise AssertionError("Some token must be invalid")
+
+
+def parse_integer(token: str) -> int:
+    """Parse a decimal or hexadecimal (`0x`) integer."""
+    if token.lstrip("+-")[:2] in {"0x", "0X"}:
+        return int(token, 16)
+
+    return int(token)
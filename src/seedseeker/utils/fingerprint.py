@@ -0,0 +1,103 @@
+import struct
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+FINGERPRINT_SIZE = 16
+
+# number of states whose encodings are kept, a Mersenne Twister state takes a
+# few kilobytes
+ENCODING_CACHE_SIZE = 64
+
+
+def pack_words(tag: bytes, words: Sequence[int], word_format: str) -> bytes:
+    """
+    Pack fixed-width words into bytes, prefixed with a generator tag.
+
+    `word_format` is a single `struct` format character (e.g. `I` for uint32).
+    """
+    return tag + b"\0" + struct.pack(f"<{len(words)}{word_format}", *words)
+
+
+def pack_ints(tag: bytes, values: Sequence[int]) -> bytes:
+    """
+    Pack arbitrary sized integers into bytes, prefixed with a generator tag.
+
+    Every integer is stored as its length followed by its two's complement
+    little-endian encoding, so the result is unambiguous.
+    """
+    output = [tag, b"\0"]
+
+    for value in values:
+        encoded = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+        output.extend((len(encoded).to_bytes(4, "little"), encoded))
+
+    return b"".join(output)
+
+
+def digest(canonical: bytes) -> str:
+    """Return a short stable hash of a canonical state encoding."""
+    from hashlib import blake2b  # noqa: PLC0415
+
+    return blake2b(canonical, digest_size=FINGERPRINT_SIZE).hexdigest()
+
+
+def frozen(value: Any) -> Any:
+    """Return a hashable copy of a state field, lists of lists become tuples."""
+    if not isinstance(value, list):
+        return value
+    if value and isinstance(value[0], list):
+        return tuple(map(tuple, value))
+    return tuple(value)
+
+
+class Encodings:
+    """
+    Canonical encodings and fingerprints of the states encoded last.
+
+    States are tuples and can not keep their encoding, so it is looked up by
+    a frozen snapshot of their fields. Snapshots are cheap to compare next to
+    encoding, and a state changed in place is encoded again rather than
+    given a stale encoding.
+    """
+
+    size: int
+    entries: OrderedDict[tuple[Any, ...], tuple[bytes, str | None]]
+
+    def __init__(self, size: int = ENCODING_CACHE_SIZE) -> None:
+        """Keep the encodings of the last `size` states."""
+        self.size = size
+        self.entries = OrderedDict()
+
+    def canonical(self, state: tuple[Any, ...], encode: Callable[[], bytes]) -> bytes:
+        """Return the canonical encoding of `state`, made by `encode` if new."""
+        return self.entry(state, encode)[1][0]
+
+    def fingerprint(self, state: tuple[Any, ...], encode: Callable[[], bytes]) -> str:
+        """Return the fingerprint of `state`, see `canonical`."""
+        key, (canonical, fingerprint) = self.entry(state, encode)
+
+        if fingerprint is None:
+            fingerprint = digest(canonical)
+            self.entries[key] = (canonical, fingerprint)
+
+        return fingerprint
+
+    def entry(
+        self, state: tuple[Any, ...], encode: Callable[[], bytes]
+    ) -> tuple[tuple[Any, ...], tuple[bytes, str | None]]:
+        """Return the snapshot of `state` and its cached encodings."""
+        key = (type(state), *map(frozen, state))
+
+        if (entry := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+            return key, entry
+
+        entry = self.entries[key] = (encode(), None)
+        if len(self.entries) > self.size:
+            _ = self.entries.popitem(last=False)
+
+        return key, entry
+
+
+ENCODINGS = Encodings()
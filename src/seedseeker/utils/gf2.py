@@ -0,0 +1,134 @@
+from collections.abc import Iterable
+
+# Matrices over GF(2) are lists of rows, and rows and vectors are integers
+# whose bit i is the entry of column i.
+type Matrix = list[int]
+
+
+def bits(row: int) -> Iterable[int]:
+    """Yield the indices of the set bits of a row."""
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
+def multiply(a: Matrix, b: Matrix) -> Matrix:
+    """Return the product of two matrices."""
+    products = []
+
+    for row in a:
+        product = 0
+        for column in bits(row):
+            product ^= b[column]
+        products.append(product)
+
+    return products
+
+
+def apply(matrix: Matrix, vector: int) -> int:
+    """Return the product of a matrix and a column vector."""
+    return sum(((row & vector).bit_count() & 1) << i for i, row in enumerate(matrix))
+
+
+class Transition:
+    """
+    Powers of a linear map over GF(2).
+
+    The repeated squares of the map are computed on first use and kept, so
+    jumping k steps costs one product per set bit of k. Powers that are used
+    many times, e.g. the distance between evenly spaced samples, can be
+    computed once with `power`.
+    """
+
+    # the map raised to 1, 2, 4, 8, ...
+    squares: list[Matrix]
+    powers: dict[int, Matrix]
+
+    def __init__(self, matrix: Matrix) -> None:
+        """Take powers of `matrix`."""
+        self.squares = [matrix]
+        self.powers = {1: matrix}
+
+    def square(self, exponent: int) -> Matrix:
+        """Return the map raised to 2 to the power of `exponent`."""
+        while len(self.squares) <= exponent:
+            last = self.squares[-1]
+            self.squares.append(multiply(last, last))
+
+        return self.squares[exponent]
+
+    def power(self, k: int) -> Matrix:
+        """Return the map applied k times, keeping it for later jumps."""
+        if k not in self.powers:
+            self.powers[k] = self.after(self.identity(), k)
+
+        return self.powers[k]
+
+    def identity(self) -> Matrix:
+        """Return the identity matrix of the size of the map."""
+        return [1 << i for i in range(len(self.squares[0]))]
+
+    def after(self, rows: Matrix, k: int) -> Matrix:
+        """Return rows of linear forms on the state k steps later, as forms now."""
+        assert k >= 0, "Can only step forward"
+
+        for exponent in bits(k):
+            rows = multiply(rows, self.square(exponent))
+
+        return rows
+
+    def jump(self, vector: int, k: int) -> int:
+        """Return the state k steps after `vector`."""
+        assert k >= 0, "Can only step forward"
+
+        if k in self.powers:
+            return apply(self.powers[k], vector)
+
+        for exponent in bits(k):
+            vector = apply(self.square(exponent), vector)
+
+        return vector
+
+
+def reduce(pivots: dict[int, tuple[int, int]], row: int, value: int) -> tuple[int, int]:
+    """Eliminate the pivots from an equation until its highest bit is new."""
+    while row and (pivot := row.bit_length() - 1) in pivots:
+        reducer, reduced = pivots[pivot]
+        row, value = row ^ reducer, value ^ reduced
+
+    return row, value
+
+
+def solve(equations: Iterable[tuple[int, int]], size: int) -> int | None:
+    """
+    Solve a linear system of `size` unknowns.
+
+    Every equation is a row and the bit it equals. Return the solution once
+    the equations determine it, or None if they are inconsistent or do not
+    determine it.
+    """
+    # reduced rows by their highest bit
+    pivots: dict[int, tuple[int, int]] = {}
+
+    for equation in equations:
+        row, value = reduce(pivots, *equation)
+
+        if row:
+            pivots[row.bit_length() - 1] = (row, value)
+        elif value:
+            return None
+
+        if len(pivots) == size:
+            break
+    else:
+        return None
+
+    solution = 0
+    # every row only has lower bits besides its pivot
+    for pivot in sorted(pivots):
+        row, value = pivots[pivot]
+        bit = value ^ (((row ^ (1 << pivot)) & solution).bit_count() & 1)
+        solution |= bit << pivot
+
+    return solution
@@ -1,9 +1,11 @@
 from collections import deque
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Sequence
 from contextlib import suppress
-from typing import override
+from itertools import batched, chain
+from typing import Any, override
 
 from seedseeker.defs import IntegerRNG
+from seedseeker.utils.optional import numpy
 
 
 class CountingIterator[T](Iterator[T]):
@@ -22,8 +24,9 @@ class CountingIterator[T](Iterator[T]):
     @override
     def __next__(self):
         """Return the next value and increment the count."""
+        value = next(self.iterator)
         self.count += 1
-        return next(self.iterator)
+        return value
 
     def __len__(self):
         """Return the number of values yielded."""
@@ -65,6 +68,28 @@ class BufferingIterator[T](Iterator[T]):
         return value
 
 
+# number of values converted at once by `integers`
+BLOCK_SIZE = 1024
+
+
+def integers(values: Iterable[int]) -> Iterator[int]:
+    """
+    Iterate over values as Python integers.
+
+    Arrays with a `tolist` method (NumPy arrays, memoryviews and `array`s) are
+    converted block by block instead of yielding their own scalar types.
+    """
+    if isinstance(values, Iterator) or not hasattr(values, "tolist"):
+        return iter(values)
+
+    view: Any = values
+    blocks = (
+        view[start : start + BLOCK_SIZE].tolist()
+        for start in range(0, len(view), BLOCK_SIZE)
+    )
+    return chain.from_iterable(blocks)
+
+
 def drop[T](iterator: Iterator[T], n: int) -> Iterator[T]:
     """
     Drop the first n values from the iterator.
@@ -79,10 +104,51 @@ def drop[T](iterator: Iterator[T], n: int) -> Iterator[T]:
     return iterator
 
 
-def synchronize[T, U](sequence: Iterator[T], rng: IntegerRNG[U]) -> U | None:
+def blocks(values: Iterable[int], size: int = BLOCK_SIZE) -> Iterator[Sequence[int]]:
+    """
+    Split values into blocks of at most `size` values.
+
+    Lists and arrays are sliced, other iterables are read value by value.
+    """
+    if isinstance(values, Iterator) or not hasattr(values, "__getitem__"):
+        return batched(integers(values), size)
+
+    view: Any = values
+    return (view[start : start + size] for start in range(0, len(view), size))
+
+
+def first_mismatch(values: Sequence[int], predicted: Sequence[int]) -> int | None:
+    """
+    Return the index of the first value that differs from the prediction.
+
+    Both have the same length. Predictions computed as a NumPy array are
+    compared with a single vectorized comparison.
+    """
+    np = numpy()
+
+    if np is not None and isinstance(predicted, np.ndarray):
+        try:
+            observed = np.asarray(values, dtype=predicted.dtype)
+        except OverflowError:
+            # a value out of the range of the predictions, compare one by one
+            predicted = predicted.tolist()
+        else:
+            mismatches = np.flatnonzero(observed != predicted)
+            return int(mismatches[0]) if len(mismatches) else None
+
+    view: Any = values
+    observed = view.tolist() if hasattr(view, "tolist") else list(view)
+    if observed == list(predicted):
+        return None
+
+    pairs = enumerate(zip(observed, predicted, strict=True))
+    return next(i for i, (a, b) in pairs if a != b)
+
+
+def synchronize[U](sequence: Iterable[int], rng: IntegerRNG[U]) -> U | None:
     """Iterate the RNG until the end of the source sequence, checking if they match."""
-    for value, reversed_value in zip(sequence, rng, strict=False):
-        if value != reversed_value:
+    for block in blocks(sequence):
+        if first_mismatch(block, rng.next_block(len(block))) is not None:
             return None
 
     return rng.state()
@@ -0,0 +1,26 @@
+from typing import BinaryIO
+
+# magic bytes of the supported compression formats
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\xfd7zXZ\x00": "xz",
+    b"BZh": "bz2",
+}
+
+
+def detect(raw: BinaryIO) -> str | None:
+    """
+    Return the compression format of a stream, without consuming it.
+
+    Streams that can not be peeked into are assumed to be uncompressed.
+    """
+    if (peek := getattr(raw, "peek", None)) is None:
+        return None
+
+    head = peek(max(map(len, MAGIC)))
+
+    for magic, name in MAGIC.items():
+        if head.startswith(magic):
+            return name
+
+    return None
@@ -0,0 +1,13 @@
+from functools import cache
+from types import ModuleType
+
+
+@cache
+def numpy() -> ModuleType | None:
+    """Return the numpy module if it is installed, otherwise None."""
+    try:
+        import numpy  # noqa: PLC0415
+    except ImportError:
+        return None
+
+    return numpy
@@ -1,21 +1,27 @@
 from collections.abc import Iterator
+from functools import cache
+
+# primes below this bound are tried as factors by `divisors`
+PRIME_BOUND = 2**16
 
 
 def primes_up_to(n: int) -> Iterator[int]:
     """Generate primes up to n."""
-    # Seive of Eratosthenes
-    primes = [True] * (n + 1)
-    primes[0] = False
-    primes[1] = False
+    # Sieve of Eratosthenes over a bitmap of one byte per number
+    sieve = bytearray([1]) * (n + 1)
+    sieve[:2] = bytes(len(sieve[:2]))
+
+    for i in range(2, int(n**0.5) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, n + 1, i)))
 
-    for i in range(2, n + 1):
-        if primes[i]:
-            yield i
-            for j in range(i * 2, n + 1, i):
-                primes[j] = False
+    return (i for i, is_prime in enumerate(sieve) if is_prime)
 
 
-PRIMES = list(primes_up_to(2**16))
+@cache
+def primes() -> tuple[int, ...]:
+    """Return the primes below `PRIME_BOUND`, computed on first use."""
+    return tuple(primes_up_to(PRIME_BOUND))
 
 
 def divisors(n: int) -> Iterator[int]:
@@ -25,7 +31,60 @@ def divisors(n: int) -> Iterator[int]:
     Includes the number itself, but not 1.
     """
     yield n
-    for prime in PRIMES:
+    for prime in primes():
         res, rem = divmod(n, prime)
         if rem == 0:
             yield res
+
+
+# bases that make the Miller-Rabin test exact below 3.3 ⋅ 10²⁴
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n: int) -> bool:
+    """Return whether n is prime, exactly below 3.3 ⋅ 10²⁴ and almost surely above."""
+    if n < 2:
+        return False
+
+    for prime in WITNESSES:
+        if n % prime == 0:
+            return n == prime
+
+    odd, twos = n - 1, 0
+    while odd % 2 == 0:
+        odd, twos = odd // 2, twos + 1
+
+    for witness in WITNESSES:
+        x = pow(witness, odd, n)
+        if x in {1, n - 1}:
+            continue
+        for _ in range(twos - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def factorize(n: int) -> dict[int, int] | None:
+    """
+    Return the prime factors of n with their exponents.
+
+    Factors above `PRIME_BOUND` are only found if at most one is left after
+    dividing out the small ones, otherwise return None.
+    """
+    factors: dict[int, int] = {}
+
+    for prime in primes():
+        while n % prime == 0:
+            n //= prime
+            factors[prime] = factors.get(prime, 0) + 1
+
+    if n > 1:
+        if not is_prime(n):
+            return None
+        factors[n] = 1
+
+    return factors
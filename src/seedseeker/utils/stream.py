@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from itertools import chain, count, islice
+from typing import override
+
+CHUNK_SIZE = 1024
+
+
+class SharedStream:
+    """
+    Lazily filled chunked buffer shared by several readers.
+
+    The source is read one chunk at a time, only when some reader asks for a
+    chunk that was not read yet. Every reader is registered and has its own
+    position; chunks that all readers are past are dropped, so memory usage
+    depends on how far apart the readers are, not on the length of the input.
+    """
+
+    source: Iterator[int]
+    chunk_size: int
+    chunks: dict[int, list[int]]
+    filled: int
+    exhausted: bool
+    positions: dict[int, int]
+    ids: Iterator[int]
+
+    def __init__(self, source: Iterator[int], chunk_size: int = CHUNK_SIZE) -> None:
+        """Create a shared stream reading from `source`."""
+        assert chunk_size > 0, "Chunk size must be positive"
+
+        self.source = source
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.filled = 0
+        self.exhausted = False
+        self.positions = {}
+        self.ids = count()
+
+    def register(self) -> int:
+        """Register a new reader starting at the beginning of the stream."""
+        assert self.filled == 0 or 0 in self.chunks, (
+            "Beginning of the stream was already dropped"
+        )
+
+        reader = next(self.ids)
+        self.positions[reader] = 0
+        return reader
+
+    def unregister(self, reader: int) -> None:
+        """Remove a reader, allowing chunks it did not read to be dropped."""
+        del self.positions[reader]
+        self.release()
+
+    def skip(self, reader: int, index: int) -> None:
+        """Move `reader` forward to chunk `index`, dropping what it did not read."""
+        self.positions[reader] = max(self.positions[reader], index)
+        self.release()
+
+    def lowest(self) -> int:
+        """Return the index of the oldest chunk some reader still needs."""
+        return min(self.positions.values(), default=self.filled)
+
+    def release(self) -> None:
+        """Drop chunks no reader needs anymore."""
+        lowest = self.lowest()
+        for index in [i for i in self.chunks if i < lowest]:
+            del self.chunks[index]
+
+    def chunk(self, reader: int, index: int) -> list[int] | None:
+        """
+        Return chunk `index` for `reader`, or None at the end of the stream.
+
+        The reader is considered done with all chunks before `index`.
+        """
+        assert index >= self.positions[reader], "Chunk was already released"
+
+        self.positions[reader] = index
+        self.release()
+        self.fill(index)
+
+        return self.chunks.get(index)
+
+    def fill(self, index: int) -> None:
+        """Read the source until chunk `index` is available or it runs out."""
+        while self.filled <= index and not self.exhausted:
+            values = list(islice(self.source, self.chunk_size))
+            self.exhausted = len(values) < self.chunk_size
+
+            if values:
+                self.chunks[self.filled] = values
+                self.filled += 1
+
+    def peek(self, count: int) -> list[int]:
+        """Return up to `count` values from the beginning, without a reader."""
+        assert self.filled == 0 or 0 in self.chunks, (
+            "Beginning of the stream was already dropped"
+        )
+
+        self.fill((count - 1) // self.chunk_size)
+        values = chain.from_iterable(self.chunks[i] for i in range(self.filled))
+        return list(islice(values, count))
+
+    def cursor(self) -> StreamCursor:
+        """Return a new independent iterator over the stream."""
+        return StreamCursor(self)
+
+
+class StreamCursor(Iterator[int]):
+    """Iterator over a `SharedStream` with its own position."""
+
+    stream: SharedStream
+    reader: int
+    index: int
+    values: list[int]
+    offset: int
+
+    def __init__(self, stream: SharedStream) -> None:
+        """Register a new reader of the stream."""
+        self.stream = stream
+        self.reader = stream.register()
+        self.index = -1
+        self.values = []
+        self.offset = 0
+
+    @override
+    def __iter__(self) -> Iterator[int]:
+        """Return the iterator."""
+        return self
+
+    @override
+    def __next__(self) -> int:
+        """Return the next value."""
+        if self.offset >= len(self.values):
+            if (values := self.stream.chunk(self.reader, self.index + 1)) is None:
+                raise StopIteration
+
+            self.index += 1
+            self.values = values
+            self.offset = 0
+
+        self.offset += 1
+        return self.values[self.offset - 1]
+
+    def close(self) -> None:
+        """Stop reading, so that the stream can drop unread chunks."""
+        if self.reader in self.stream.positions:
+            self.stream.unregister(self.reader)
@@ -0,0 +1,76 @@
+from collections.abc import Iterable, Iterator
+
+
+class Meter:
+    """Measures the throughput of a single processing stage."""
+
+    name: str
+    unit: str
+    amount: int
+    elapsed: float
+    # CPU time of the thread running the stage, if measured
+    cpu: float
+
+    def __init__(self, name: str, unit: str) -> None:
+        """Create a meter for stage `name` processing `unit`s."""
+        self.name = name
+        self.unit = unit
+        self.amount = 0
+        self.elapsed = 0.0
+        self.cpu = 0.0
+
+    def add(self, amount: int, elapsed: float, cpu: float = 0.0) -> None:
+        """Record `amount` units processed in `elapsed` seconds, `cpu` on the CPU."""
+        self.amount += amount
+        self.elapsed += elapsed
+        self.cpu += cpu
+
+    def counted[T](self, values: Iterable[T]) -> Iterator[T]:
+        """Iterate over `values`, adding each of them to the amount."""
+        for value in values:
+            self.amount += 1
+            yield value
+
+    def rate(self) -> float:
+        """Return the number of units processed per second."""
+        return self.amount / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Return a human readable summary."""
+        return (
+            f"{self.name}: {self.amount:,} {self.unit} in {self.elapsed:.2f} s "
+            f"({self.rate():,.0f} {self.unit}/s)"
+        )
+
+
+class Latency:
+    """Measures how long values wait between arriving and being processed."""
+
+    name: str
+    count: int
+    total: float
+    worst: float
+
+    def __init__(self, name: str) -> None:
+        """Create a latency measurement for stage `name`."""
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, latency: float) -> None:
+        """Record a single latency in seconds."""
+        self.count += 1
+        self.total += latency
+        self.worst = max(self.worst, latency)
+
+    def mean(self) -> float:
+        """Return the average latency in seconds."""
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Return a human readable summary."""
+        return (
+            f"{self.name}: {self.mean() * 1000:.2f} ms mean, "
+            f"{self.worst * 1000:.2f} ms worst over {self.count:,} blocks"
+        )
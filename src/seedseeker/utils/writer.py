@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable
+from itertools import batched
+from typing import TextIO
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils.binary import FORMATS
+from seedseeker.utils.optional import numpy
+
+# number of values formatted and written at once
+BLOCK_SIZE = 2**16
+
+# layout of the values stored in .npy output
+NPY_FORMAT = "u64le"
+
+
+class ValueWriter:
+    """
+    Writes sequences of integers in blocks, as text or fixed-width binary.
+
+    Text sequences are written one per line with their values joined by a
+    separator. Binary layouts (see `BINARY_FORMATS`) concatenate all values,
+    `npy` output starts with a header describing the shape of all of them.
+    Only one block of values is held in memory at a time.
+    """
+
+    out: TextIO
+    layout: str
+    block_size: int
+
+    def __init__(
+        self, out: TextIO, layout: str = "text", block_size: int = BLOCK_SIZE
+    ) -> None:
+        """Write to `out`, binary layouts are written to its underlying buffer."""
+        assert layout in {"text", "npy"} or layout in FORMATS, (
+            f"Unknown output format {layout}"
+        )
+        assert block_size > 0, "Block size must be positive"
+
+        self.out = out
+        self.layout = layout
+        self.block_size = block_size
+
+    def begin(self, shape: tuple[int, ...]) -> None:
+        """Start the output of values of the given total shape."""
+        if self.layout != "npy":
+            return
+
+        np = numpy()
+        if np is None:
+            raise InvalidFormatError("Writing .npy output requires NumPy")
+
+        header = {
+            "descr": FORMATS[NPY_FORMAT].dtype,
+            "fortran_order": False,
+            "shape": shape,
+        }
+        self.out.flush()
+        np.lib.format.write_array_header_1_0(self.out.buffer, header)
+
+    def write(self, values: Iterable[int], separator: str = "\n") -> None:
+        """Write a single sequence of values."""
+        if self.layout == "text":
+            self.write_text(values, separator)
+        else:
+            self.write_binary(values)
+
+    def write_text(self, values: Iterable[int], separator: str) -> None:
+        """Write values joined by `separator`, followed by a newline."""
+        for index, block in enumerate(batched(values, self.block_size)):
+            if index > 0:
+                _ = self.out.write(separator)
+            _ = self.out.write(separator.join(map(str, block)))
+
+        _ = self.out.write("\n")
+
+    def write_binary(self, values: Iterable[int]) -> None:
+        """Write values as fixed-width integers."""
+        layout = NPY_FORMAT if self.layout == "npy" else self.layout
+        self.out.flush()
+
+        for block in batched(values, self.block_size):
+            try:
+                _ = self.out.buffer.write(encode(block, layout))
+            except OverflowError as e:
+                raise InvalidFormatError(f"Values do not fit in {layout}") from e
+
+    def end(self) -> None:
+        """Finish the output."""
+        self.out.flush()
+
+
+def encode(values: tuple[int, ...], layout: str) -> bytes:
+    """Encode values as fixed-width integers in the given layout."""
+    binary_format = FORMATS[layout]
+    np = numpy()
+
+    if np is not None:
+        dtype = np.dtype(binary_format.dtype)
+        return np.fromiter(values, dtype, len(values)).tobytes()
+
+    encoded = array(binary_format.typecode, values)
+    if binary_format.byteorder != sys.byteorder:
+        encoded.byteswap()
+
+    return encoded.tobytes()
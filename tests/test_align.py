@@ -0,0 +1,111 @@
+from itertools import islice
+
+import pytest
+
+from seedseeker.align import MAX_GAP, Anomaly, RollingHash, align
+from seedseeker.generators import (
+    Lcg,
+    LcgReverser,
+    MersenneReverser,
+    MersenneTwister,
+    XoshiroReverser,
+)
+
+
+def lcg() -> Lcg:
+    """Return the generator the tests capture."""
+    return Lcg(2**32, 1664525, 1013904223, 1)
+
+
+def after(count: int) -> object:
+    """Return the state after the first values of the generator."""
+    prng = lcg()
+    _ = list(islice(prng, count))
+    return prng.state()
+
+
+VALUES = list(islice(lcg(), 1000))
+
+
+@pytest.mark.parametrize(
+    ("observed", "expected"),
+    [
+        (VALUES, []),
+        (
+            [*VALUES[:100], *VALUES[101:]],
+            [Anomaly("dropped", 100, VALUES[100], None)],
+        ),
+        (
+            [*VALUES[:100], 5, 6, *VALUES[100:]],
+            [Anomaly("inserted", 100, None, 5), Anomaly("inserted", 101, None, 6)],
+        ),
+        (
+            [*VALUES[:100], 5, *VALUES[101:]],
+            [Anomaly("corrupted", 100, VALUES[100], 5)],
+        ),
+        (
+            [*VALUES[:998], 5, 6],
+            [
+                Anomaly("corrupted", 998, VALUES[998], 5),
+                Anomaly("corrupted", 999, VALUES[999], 6),
+            ],
+        ),
+    ],
+)
+def test_anomalies(observed: list[int], expected: list[Anomaly]) -> None:
+    """Test that every kind of anomaly is found and positioned."""
+    alignment = align(observed, lcg(), 2)
+
+    assert alignment is not None
+    assert alignment.anomalies == expected
+    assert Lcg.is_state_equal(alignment.state, after(1000))
+    assert alignment.score == pytest.approx(
+        (len(observed) - len(expected)) / len(observed), abs=1 / len(observed)
+    )
+
+
+def test_too_many() -> None:
+    """Test that anomalies beyond the tolerance or a long gap reject the state."""
+    observed = [*VALUES[:100], 5, *VALUES[101:500], 6, *VALUES[501:]]
+    assert align(observed, lcg(), 1) is None
+    assert align(observed, lcg(), 2) is not None
+
+    assert align([*VALUES[:100], *VALUES[100 + MAX_GAP :]], lcg(), 100) is not None
+    assert align([*VALUES[:100], *VALUES[101 + MAX_GAP :]], lcg(), 100) is None
+
+
+def test_rolling_hash() -> None:
+    """Test that the rolling hash only depends on the last values."""
+    first, second = RollingHash(), RollingHash()
+    hashes = [first.push(value) for value in [9, 1, 2, 3, 4]]
+
+    assert hashes[:3] == [None, None, None]
+    assert [second.push(value) for value in [1, 2, 3, 4]][-1] == hashes[-1]
+
+
+@pytest.mark.parametrize(
+    ("reverser_class", "prng"),
+    [
+        (LcgReverser, lcg()),
+        (MersenneReverser, MersenneTwister(42)),
+    ],
+)
+def test_reverser(reverser_class: type, prng: object) -> None:
+    """Test that a solving reverser tolerates anomalies after it solved."""
+    values = list(islice(prng, 2000))
+    observed = [*values[:1500], *values[1501:]]
+
+    assert reverser_class().run(observed) is None
+    alignment = reverser_class(tolerance=1).run(observed)
+
+    assert alignment is not None
+    assert alignment.anomalies == [Anomaly("dropped", 1500, values[1500], None)]
+    assert type(prng).is_state_equal(alignment.state, prng.state())
+    assert str(alignment) == str(alignment.state)
+
+
+def test_exact() -> None:
+    """Test that without tolerance the state itself is returned."""
+    values = list(islice(lcg(), 100))
+    assert XoshiroReverser(tolerance=0).run(values) is None
+    assert LcgReverser().run(values) == after(100)
@@ -0,0 +1,124 @@
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+from seedseeker.batch import Capture, Options, batch, captures
+from seedseeker.generators import Lcg, Xoshiro, reverse_lcg, reverse_xoshiro
+
+REVERSERS = {"lcg": reverse_lcg, "xoshiro": reverse_xoshiro}
+OPTIONS = Options(REVERSERS, explicit=False, limit=1024, layout="text", first=False)
+
+LCG = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 100))
+XOSHIRO = list(islice(Xoshiro((1, 2, 3, 4)), 100))
+
+
+def test_manifest(tmp_path: Path) -> None:
+    """Test reversing inline and file captures listed in a manifest."""
+    _ = (tmp_path / "xoshiro.txt").write_text("\n".join(map(str, XOSHIRO)))
+    manifest = tmp_path / "manifest.jsonl"
+    entries = [
+        {"id": "inline", "values": LCG},
+        {"id": "file", "path": "xoshiro.txt"},
+        {"id": "missing", "path": "missing.txt"},
+        {"id": "random", "values": [4, 8, 15, 16, 23, 42]},
+    ]
+    _ = manifest.write_text("\n".join(map(json.dumps, entries)) + "\n\n")
+
+    results = {r.id: r for r in batch(captures(str(manifest)), OPTIONS, jobs=2)}
+
+    assert results["inline"].generator == "lcg"
+    assert results["inline"].state == str(reverse_lcg(iter(LCG)))
+    assert results["file"].generator == "xoshiro"
+    assert results["missing"].error is not None
+    assert results["random"].generator is None
+    assert results["random"].error is None
+    assert json.loads(results["file"].to_json())["id"] == "file"
+
+
+def test_directory(tmp_path: Path) -> None:
+    """Test that every file in a directory is a capture."""
+    _ = (tmp_path / "a").write_text("\n".join(map(str, LCG)))
+    _ = (tmp_path / "b").write_text("\n".join(map(str, XOSHIRO)))
+
+    assert sorted(c.id for c in captures(str(tmp_path))) == ["a", "b"]
+    results = batch(captures(str(tmp_path)), OPTIONS, jobs=1)
+    assert sorted((r.id, r.generator) for r in results) == [
+        ("a", "lcg"),
+        ("b", "xoshiro"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "not json",
+        '{"values": [1]}',
+        '{"id": 1}',
+        '{"id": 1, "values": ["a"]}',
+        '{"id": 1, "values": 5}',
+    ],
+)
+def test_invalid_manifest(line: str, tmp_path: Path) -> None:
+    """Test that invalid manifest entries are reported and do not stop the batch."""
+    manifest = tmp_path / "manifest.jsonl"
+    _ = manifest.write_text(
+        f'{{"id": 0, "values": [1]}}\n{line}\n{{"id": 2, "values": [1]}}\n'
+    )
+
+    results = list(batch(captures(str(manifest)), OPTIONS, jobs=1))
+
+    assert sorted(r.id for r in results) == ["", "0", "2"]
+    errors = [r.error for r in results if r.id == ""]
+    assert len(errors) == 1
+    assert errors[0] is not None
+    assert "line 2" in errors[0]
+
+
+def test_failing_reverser() -> None:
+    """Test that a reverser raising an exception is reported as an error."""
+    options = OPTIONS._replace(explicit=True)
+    results = list(batch(iter([Capture("zeros", [0] * 100, None)]), options, jobs=1))
+
+    failed = [r for r in results if r.error is not None]
+    assert [r.generator for r in failed] == ["xoshiro"]
+    assert "zero" in str(failed[0].error)
+    assert results[-1] == ("zeros", None, None, results[-1].elapsed, None)
+
+
+def test_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only a few captures are read ahead of the workers."""
+    monkeypatch.setattr("seedseeker.batch.QUEUE_DEPTH", 2)
+    read = 0
+
+    def source() -> Iterator[Capture]:
+        nonlocal read
+        for i in range(1000):
+            read += 1
+            yield Capture(str(i), LCG, None)
+
+    results = batch(source(), OPTIONS, jobs=1)
+    assert next(results).generator == "lcg"
+    assert read <= 3
+    results.close()
+
+
+def test_cli_timeout(tmp_path: Path) -> None:
+    """Test that a timeout is rejected rather than ignored in batch mode."""
+    command = [
+        *(sys.executable, "-m", "seedseeker", "-b", str(tmp_path)),
+        *("--timeout", "1"),
+    ]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    process = subprocess.run(  # noqa: S603
+        command, check=False, capture_output=True, text=True, env=env
+    )
+
+    assert process.returncode == 1
+    assert "--timeout" in process.stderr
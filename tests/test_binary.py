@@ -0,0 +1,104 @@
+import io
+import sys
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.generators import Xoshiro, reverse_mersenne, reverse_xoshiro
+from seedseeker.generators.mersenne import MersenneTwister
+from seedseeker.utils import binary
+from seedseeker.utils.binary import BinaryStream
+
+np = pytest.importorskip("numpy")
+
+VALUES = list(islice(Xoshiro((1, 2, 3, 4)), 3000))
+
+
+@pytest.mark.parametrize("layout", ["u32le", "u32be", "u64le", "u64be"])
+@pytest.mark.parametrize("vectorized", [True, False])
+@pytest.mark.parametrize("from_stdin", [True, False])
+def test_binary_stream(
+    layout: str,
+    vectorized: bool,
+    from_stdin: bool,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test reading raw integers from a file or stdin."""
+    dtype = binary.FORMATS[layout].dtype
+    values = [v % 2**32 for v in VALUES] if dtype.endswith("4") else VALUES
+    data = np.array(values, dtype=dtype).tobytes()
+
+    if not vectorized:
+        monkeypatch.setattr(binary, "numpy", lambda: None)
+
+    path = tmp_path / "input.bin"
+    _ = path.write_bytes(data)
+
+    if from_stdin:
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    with BinaryStream(None if from_stdin else str(path), layout, 100) as stream:
+        assert list(stream) == values
+
+
+@pytest.mark.parametrize("from_stdin", [True, False])
+def test_npy_stream(
+    from_stdin: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reading a NumPy array from a file or stdin."""
+    path = tmp_path / "input.npy"
+    np.save(path, np.array(VALUES, dtype=np.uint64))
+
+    if from_stdin:
+        data = io.BytesIO(path.read_bytes())
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(data))
+
+    with BinaryStream(None if from_stdin else str(path), "npy") as stream:
+        assert list(stream) == VALUES
+
+
+@pytest.mark.parametrize("layout", ["u32le", "u32be", "u64le", "u64be", "npy"])
+def test_mapped_dtype(layout: str, tmp_path: Path) -> None:
+    """Test that a memory-mapped file is read as the values of its layout."""
+    dtype = ">u4" if layout == "npy" else binary.FORMATS[layout].dtype
+    values = [v % 2**32 for v in VALUES] if dtype.endswith("4") else VALUES
+    path = tmp_path / "input.bin"
+    if layout == "npy":
+        np.save(path, np.array(values, dtype=dtype))
+        path = tmp_path / "input.bin.npy"
+    else:
+        _ = path.write_bytes(np.array(values, dtype=dtype).tobytes())
+
+    with BinaryStream(str(path), layout, 100) as stream:
+        blocks = list(stream.blocks())
+
+    assert all(isinstance(block, np.memmap) for block in blocks)
+    assert {block.dtype for block in blocks} == {np.dtype(dtype)}
+    assert [len(block) for block in blocks] == [100] * 30
+    assert np.concatenate(blocks).tolist() == values
+
+
+def test_binary_stream_truncated(tmp_path: Path) -> None:
+    """Test that a partial value at the end is reported."""
+    path = tmp_path / "input.bin"
+    _ = path.write_bytes(b"\0" * 10)
+
+    with (
+        pytest.raises(InvalidFormatError),
+        BinaryStream(str(path), "u64le") as stream,
+    ):
+        _ = list(stream)
+
+
+def test_reversers_accept_arrays() -> None:
+    """Test that reversers accept NumPy views directly."""
+    xoshiro = np.array(VALUES, dtype=np.uint64)
+    assert reverse_xoshiro(xoshiro) == reverse_xoshiro(iter(VALUES))
+
+    mersenne = np.array(list(islice(MersenneTwister(1), 1000)), dtype=">u4")
+    found = reverse_mersenne(mersenne)
+    assert found is not None
+    assert found == reverse_mersenne(memoryview(mersenne.astype(np.uint32)))
@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import time
+from functools import partial
+from itertools import batched, islice
+from pathlib import Path
+
+import pytest
+
+from seedseeker.cache import (
+    CachedReverser,
+    CacheEntry,
+    ResultCache,
+    ValuesDigest,
+    verify_cached,
+)
+from seedseeker.generators import Lcg, LcgReverser, reverse_lcg, reverse_xoshiro
+
+LCG = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 200))
+
+
+def cached_entry(values: list[int]) -> CacheEntry:
+    """Return the entry the CLI would store after reversing `values`."""
+    state = reverse_lcg(iter(values))
+    digest = ValuesDigest(values)
+    return CacheEntry(
+        None if state is None else str(state), digest.count, digest.hexdigest()
+    )
+
+
+def test_digest() -> None:
+    """Test that hashing in one go and while iterating agree."""
+    digest = ValuesDigest()
+    assert list(digest.digested(iter(LCG))) == LCG
+    assert digest.count == len(LCG)
+    assert digest.hexdigest() == ValuesDigest(LCG).hexdigest()
+    assert digest.hexdigest() != ValuesDigest(LCG[:-1]).hexdigest()
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test storing and loading entries."""
+    cache = ResultCache(str(tmp_path / "cache"), version="1.0")
+    key = cache.key("lcg", reverse_lcg, LCG)
+    entry = cached_entry(LCG[:100])
+
+    assert cache.get(key) is None
+    cache.put(key, entry)
+    assert cache.get(key) == entry
+
+    assert cache.key("lcg", reverse_lcg, [*LCG[:64], 0]) == key
+    assert cache.key("lcg", reverse_lcg, [0, *LCG]) != key
+    assert cache.key("xoshiro", reverse_xoshiro, LCG) != key
+    other_version = ResultCache(str(tmp_path / "cache"), version="2.0")
+    assert other_version.key("lcg", reverse_lcg, LCG) != key
+
+
+@pytest.mark.parametrize(
+    ("cached", "values"),
+    [
+        (100, LCG[:100]),  # the same input
+        (100, LCG),  # a longer input
+        (100, LCG[:50]),  # a shorter input
+        (100, [*LCG[:100], 1, 2, 3]),  # a continuation that does not match
+        (100, [*LCG[:10], 1, *LCG[11:]]),  # a beginning that does not match
+    ],
+)
+@pytest.mark.parametrize("head_size", [1000, 8])
+def test_verify(
+    cached: int, values: list[int], head_size: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that cached results agree with reversing from scratch."""
+    monkeypatch.setattr("seedseeker.cache.HEAD_SIZE", head_size)
+    entry = cached_entry(LCG[:cached])
+    state = verify_cached(entry, reverse_lcg, Lcg, iter(values))
+    expected = reverse_lcg(iter(values))
+
+    assert (state is None) == (expected is None)
+    if expected is not None:
+        assert Lcg.is_state_equal(state, expected)
+
+
+def test_verify_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only a bounded beginning of the input is kept."""
+    monkeypatch.setattr("seedseeker.cache.HEAD_SIZE", 8)
+    reverser = CachedReverser(cached_entry(LCG[:100]), reverse_lcg, Lcg)
+
+    for chunk in batched(LCG, 5):
+        _ = reverser.feed(chunk)
+        assert len(reverser.head) <= 8
+
+    assert Lcg.is_state_equal(reverser.finish(), reverse_lcg(iter(LCG)))
+
+
+def test_verify_rejected() -> None:
+    """Test that a rejection is only reused for the same input."""
+    values = [4, 8, 15, 16, 23, 42]
+    entry = cached_entry(values)
+    assert entry.state is None
+
+    assert verify_cached(entry, reverse_lcg, Lcg, iter(values)) is None
+    # a longer input is reversed again, the reverser sees all of it
+    seen = []
+    _ = verify_cached(entry, seen.extend, Lcg, iter([*values, 1]))
+    assert seen == [*values, 1]
+
+
+def test_evict(tmp_path: Path) -> None:
+    """Test that the least recently used entries are evicted first."""
+    entry = cached_entry(LCG[:10])
+    cache = ResultCache(str(tmp_path))
+    cache.put("a", entry)
+    cache.put("b", entry)
+
+    cache.max_size = 2 * os.path.getsize(tmp_path / "a")
+    os.utime(tmp_path / "a", (0, 0))
+    os.utime(tmp_path / "b", (time.time() - 10, time.time() - 10))
+    assert cache.get("a") == entry  # marks it as used
+
+    cache.put("c", entry)
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+
+def test_key_options(tmp_path: Path) -> None:
+    """Test that reversers given different options have different keys."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    keys = {
+        cache.key("lcg", LcgReverser, LCG),
+        cache.key("lcg", partial(LcgReverser, false_positive=1e-6), LCG),
+        cache.key("lcg", partial(LcgReverser, false_positive=1e-9), LCG),
+    }
+
+    assert len(keys) == 3
+    assert cache.key("lcg", partial(LcgReverser, false_positive=1e-6), LCG) in keys
+
+
+def test_cli_false_positive(tmp_path: Path) -> None:
+    """Test that states verified for a probability are cached."""
+    path = tmp_path / "lcg.txt"
+    _ = path.write_text("".join(f"{value}\n" for value in LCG))
+    command = [
+        *(sys.executable, "-m", "seedseeker", "-r", "-i", str(path)),
+        *("--generators", "lcg", "--cache", str(tmp_path / "cache")),
+        *("--false-positive", "1e-6"),
+    ]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    outputs = [
+        subprocess.run(  # noqa: S603
+            command, check=True, capture_output=True, text=True, env=env
+        ).stdout
+        for _ in range(2)
+    ]
+
+    # stopping early, the state is the one after the last value read
+    assert outputs[0] == outputs[1]
+    assert outputs[0].startswith("lcg 4294967296;1664525;1013904223;")
@@ -0,0 +1,121 @@
+import bz2
+import gzip
+import lzma
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils import compression
+from seedseeker.utils.binary import BinaryStream
+from seedseeker.utils.filestream import FileStream
+
+VALUES = list(range(0, 10**6, 37))
+TEXT = "".join(f"{value}\n" for value in VALUES).encode()
+
+COMPRESSORS: list[Callable[[bytes], bytes]] = [
+    gzip.compress,
+    lzma.compress,
+    bz2.compress,
+]
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_compressed_text(
+    compress: Callable[[bytes], bytes],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that compressed text input is decompressed transparently."""
+    # small chunks, so that the queue fills up and the thread has to wait
+    monkeypatch.setattr(compression, "READ_SIZE", 1000)
+    path = tmp_path / "input.txt.z"
+    _ = path.write_bytes(compress(TEXT))
+
+    with FileStream(str(path)) as stream:
+        assert list(stream.integers(block_size=4096)) == VALUES
+        assert [meter.name for meter in stream.meters] == ["decompress", "parse"]
+        assert stream.meters[0].amount == len(TEXT)
+        assert stream.meters[1].amount == len(VALUES)
+
+    with FileStream(str(path)) as stream:
+        assert [next(stream), next(stream)] == ["0", "37"]
+
+
+def test_uncompressed_text(tmp_path: Path) -> None:
+    """Test that plain input is read directly."""
+    path = tmp_path / "input.txt"
+    _ = path.write_bytes(TEXT)
+
+    with FileStream(str(path)) as stream:
+        assert list(stream.integers()) == VALUES
+        assert [meter.name for meter in stream.meters] == ["parse"]
+
+
+@pytest.mark.parametrize(
+    "opening",
+    [
+        "list(FileStream(path).__enter__().integers())",
+        "list(BinaryStream(path, 'u32le').__enter__())",
+    ],
+)
+def test_uncompressed_lazy(opening: str, tmp_path: Path) -> None:
+    """Test that reading plain input does not load the decompression."""
+    path = tmp_path / "input"
+    _ = path.write_bytes(TEXT[: len(TEXT) // 4 * 4])
+
+    code = (
+        "import sys\n"
+        "from seedseeker.utils.binary import BinaryStream\n"
+        "from seedseeker.utils.filestream import FileStream\n"
+        f"path = {str(path)!r}\n"
+        f"{opening}\n"
+        "sys.exit('seedseeker.utils.compression' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.run([sys.executable, "-c", code], check=False, env=env)  # noqa: S603
+    assert process.returncode == 0
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_truncated(compress: Callable[[bytes], bytes], tmp_path: Path) -> None:
+    """Test that corrupted compressed input is reported."""
+    path = tmp_path / "input.txt.z"
+    _ = path.write_bytes(compress(TEXT)[:-100])
+
+    with (
+        FileStream(str(path)) as stream,
+        pytest.raises(InvalidFormatError, match="Invalid"),
+    ):
+        _ = list(stream.integers())
+
+
+def test_abandoned(tmp_path: Path) -> None:
+    """Test that closing the stream early stops the decompression thread."""
+    path = tmp_path / "input.txt.gz"
+    _ = path.write_bytes(gzip.compress(TEXT * 10))
+
+    with FileStream(str(path)) as stream:
+        assert next(stream) == "0"
+        assert stream.stream is not None
+        reader = stream.stream.buffer.raw
+
+    assert isinstance(reader, compression.DecompressingReader)
+    reader.thread.join(timeout=5)
+    assert not reader.thread.is_alive()
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_compressed_binary(compress: Callable[[bytes], bytes], tmp_path: Path) -> None:
+    """Test that compressed binary input is decompressed transparently."""
+    path = tmp_path / "input.bin.z"
+    data = b"".join(value.to_bytes(4, "little") for value in VALUES)
+    _ = path.write_bytes(compress(data))
+
+    with BinaryStream(str(path), "u32le") as stream:
+        assert list(stream) == VALUES
+        assert stream.meters[0].amount == len(data)
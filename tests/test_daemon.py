@@ -0,0 +1,190 @@
+import asyncio
+import json
+import random
+import time
+from contextlib import suppress
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from seedseeker.daemon import Address, Daemon, reverse_values
+from seedseeker.defs import InvalidFormatError
+from seedseeker.generators import Lcg, reverse_fibonacci, reverse_lcg, reverse_xoshiro
+
+GENERATORS = {"lcg": Lcg}
+
+
+def slow_reverser(values: Any) -> None:
+    """Reverser that keeps its worker busy."""
+    _ = values
+    time.sleep(60)
+
+
+REVERSERS = {"lcg": reverse_lcg, "fibonacci": reverse_fibonacci, "slow": slow_reverser}
+
+LCG_STATE = "4294967296;1664525;1013904223;1"
+LCG = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 100))
+
+
+def exchange(
+    path: Path, requests: list[dict[str, Any]], pause: float = 0.0
+) -> list[dict[str, Any]]:
+    """Send requests to a fresh daemon, `pause` seconds apart, return the responses."""
+
+    async def scenario() -> list[dict[str, Any]]:
+        ready = asyncio.Event()
+        daemon = Daemon(GENERATORS, REVERSERS, jobs=1)
+        server = asyncio.create_task(
+            daemon.serve(Address(str(path), None, None), ready.set)
+        )
+        await ready.wait()
+
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b"\n")
+            await asyncio.sleep(pause)
+        writer.write_eof()
+
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+
+        _ = server.cancel()
+        with suppress(asyncio.CancelledError):
+            await server
+
+        return responses
+
+    return asyncio.run(scenario())
+
+
+def test_daemon(tmp_path: Path) -> None:
+    """Test that every request gets its response."""
+    responses = exchange(
+        tmp_path / "daemon.sock",
+        [
+            {
+                "id": 1,
+                "command": "generate",
+                "generator": "lcg",
+                "arguments": LCG_STATE,
+            },
+            {"id": 2, "command": "reverse", "values": LCG, "generators": ["lcg"]},
+            {"id": 3, "command": "predict", "generator": "lcg", "state": LCG_STATE},
+            {"id": 4, "command": "generate", "generator": "unknown"},
+            {"id": 5, "command": "predict", "generator": "lcg", "state": "1;2"},
+            {"id": 6, "command": "reverse", "values": "1 2 3"},
+        ],
+    )
+    by_id = {response["id"]: response for response in responses}
+
+    assert by_id[1]["result"] == LCG[:16]
+    assert by_id[2]["result"][0]["generator"] == "lcg"
+    assert by_id[2]["result"][0]["state"] == str(reverse_lcg(iter(LCG)))
+    assert by_id[3]["result"] == LCG[:16]
+    assert [by_id[i]["status"] for i in (4, 5, 6)] == ["error"] * 3
+    assert not (tmp_path / "daemon.sock").exists()
+
+
+def test_reverse_failing() -> None:
+    """Test that a failing reverser is reported with its error, not as a match."""
+    reversers = {"lcg": reverse_lcg, "xoshiro": reverse_xoshiro}
+    results = reverse_values([0] * 100, ["lcg", "xoshiro"], reversers)
+
+    assert [r["generator"] for r in results] == ["xoshiro"]
+    assert results[0]["state"] is None
+    assert "zero" in results[0]["error"]
+
+
+def test_daemon_cancel(tmp_path: Path) -> None:
+    """Test that a waiting request can be cancelled."""
+    values = [random.getrandbits(32) for _ in range(1000)]
+    slow = {"command": "reverse", "values": values, "generators": ["fibonacci"]}
+
+    responses = exchange(
+        tmp_path / "daemon.sock",
+        [
+            {"id": 1, **slow},
+            {"id": 2, **slow},
+            {"id": 3, "command": "cancel", "target": 2},
+            {"id": 4, "command": "cancel", "target": 5},
+            "not a request",
+        ],
+    )
+    by_id = {response["id"]: response for response in responses}
+
+    assert by_id[1] == {"id": 1, "status": "ok", "result": []}
+    assert by_id[2]["status"] == "cancelled"
+    assert by_id[4]["status"] == "error"
+    assert by_id[None]["status"] == "error"
+
+
+def test_daemon_cancel_running(tmp_path: Path) -> None:
+    """Test that cancelling a running request frees its worker right away."""
+    started = time.perf_counter()
+    responses = exchange(
+        tmp_path / "daemon.sock",
+        [
+            {"id": 1, "command": "reverse", "values": LCG, "generators": ["slow"]},
+            {"id": 2, "command": "cancel", "target": 1},
+            {
+                "id": 3,
+                "command": "generate",
+                "generator": "lcg",
+                "arguments": LCG_STATE,
+            },
+        ],
+        pause=0.5,
+    )
+
+    # the only worker is busy for a minute unless the job was stopped
+    assert time.perf_counter() - started < 30
+    by_id = {response["id"]: response for response in responses}
+    assert by_id[1]["status"] == "cancelled"
+    assert by_id[3]["status"] == "ok"
+
+
+def test_daemon_ids(tmp_path: Path) -> None:
+    """Test that requests without a unique id are refused."""
+    values = [random.getrandbits(32) for _ in range(1000)]
+    slow = {"command": "reverse", "values": values, "generators": ["fibonacci"]}
+    generate = {"command": "generate", "generator": "lcg", "arguments": LCG_STATE}
+
+    responses = exchange(
+        tmp_path / "daemon.sock",
+        [
+            {"id": 1, **slow},
+            {"id": 1, **generate},
+            generate,
+            {"id": [2], **generate},
+            {"id": 3, "command": "cancel", "target": [1]},
+        ],
+    )
+
+    assert len(responses) == 5
+    assert [r["status"] for r in responses[:4]] == ["error"] * 4
+    duplicate = {"id": 1, "status": "error", "error": "Request 1 is already running"}
+    assert duplicate in responses
+    assert responses[-1]["id"] == 1
+    assert responses[-1]["status"] == "ok"
+
+
+def test_address() -> None:
+    """Test parsing of listening addresses."""
+    assert Address.parse("8080") == Address(None, "127.0.0.1", 8080)
+    assert Address.parse("localhost:80") == Address(None, "localhost", 80)
+    assert Address.parse("/run/seedseeker.sock") == Address(
+        "/run/seedseeker.sock", None, None
+    )
+    assert Address.parse("127.0.0.2:80") == Address(None, "127.0.0.2", 80)
+    assert Address.parse("[::1]:80") == Address(None, "::1", 80)
+
+
+@pytest.mark.parametrize(
+    "address", ["0.0.0.0:80", "192.168.1.1:80", "[::]:80", "example.com:80"]
+)
+def test_address_public(address: str) -> None:
+    """Test that the unauthenticated daemon does not listen on other hosts."""
+    with pytest.raises(InvalidFormatError, match="localhost"):
+        _ = Address.parse(address)
@@ -0,0 +1,112 @@
+import time
+from collections.abc import Iterator
+from itertools import islice
+
+from seedseeker.dispatch import WINDOW, Status, dispatch
+from seedseeker.generators import Lcg, reverse_lcg, reverse_ran3, reverse_xoshiro
+from seedseeker.utils.stream import SharedStream
+
+GENERATOR_LIMIT = 1000
+
+
+def slow_reverser(generator: Iterator[int]) -> None:
+    """Reverser that never finishes in time."""
+    _ = generator
+    time.sleep(60)
+
+
+def failing_reverser(generator: Iterator[int]) -> None:
+    """Reverser that raises an exception."""
+    raise ValueError(next(generator))
+
+
+def test_dispatch() -> None:
+    """Test that every reverser reports its outcome."""
+    sequence = list(islice(Lcg(2**32, 1664525, 1013904223, 1), GENERATOR_LIMIT))
+    reversers = {"lcg": reverse_lcg, "ran3": reverse_ran3, "xoshiro": reverse_xoshiro}
+
+    outcomes = {
+        o.name: o for o in dispatch(SharedStream(iter(sequence)), reversers, jobs=2)
+    }
+
+    assert outcomes["lcg"].status == Status.FOUND
+    assert outcomes["lcg"].state == reverse_lcg(iter(sequence))
+    assert outcomes["ran3"].status == Status.REJECTED
+    assert outcomes["xoshiro"].status == Status.REJECTED
+
+
+def test_dispatch_timeout() -> None:
+    """Test that slow and failing reversers do not block the others."""
+    sequence = list(islice(Lcg(2**32, 1664525, 1013904223, 1), GENERATOR_LIMIT))
+    reversers = {
+        "slow": slow_reverser,
+        "failing": failing_reverser,
+        "lcg": reverse_lcg,
+    }
+
+    started = time.perf_counter()
+    outcomes = list(
+        dispatch(SharedStream(iter(sequence)), reversers, jobs=3, timeout=0.5)
+    )
+
+    assert time.perf_counter() - started < 30
+    assert outcomes[-1].name == "slow"
+    assert outcomes[-1].status == Status.TIMEOUT
+    assert {o.name: o.status for o in outcomes[:2]} == {
+        "failing": Status.FAILED,
+        "lcg": Status.FOUND,
+    }
+
+
+def test_dispatch_jobs() -> None:
+    """Test that reversers waiting for a job do not stall the running ones."""
+    sequence = list(islice(Lcg(2**32, 1664525, 1013904223, 1), GENERATOR_LIMIT))
+    chunk_size = 10
+    assert len(sequence) // chunk_size > WINDOW
+
+    outcomes = dispatch(
+        SharedStream(iter(sequence), chunk_size),
+        {"lcg": reverse_lcg, "ran3": reverse_ran3},
+        jobs=1,
+        timeout=20,
+    )
+
+    assert {o.name: o.status for o in outcomes} == {
+        "lcg": Status.FOUND,
+        "ran3": Status.REJECTED,
+    }
+
+
+def test_dispatch_pending_memory() -> None:
+    """Test that reversers waiting for a job keep at most a window of chunks."""
+    sequence = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 3000))
+    chunk_size = 10
+    retained: list[int] = []
+
+    def source() -> Iterator[int]:
+        for value in sequence:
+            retained.append(len(stream.chunks))
+            yield value
+
+    stream = SharedStream(source(), chunk_size)
+    names = ["first", "second", "third"]
+    outcomes = list(dispatch(stream, dict.fromkeys(names, reverse_lcg), jobs=1))
+
+    assert [o.name for o in outcomes] == names
+    assert all(o.state == reverse_lcg(iter(sequence)) for o in outcomes)
+    assert len(sequence) // chunk_size > 2 * WINDOW
+    assert max(retained) <= WINDOW
+
+
+def test_dispatch_cancel() -> None:
+    """Test that closing the dispatcher stops the remaining reversers."""
+    sequence = list(islice(Lcg(2**32, 1664525, 1013904223, 1), GENERATOR_LIMIT))
+    outcomes = dispatch(
+        SharedStream(iter(sequence)), {"lcg": reverse_lcg, "slow": slow_reverser}
+    )
+
+    started = time.perf_counter()
+    assert next(outcomes).status == Status.FOUND
+    outcomes.close()
+
+    assert time.perf_counter() - started < 30
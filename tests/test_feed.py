@@ -0,0 +1,249 @@
+from collections.abc import Iterator
+from itertools import batched, islice
+from math import log2
+from typing import Any
+
+import pytest
+
+from seedseeker.dispatch import Status, dispatch, feed_chunks
+from seedseeker.feed import (
+    CONFIRM_SAMPLES,
+    Confidence,
+    Lockstep,
+    Progress,
+    PullReverser,
+    Verifier,
+    as_feed,
+    confidence_bits,
+    feeds,
+    matching,
+    unicity_distance,
+    verification_length,
+)
+from seedseeker.generators import (
+    FibonacciReverser,
+    FibonacciRng,
+    Lcg,
+    LcgReverser,
+    MersenneReverser,
+    MersenneTwister,
+    Ran3,
+    Ran3Reverser,
+    Xoshiro,
+    XoshiroReverser,
+    reverse_lcg,
+)
+from seedseeker.registry import BUILTINS, REVERSERS
+from seedseeker.utils.stream import SharedStream
+
+GENERATOR_LIMIT = 2000
+
+CASES = [
+    (LcgReverser, Lcg(2**32, 1664525, 1013904223, 1)),
+    (XoshiroReverser, Xoshiro((1, 2, 3, 4))),
+    (Ran3Reverser, Ran3(1234)),
+    (MersenneReverser, MersenneTwister(42)),
+    (FibonacciReverser, FibonacciRng(24, 55, 2**32, [3**i % 2**32 for i in range(55)])),
+]
+
+
+def counted(values: Iterator[int], consumed: list[int]) -> Iterator[int]:
+    """Iterate over `values`, counting them in `consumed[0]`."""
+    for value in values:
+        consumed[0] += 1
+        yield value
+
+
+@pytest.mark.parametrize(("reverser_class", "prng"), CASES)
+@pytest.mark.parametrize("block", [1, 7, 1024])
+def test_incremental(reverser_class: type, prng: object, block: int) -> None:
+    """Test that feeding blocks of any size finds the same state."""
+    values = list(islice(prng, GENERATOR_LIMIT))
+    reverser = reverser_class()
+
+    progress = [reverser.feed(chunk) for chunk in batched(values, block)]
+    found = reverser.finish()
+
+    assert found is not None
+    assert type(prng).is_state_equal(found, prng.state())
+    assert progress[-1] is Progress.CONFIRMED
+    # the progress only moves forward
+    assert progress == sorted(progress, key=list(Progress).index)
+
+
+@pytest.mark.parametrize(("reverser_class", "prng"), CASES)
+def test_rejected(reverser_class: type, prng: object) -> None:
+    """Test that a wrong value rejects a confirmed state."""
+    values = list(islice(prng, GENERATOR_LIMIT))
+    reverser = reverser_class()
+
+    assert reverser.feed(values).decided
+    assert reverser.feed([values[-1] ^ 1]) is Progress.REJECTED
+    assert reverser.finish() is None
+
+
+@pytest.mark.parametrize(
+    ("reverser_class", "prng"),
+    [
+        (LcgReverser, Lcg(2**32, 1664525, 1013904223, 1)),
+        (XoshiroReverser, Xoshiro((1, 2, 3, 4))),
+        (Ran3Reverser, Ran3(1234)),
+        (MersenneReverser, MersenneTwister(42)),
+        (
+            FibonacciReverser,
+            FibonacciRng(24, 55, 2**32, [3**i % 2**32 for i in range(55)]),
+        ),
+    ],
+)
+def test_false_positive(reverser_class: type, prng: Any) -> None:
+    """Test that a state is confirmed once a false positive is unlikely enough."""
+    expected = prng.fork()
+    values = list(islice(prng, GENERATOR_LIMIT))
+    reverser = reverser_class(false_positive=2**-64)
+
+    read = next(i + 1 for i, v in enumerate(values) if reverser.feed([v]).decided)
+    found = reverser.finish()
+
+    assert isinstance(found, Confidence)
+    assert found.bits >= 64
+    assert found.verified < CONFIRM_SAMPLES
+    _ = list(islice(expected, read))
+    assert type(prng).is_state_equal(found.state, expected.state())
+
+
+@pytest.mark.parametrize(
+    ("candidates", "value_bits", "probability", "expected"),
+    [
+        (1, 32, 2**-64, 2),
+        (1, 64, 2**-64, 1),
+        (16, 32, 2**-64, 3),
+        (1, 8, 0.5, 1),
+    ],
+)
+def test_verification_length(
+    candidates: int, value_bits: float, probability: float, expected: int
+) -> None:
+    """Test that the length is the fewest values reaching the probability."""
+    length = verification_length(candidates, value_bits, probability)
+
+    assert length == expected
+    assert confidence_bits(candidates, value_bits, length) >= -log2(probability)
+    assert confidence_bits(candidates, value_bits, length - 1) < -log2(probability)
+
+
+def test_unicity_distance() -> None:
+    """Test that a state is covered by as many values as it has bits."""
+    # a Mersenne Twister is solved from 624 values, 2 more make it unique
+    assert unicity_distance(19937, 32, 2**-64) == 626
+    assert unicity_distance(256, 64, 2**-64) == 5
+
+
+@pytest.mark.parametrize("name", list(BUILTINS))
+def test_min_samples(name: str) -> None:
+    """Test that the reversers agree with the profiles on the samples needed."""
+    assert REVERSERS[name].min_samples == BUILTINS[name].profile.min_samples
+
+
+def test_verifier() -> None:
+    """Test that a candidate is confirmed after enough values."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 2 * CONFIRM_SAMPLES))
+    verifier = Verifier(Lcg(2**32, 1664525, 1013904223, 1))
+
+    assert verifier.feed(values[: CONFIRM_SAMPLES - 1]) is Progress.CANDIDATE
+    assert verifier.feed(values[CONFIRM_SAMPLES - 1 :]) is Progress.CONFIRMED
+    assert verifier.finish() == reverse_lcg(iter(values))
+    assert Verifier(Lcg(2**32, 1, 1, 1), confirm_samples=0).feed([]).decided
+
+
+def test_pull_reverser() -> None:
+    """Test that functions taking an iterator see the whole input."""
+    seen = []
+    reverser = as_feed(seen.extend)
+
+    assert isinstance(reverser, PullReverser)
+    assert not reverser.feed([1, 2]).decided
+    assert not reverser.feed([3]).decided
+    _ = reverser.finish()
+    assert seen == [1, 2, 3]
+    assert feeds(LcgReverser)
+    assert not feeds(reverse_lcg)
+
+
+def test_feed_chunks_early() -> None:
+    """Test that decided reversers stop reading chunks."""
+    consumed = [0]
+    chunks = batched(counted(Lcg(2**32, 1664525, 1013904223, 1), consumed), 16)
+
+    assert feed_chunks(LcgReverser(), chunks, early=True) is not None
+    assert consumed[0] < 2 * CONFIRM_SAMPLES
+
+
+def test_dispatch_early() -> None:
+    """Test that stopping early reads only the beginning of the input."""
+    consumed = [0]
+    sequence = islice(Lcg(2**32, 1664525, 1013904223, 1), 100 * GENERATOR_LIMIT)
+    stream = SharedStream(counted(sequence, consumed), chunk_size=128)
+    reversers = {"lcg": LcgReverser, "xoshiro": XoshiroReverser}
+
+    outcomes = {o.name: o for o in dispatch(stream, reversers, early=True)}
+
+    assert outcomes["lcg"].status == Status.FOUND
+    assert outcomes["xoshiro"].status == Status.REJECTED
+    assert consumed[0] < GENERATOR_LIMIT
+    # the state is the one after the chunks the reverser read
+    prng = Lcg(2**32, 1664525, 1013904223, 1)
+    states = [reverse_lcg(islice(prng, 128)) for _ in range(consumed[0] // 128)]
+    assert outcomes["lcg"].state in states
+
+
+def test_lockstep() -> None:
+    """Test that mismatching candidates are dropped and the rest survive."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 3000))
+
+    def candidates() -> list[Lcg]:
+        return [
+            Lcg(2**32, 1664525, 1013904223, 2),
+            Lcg(2**32, 1664525, 1013904223, 1),
+            Lcg(2**32, 22695477, 1, 1),
+            Lcg(2**32, 1664525, 1013904223, 1),
+        ]
+
+    # two candidates are the same generator, so none is confirmed
+    lockstep = Lockstep(candidates())
+    assert lockstep.feed(values) is Progress.CANDIDATE
+    assert lockstep.survivors() == [reverse_lcg(iter(values))] * 2
+    assert lockstep.finish() == reverse_lcg(iter(values))
+
+    single = Lockstep(candidates()[:3])
+    assert single.feed(values[:CONFIRM_SAMPLES]) is Progress.CONFIRMED
+    assert single.feed([values[CONFIRM_SAMPLES] ^ 1]) is Progress.REJECTED
+    assert single.finish() is None
+    assert Lockstep([]).feed(values) is Progress.REJECTED
+
+
+@pytest.mark.parametrize(
+    ("block", "expected"),
+    [
+        ([1, 2, 3], [True, False, True]),
+        ([1, 2, -3], [False, False, False]),
+    ],
+)
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_matching(block: list[int], expected: list[bool], vectorized: bool) -> None:
+    """Test that lanes of NumPy predictions match like lists."""
+    predictions: list[Any] = [[1, 2, 3], [1, 2, 4], [1, 2, 3]]
+    if vectorized:
+        np = pytest.importorskip("numpy")
+        predictions = [np.array(p, dtype=np.uint64) for p in predictions]
+
+    assert matching(block, predictions) == expected
+
+
+def test_lcg_divisors() -> None:
+    """Test that a smaller modulus is verified when the largest one fails."""
+    values = list(islice(Lcg(731, 679, 340, 29), 120))
+    solution = LcgReverser().solve(values[:34], final=True)
+
+    assert isinstance(solution, list)
+    assert solution[0].state().x_n.modulus == 2 * 731
+    assert Lockstep(solution).run(values[34:]) == reverse_lcg(iter(values))
@@ -0,0 +1,130 @@
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.utils import filestream
+from seedseeker.utils.filestream import FileStream, parse_integers
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def parser(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the test with and without the NumPy fast path."""
+    if request.param == "numpy":
+        _ = pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(filestream, "numpy", lambda: None)
+    return request.param
+
+
+def read_integers(text: str, block_size: int = 7) -> list[int]:
+    """Parse `text` through a FileStream reading small blocks."""
+    raw = io.TextIOWrapper(io.BytesIO(text.encode()), encoding="utf-8")
+    stream = FileStream(None)
+    stream.stream = raw
+    return list(stream.integers(block_size))
+
+
+@pytest.mark.usefixtures("parser")
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("1\n2\n3\n", [1, 2, 3]),
+        ("1\n22\n333", [1, 22, 333]),
+        ("10, 20,30\n40 50\t60\n", [10, 20, 30, 40, 50, 60]),
+        ("0x10\n0XfF\n7\n", [16, 255, 7]),
+        ("-5\n+6\n", [-5, 6]),
+        (f"{2**64 - 1}\n{2**64}\n{3**50}\n", [2**64 - 1, 2**64, 3**50]),
+        ("123456\n987654\n\n555\n", [123456, 987654]),
+        ("1\n2\n  \t\n3\n", [1, 2]),
+        ("\n1\n", []),
+        ("", []),
+        ("1\n2\n3\n ", [1, 2, 3]),
+        ("1\n2\n3\n\t,", [1, 2, 3]),
+        (" \n", []),
+    ],
+)
+def test_integers(text: str, expected: list[int]) -> None:
+    """Test parsing of the supported text layouts."""
+    assert read_integers(text) == expected
+    assert read_integers(text, block_size=2**20) == expected
+
+
+@pytest.mark.usefixtures("parser")
+@pytest.mark.parametrize(
+    ("text", "token", "line"),
+    [
+        ("1\n2\nabc\n", "abc", 3),
+        ("1 2\n3\n4\n5 6 1.5\n", "1.5", 4),
+        ("1,,2\n0xZ\n", "0xZ", 2),
+    ],
+)
+def test_integers_invalid(text: str, token: str, line: int) -> None:
+    """Test that invalid tokens are reported with their line."""
+    with pytest.raises(InvalidFormatError, match=f"`{token}` on line {line}"):
+        _ = read_integers(text)
+
+
+# before and after the sample the reversers are selected with
+@pytest.mark.parametrize("line", [3, 10000])
+def test_cli_invalid(line: int, tmp_path: Path) -> None:
+    """Test that reversing a sequence with an invalid token reports it."""
+    path = tmp_path / "input.txt"
+    values = [str(value) for value in range(20000)]
+    values[line - 1] = "abc"
+    _ = path.write_text("\n".join(values))
+    command = [sys.executable, "-m", "seedseeker", "-r", "-i", str(path), "-l", "0"]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    process = subprocess.run(  # noqa: S603
+        command, check=False, capture_output=True, text=True, env=env
+    )
+
+    assert process.returncode == 1
+    assert process.stderr.startswith(f"Error: Invalid integer `abc` on line {line}")
+    assert "Traceback" not in process.stderr
+
+
+@pytest.mark.usefixtures("parser")
+@pytest.mark.parametrize("text", ["", " ", "\n\n", ",", " ,\t\n"])
+def test_parse_blank(text: str) -> None:
+    """Test that text without any token has no integers."""
+    assert parse_integers(text) == []
+
+
+@pytest.mark.usefixtures("parser")
+def test_integers_blocks() -> None:
+    """Test that values split between blocks are not broken apart."""
+    values = list(range(0, 10**7, 997))
+    text = "\n".join(map(str, values))
+
+    assert read_integers(text, block_size=5) == values
+    assert read_integers(text, block_size=4096) == values
+
+
+def test_follow(tmp_path: Path) -> None:
+    """Test that a followed file is read as it grows, past empty lines."""
+    # the last line is incomplete until the rest of it is written
+    path = tmp_path / "live.txt"
+    path.write_text("1\n2\n\n3")
+
+    def append() -> None:
+        time.sleep(2 * filestream.POLL_INTERVAL)
+        with open(path, "a") as file:
+            file.write("4\n5\n")
+
+    writer = threading.Thread(target=append)
+    writer.start()
+
+    with FileStream(str(path), follow=True) as stream:
+        values = list(islice(stream.integers(), 4))
+
+    writer.join()
+    assert values == [1, 2, 34, 5]
@@ -1,16 +1,21 @@
 from itertools import islice
+from typing import Any
 
 import pytest
 
+from seedseeker.defs import IntegerRNG
 from seedseeker.generators import (
     FibonacciRng,
     Lcg,
     MersenneTwister,
     Ran3,
+    Ran3State,
     Xoshiro,
     XoshiroState,
+    lcg,
 )
-from seedseeker.generators.mersenne import reverse_mersenne
+from seedseeker.generators.mersenne import MersenneTwisterState, reverse_mersenne
+from seedseeker.utils.iterator import drop, first_mismatch, synchronize
 
 GENERATOR_LIMIT = 1000
 
@@ -574,3 +579,180 @@ def test_fibonacci_from_string() -> None:
 
     from_string = FibonacciRng.state_from_string(str(state))
     assert from_string == state
+
+
+@pytest.mark.parametrize(
+    ("prng"),
+    [
+        (Lcg(2**32, 1664525, 1013904223, 1)),
+        (Ran3(1)),
+        (Xoshiro(XoshiroState(1, 2, 3, 4))),
+        (FibonacciRng(2, 5, 2**32, 20, True)),
+    ],
+)
+def test_state_fingerprint(prng: IntegerRNG[Any]) -> None:
+    """Test that fingerprints identify states that produce the same output."""
+    before = prng.state().fingerprint()
+    _ = drop(prng, 1000)
+    state = prng.state()
+
+    from_string = prng.state_from_string(str(state))
+    assert state.fingerprint() == from_string.fingerprint()
+    assert state.fingerprint() != before
+    assert len({state, from_string}) == 1
+
+
+def test_ran3_canonical_rotation() -> None:
+    """Test that rotated ran3 buffers have the same canonical form."""
+    array, pointer_a, pointer_b = Ran3(1).state()
+    rotated = Ran3State(
+        [0, *array[2:], array[1]], (pointer_a - 1) % 55, (pointer_b - 1) % 55
+    )
+
+    assert Ran3.is_state_equal(Ran3State(array, pointer_a, pointer_b), rotated)
+    assert Ran3.is_state_equal(Ran3(1).state(), Ran3State(array, 55, 21))
+    assert not Ran3.is_state_equal(Ran3(1).state(), Ran3(2).state())
+
+    # equivalent states are deduplicated like their hashes
+    assert rotated == Ran3(1).state()
+    assert rotated != Ran3(2).state()
+    assert len({Ran3(1).state(), rotated, Ran3(2).state()}) == 2
+
+
+def test_mersenne_state_equal() -> None:
+    """Test that incremental and RandCrack states of the same generator match."""
+    prng = drop(MersenneTwister(5489), 700)
+
+    found = reverse_mersenne(islice(prng, GENERATOR_LIMIT))
+    assert found is not None
+
+    assert MersenneTwister.is_state_equal(prng.state(), found)
+    assert prng.state().fingerprint() == found.fingerprint()
+    assert prng.state() == found
+    assert len({prng.state(), found, MersenneTwister(1).state()}) == 2
+    assert not MersenneTwister.is_state_equal(MersenneTwister(1).state(), found)
+
+
+def test_state_encoded_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a state is encoded once, and again once changed in place."""
+    encoded: list[MersenneTwisterState] = []
+    encode = MersenneTwisterState.encode
+
+    def counting(state: MersenneTwisterState) -> bytes:
+        encoded.append(state)
+        return encode(state)
+
+    monkeypatch.setattr(MersenneTwisterState, "encode", counting)
+    state = drop(MersenneTwister(1234), 10).state()
+
+    canonical = state.canonical()
+    assert len({state, state._replace(array=list(state.array))}) == 1
+    assert state.fingerprint() == state.fingerprint()
+    assert len(encoded) == 1
+
+    state.array[10] ^= 0xFFFFFFFF
+    assert state.canonical() != canonical
+    assert len(encoded) == 2
+
+
+@pytest.mark.parametrize(
+    ("prng"),
+    [
+        (Lcg(2**32, 1664525, 1013904223, 1)),
+        (Ran3(1)),
+        (MersenneTwister(1)),
+        (Xoshiro(XoshiroState(1, 2, 3, 4))),
+        (FibonacciRng(2, 5, 2**32, 20, True)),
+    ],
+)
+def test_fork(prng: IntegerRNG[Any]) -> None:
+    """Test that forks and returned states are not affected by later writes."""
+    state = prng.state()
+    canonical = state.canonical()
+
+    fork = prng.fork()
+    expected = list(islice(prng, 100))
+
+    assert list(islice(fork, 100)) == expected
+    assert list(islice(prng.from_state(state), 100)) == expected
+    assert state.canonical() == canonical
+
+
+def test_mersenne_from_state() -> None:
+    """Test restoring both Mersenne Twister state representations."""
+    prng = drop(MersenneTwister(42), 100)
+    found = reverse_mersenne(islice(prng.fork(), GENERATOR_LIMIT))
+    assert found is not None
+
+    restored = MersenneTwister.from_state(prng.state())
+    forked = MersenneTwister.from_state(found).fork()
+    expected = list(islice(drop(prng, GENERATOR_LIMIT), 10))
+
+    assert list(islice(drop(restored, GENERATOR_LIMIT), 10)) == expected
+    assert list(islice(forked, 10)) == expected
+
+
+@pytest.mark.parametrize(
+    ("prng"),
+    [
+        (Lcg(2**32, 1664525, 1013904223, 1)),
+        (Lcg(2**48, 25214903917, 11, 5)),
+        (Ran3(1)),
+        (MersenneTwister(1)),
+        (Xoshiro(XoshiroState(1, 2, 3, 4))),
+        (FibonacciRng(2, 5, 2**32, 20, True)),
+    ],
+)
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_next_block(
+    prng: IntegerRNG[Any], vectorized: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that blocks are the values and states of stepping one by one."""
+    if vectorized:
+        _ = pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(lcg, "numpy", lambda: None)
+
+    scalar = prng.fork()
+
+    for n in [0, 1, 7, 1024, 3]:
+        block = prng.next_block(n)
+        assert list(block) == list(islice(scalar, n))
+        assert prng.is_state_equal(prng.state(), scalar.state())
+
+    # a fork shares its buffers until one of them writes
+    fork = prng.fork()
+    _ = prng.next_block(10)
+    assert list(fork.next_block(10)) == list(islice(scalar, 10))
+
+
+@pytest.mark.parametrize(
+    ("values", "predicted", "expected"),
+    [
+        ([1, 2, 3], [1, 2, 3], None),
+        ([1, 2, 3], [1, 5, 3], 1),
+        ((1, 2, -3), [1, 2, 3], 2),
+        ([2**70], [0], 0),
+    ],
+)
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_first_mismatch(
+    values: Any, predicted: list[int], expected: int | None, vectorized: bool
+) -> None:
+    """Test that lists and arrays find the same mismatch."""
+    if vectorized:
+        np = pytest.importorskip("numpy")
+        predicted = np.array(predicted, dtype=np.uint64)
+
+    assert first_mismatch(values, predicted) == expected
+
+
+def test_synchronize() -> None:
+    """Test that the state is found after the whole sequence, or rejected."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 3000))
+    prng = Lcg(2**32, 1664525, 1013904223, 1)
+    assert synchronize(iter(values), prng) == prng.state()
+    assert prng.state() == Lcg(2**32, 1664525, 1013904223, values[-1]).state()
+
+    values[2500] += 1
+    assert synchronize(values, Lcg(2**32, 1664525, 1013904223, 1)) is None
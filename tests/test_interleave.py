@@ -0,0 +1,62 @@
+from itertools import islice
+
+from seedseeker.batch import Options
+from seedseeker.generators import (
+    Lcg,
+    Ran3,
+    Xoshiro,
+    reverse_lcg,
+    reverse_ran3,
+    reverse_xoshiro,
+)
+from seedseeker.interleave import Stream, separate, substreams
+
+REVERSERS = {"lcg": reverse_lcg, "xoshiro": reverse_xoshiro, "ran3": reverse_ran3}
+OPTIONS = Options(REVERSERS, explicit=False, limit=0, layout="text", first=True)
+
+
+def interleaved(*streams: list[int]) -> list[int]:
+    """Return the values of the streams in turn."""
+    return [value for values in zip(*streams, strict=True) for value in values]
+
+
+def test_separate() -> None:
+    """Test that every stream of a rotation is reversed on its own."""
+    lcg = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 200))
+    xoshiro = list(islice(Xoshiro((1, 2, 3, 4)), 200))
+    ran3 = list(islice(Ran3(3), 200))
+
+    streams = separate(interleaved(lcg, xoshiro, ran3), OPTIONS, jobs=2)
+
+    assert [s[:3] for s in streams] == [
+        (3, 0, "lcg"),
+        (3, 1, "xoshiro"),
+        (3, 2, "ran3"),
+    ]
+    assert streams[0].state == str(reverse_lcg(iter(lcg)))
+    assert streams[1].state == str(reverse_xoshiro(iter(xoshiro)))
+
+
+def test_single() -> None:
+    """Test that a sequence of a single generator is not split."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 300))
+
+    assert separate(values, OPTIONS, jobs=2, max_stride=3) == [
+        Stream(1, 0, "lcg", str(reverse_lcg(iter(values))))
+    ]
+
+
+def test_incomplete() -> None:
+    """Test that nothing is reported unless every stream has a generator."""
+    lcg = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 200))
+    values = interleaved(lcg, ([4, 8, 15, 16, 23, 42] * 34)[:200])
+
+    assert separate(values, OPTIONS, jobs=2, max_stride=4) == []
+
+
+def test_substreams() -> None:
+    """Test that every stride and phase is tried once."""
+    captures = list(substreams(list(range(6)), 3))
+
+    assert [c.id for c in captures] == ["1:0", "2:0", "2:1", "3:0", "3:1", "3:2"]
+    assert captures[4].values == [1, 4]
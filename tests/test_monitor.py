@@ -0,0 +1,64 @@
+import json
+import random
+from itertools import batched, islice
+
+import pytest
+
+from seedseeker.generators import Lcg, LcgReverser, Xoshiro, XoshiroReverser
+from seedseeker.monitor import Monitor
+from seedseeker.registry import GENERATORS
+
+REVERSERS = {"lcg": LcgReverser, "xoshiro": XoshiroReverser}
+
+
+def lcg(seed: int, count: int) -> list[int]:
+    """Return the first values of an LCG."""
+    return list(islice(Lcg(2**32, 1664525, 1013904223, seed), count))
+
+
+@pytest.mark.parametrize("block", [1, 100, 5000])
+def test_reseed(block: int) -> None:
+    """Test that a reseed is reported and the new generator is found again."""
+    values = [*lcg(1, 1000), *lcg(2, 1000)]
+    monitor = Monitor(REVERSERS, GENERATORS)
+
+    events = list(monitor.run(batched(values, block)))
+
+    assert [(e.event, e.generator) for e in events] == [
+        ("locked", "lcg"),
+        ("diverged", "lcg"),
+        ("locked", "lcg"),
+    ]
+    assert events[1].position == 1000
+    assert (events[1].expected, events[1].actual) == (lcg(1, 1001)[-1], values[1000])
+    for event in [events[0], events[2]]:
+        # the state predicts the rest of the stream
+        generator = Lcg.from_state(Lcg.state_from_string(event.state))
+        assert list(islice(generator, 10)) == values[event.position :][:10]
+    verified = (1000 - events[0].position) + (len(values) - events[2].position)
+    assert monitor.verify.amount == verified
+
+
+def test_unidentified() -> None:
+    """Test that unknown values are reported once and identification restarts."""
+    rng = random.Random(1)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    xoshiro = list(islice(Xoshiro((1, 2, 3, 4)), 200))
+    monitor = Monitor(REVERSERS, GENERATORS, window=100)
+
+    events = list(monitor.run(batched([*values, *xoshiro], 50)))
+
+    assert [(e.event, e.generator) for e in events] == [
+        ("unidentified", None),
+        ("locked", "xoshiro"),
+    ]
+    assert json.loads(events[1].to_json())["state"] == events[1].state
+
+
+def test_window() -> None:
+    """Test that reversers that did not decide are finished at the window."""
+    monitor = Monitor({"lcg": LcgReverser}, GENERATORS, window=40)
+
+    events = list(monitor.run([lcg(1, 40)]))
+
+    assert [(e.event, e.position) for e in events] == [("locked", 40)]
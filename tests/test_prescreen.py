@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+from itertools import islice
+
+import pytest
+
+from seedseeker import prescreen
+from seedseeker.generators import FibonacciRng, Lcg, MersenneTwister, Ran3, Xoshiro
+from seedseeker.prescreen import rank
+
+NAMES = ["fibonacci", "lcg", "ran3", "xoshiro", "mersenne"]
+
+
+@pytest.mark.parametrize(
+    ("prng", "possible"),
+    [
+        (Lcg(2**32, 1664525, 1013904223, 1), {"fibonacci", "lcg", "mersenne"}),
+        (Ran3(1), {"fibonacci", "lcg", "ran3"}),
+        (MersenneTwister(1), {"fibonacci", "lcg", "mersenne"}),
+        (Xoshiro((1, 2, 3, 4)), {"fibonacci", "lcg", "xoshiro"}),
+        (FibonacciRng(5, 17, 2**32, 3, False), {"fibonacci", "lcg", "mersenne"}),
+    ],
+)
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_rank(
+    prng: Iterator[int],
+    possible: set[str],
+    vectorized: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the generator that produced the sequence is never ruled out."""
+    if not vectorized:
+        monkeypatch.setattr(prescreen, "numpy", lambda: None)
+
+    verdicts = rank(list(islice(prng, 2000)), NAMES)
+
+    assert {v.name for v in verdicts if v.reason is None} == possible
+    assert [v.score for v in verdicts] == sorted(
+        (v.score for v in verdicts), reverse=True
+    )
+
+
+def test_rank_fibonacci_first() -> None:
+    """Test that small Fibonacci lags rank the Fibonacci reverser first."""
+    verdicts = rank(list(islice(FibonacciRng(5, 17, 2**32, 3, True), 2000)), NAMES)
+    assert verdicts[0].name == "fibonacci"
+
+
+def test_rank_short_sequence() -> None:
+    """Test that reversers are ruled out when there are not enough values."""
+    verdicts = {v.name: v for v in rank(list(islice(Ran3(1), 10)), NAMES)}
+
+    assert verdicts["ran3"].reason == "needs at least 55 values"
+    assert verdicts["mersenne"].reason == "needs at least 624 values"
+    assert verdicts["xoshiro"].reason is None
+    assert all(v.reason is not None for v in rank([], NAMES))
@@ -0,0 +1,129 @@
+import json
+import pstats
+from itertools import islice
+from pathlib import Path
+
+from seedseeker.dispatch import Status, dispatch
+from seedseeker.generators import Lcg, LcgReverser, reverse_lcg, reverse_ran3
+from seedseeker.profiling import (
+    Instrumented,
+    Probe,
+    Profiling,
+    Timing,
+    Usage,
+    table,
+    to_json,
+)
+from seedseeker.utils.iterator import CountingIterator
+from seedseeker.utils.stream import SharedStream
+
+GENERATOR_LIMIT = 1000
+
+
+def lcg_values() -> list[int]:
+    """Return values of an LCG with a known state."""
+    return list(islice(Lcg(2**32, 1664525, 1013904223, 1), GENERATOR_LIMIT))
+
+
+def test_instrumented() -> None:
+    """Test that the time of solving and verifying is told apart."""
+    values = lcg_values()
+    reverser = Instrumented(LcgReverser())
+
+    _ = reverser.feed(values[:500])
+    _ = reverser.feed(iter(values[500:]))
+
+    assert reverser.finish() == reverse_lcg(iter(values))
+    assert reverser.values == GENERATOR_LIMIT
+    assert reverser.candidates >= 1
+    assert [name for name, _ in reverser.phases()] == ["solve", "verify"]
+    assert all(timing.wall >= 0 for _, timing in reverser.phases())
+
+
+def test_probe() -> None:
+    """Test that a probe reports the values, candidates and memory of a run."""
+    values = lcg_values()
+    probe = Probe()
+
+    with probe.running():
+        state = probe.instrument(LcgReverser()).run(values)
+    usage = probe.finish("lcg")
+
+    assert state == reverse_lcg(iter(values))
+    assert usage.name == "lcg"
+    assert usage.values == GENERATOR_LIMIT
+    assert usage.candidates is not None
+    assert usage.candidates >= 1
+    assert usage.peak_memory is not None
+    assert usage.peak_memory > 0
+    assert usage.wall >= usage.phases[0][1].wall
+
+
+def test_probe_counted() -> None:
+    """Test that reversers taking an iterator are counted as a whole."""
+    probe = Probe()
+    assert reverse_ran3(probe.counted(iter(lcg_values()))) is None
+
+    usage = probe.finish("ran3")
+    assert usage.values is not None
+    assert 0 < usage.values <= GENERATOR_LIMIT
+    assert usage.candidates is None
+    assert usage.phases == ()
+
+
+def test_counting_iterator() -> None:
+    """Test that reading past the end does not count a value."""
+    counter = CountingIterator(iter([1, 2, 3]))
+    assert list(counter) == [1, 2, 3]
+    assert next(counter, None) is None
+    assert counter.count == 3
+
+
+def test_dispatch_profiling(tmp_path: Path) -> None:
+    """Test that profiled reversers report their usage and statistics."""
+    values = lcg_values()
+    reversers = {"lcg": LcgReverser, "ran3": reverse_ran3}
+
+    outcomes = {
+        o.name: o
+        for o in dispatch(
+            SharedStream(iter(values)), reversers, profiling=Profiling(str(tmp_path))
+        )
+    }
+
+    assert outcomes["lcg"].status == Status.FOUND
+    assert outcomes["ran3"].status == Status.REJECTED
+
+    usage = outcomes["lcg"].usage
+    assert usage is not None
+    assert usage.values == GENERATOR_LIMIT
+    assert [name for name, _ in usage.phases] == ["solve", "verify"]
+    assert outcomes["ran3"].usage is not None
+
+    for name in reversers:
+        stats = pstats.Stats(str(tmp_path / f"{name}.prof"))
+        assert stats.total_calls > 0
+
+
+def test_dispatch_unprofiled() -> None:
+    """Test that reversers are not measured unless asked to."""
+    outcomes = list(dispatch(SharedStream(iter(lcg_values())), {"lcg": LcgReverser}))
+    assert outcomes[0].usage is None
+
+
+def test_report() -> None:
+    """Test the table and JSON reports."""
+    usages = [
+        Usage("parse", 0.5, 0.25, 1000),
+        Usage("lcg", 1.0, 0.75, 1000, 2, 2**20, (("solve", Timing(0.5, 0.5)),)),
+    ]
+
+    lines = table(usages).splitlines()
+    assert lines[0].split()[0] == "stage"
+    assert lines[1].split() == ["parse", "0.500", "0.250", "1,000", "-", "-"]
+    assert lines[2].split() == ["lcg", "1.000", "0.750", "1,000", "2", "1.0"]
+    assert lines[3].split() == ["solve", "0.500", "0.500"]
+
+    report = json.loads(to_json(usages))
+    assert report[0]["candidates"] is None
+    assert report[1]["phases"] == {"solve": {"wall": 0.5, "cpu": 0.5}}
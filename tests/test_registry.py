@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+from seedseeker.generators import Lcg, LcgReverser
+from seedseeker.registry import (
+    BUILTINS,
+    GENERATORS,
+    PLUGINS,
+    REVERSERS,
+    LazyRegistry,
+    PluginRegistry,
+)
+
+GROUP = "seedseeker.test"
+
+DECLARATION = """
+from seedseeker.registry import Plugin, Profile
+
+PLUGIN = Plugin("counter:Counter", "counter:reverse_counter", Profile(2, 8, 256))
+"""
+
+IMPLEMENTATION = """
+from itertools import count
+
+Counter = count
+
+def reverse_counter(values):
+    first = next(values)
+    return first if all(v == first + i for i, v in enumerate(values, 1)) else None
+"""
+
+
+@pytest.fixture
+def plugins(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PluginRegistry:
+    """Return a registry with a valid plugin and broken ones installed."""
+    _ = (tmp_path / "counter_plugin.py").write_text(DECLARATION)
+    _ = (tmp_path / "counter.py").write_text(IMPLEMENTATION)
+    monkeypatch.syspath_prepend(tmp_path)
+
+    installed = [
+        EntryPoint("counter", "counter_plugin:PLUGIN", GROUP),
+        EntryPoint("missing", "missing_plugin:PLUGIN", GROUP),
+        EntryPoint("invalid", "counter_plugin:Profile", GROUP),
+        EntryPoint("lcg", "counter_plugin:PLUGIN", GROUP),
+    ]
+    monkeypatch.setattr(
+        "importlib.metadata.entry_points",
+        lambda group: [e for e in installed if e.group == group],
+    )
+
+    return PluginRegistry(BUILTINS, GROUP)
+
+
+def test_lookup() -> None:
+    """Test that built-in objects are imported by name."""
+    assert GENERATORS["lcg"] is Lcg
+    assert REVERSERS["lcg"] is LcgReverser
+    assert list(REVERSERS) == ["fibonacci", "lcg", "ran3", "xoshiro", "mersenne"]
+    assert set(GENERATORS) == set(REVERSERS) == set(PLUGINS)
+    assert "missing" not in GENERATORS
+
+    with pytest.raises(KeyError):
+        _ = GENERATORS["missing"]
+
+
+def test_plugins(plugins: PluginRegistry, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that installed plugins are discovered and loaded lazily."""
+    assert plugins["lcg"] is BUILTINS["lcg"]
+    assert plugins.discovered is None
+
+    assert list(plugins) == [*BUILTINS, "counter"]
+    assert plugins["counter"].profile.min_samples == 2
+    assert "counter" not in sys.modules
+
+    reversers = LazyRegistry(plugins, "reverser")
+    generators = LazyRegistry(plugins, "generator")
+    values = list(zip(range(8), generators["counter"](5), strict=False))
+    assert reversers["counter"](iter(v for _, v in values)) == 5
+    assert reversers["counter"](iter([1, 3])) is None
+
+    warnings = capsys.readouterr().err
+    assert "Ignoring plugin missing: ModuleNotFoundError" in warnings
+    assert "Ignoring plugin invalid: counter_plugin:Profile is not a Plugin" in warnings
+    assert "Ignoring plugin lcg: a built-in generator has the same name" in warnings
+
+
+def test_lazy() -> None:
+    """Test that nothing is imported before it is looked up."""
+    registry = LazyRegistry(
+        {"missing": BUILTINS["lcg"]._replace(reverser="x:y")}, "reverser"
+    )
+    assert "missing" in registry
+    assert list(registry) == ["missing"]
+
+    with pytest.raises(ImportError):
+        _ = registry["missing"]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "asyncio",
+        "multiprocessing",
+        "mod",
+        "randcrack",
+        "importlib.metadata",
+        "json",
+        "threading",
+        "seedseeker.generators.lcg",
+        "seedseeker.prescreen",
+        "seedseeker.utils.compression",
+        "seedseeker.utils.filestream",
+    ],
+)
+def test_startup_imports(module: str) -> None:
+    """Test that starting the CLI does not import what only some commands need."""
+    code = f"import sys, seedseeker.cli; sys.exit({module!r} in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.run([sys.executable, "-c", code], check=False, env=env)  # noqa: S603
+    assert process.returncode == 0
@@ -149,6 +149,19 @@ def test_fibonacci_reverser(
     assert FibonacciRng.is_state_equal(found, expected)
 
 
+@pytest.mark.parametrize("seed", [1, 9, 16])
+def test_fibonacci_reverser_small_modulus(seed: int) -> None:
+    """Test that relations implying an impossible modulus are skipped."""
+    prng = FibonacciRng.from_string(f"3;7;16;{seed};false")
+    values = list(islice(prng, 1024))
+
+    found = reverse_fibonacci(iter(values))
+    assert found is not None
+
+    predicted = FibonacciRng.from_state(found)
+    assert list(islice(predicted, 100)) == list(islice(prng, 100))
+
+
 @pytest.mark.parametrize(
     ("prng"),
     [
@@ -0,0 +1,127 @@
+import random
+from itertools import islice
+
+import pytest
+
+from seedseeker.feed import slides
+from seedseeker.generators import (
+    Lcg,
+    LcgReverser,
+    MersenneReverser,
+    MersenneTwister,
+    Ran3,
+    Ran3Reverser,
+    Xoshiro,
+    XoshiroReverser,
+    reverse_lcg,
+)
+from seedseeker.generators.lcg import SlidingGcd
+from seedseeker.generators.mersenne import untemper
+from seedseeker.scan import scan
+
+REVERSERS = {
+    "lcg": LcgReverser,
+    "ran3": Ran3Reverser,
+    "xoshiro": XoshiroReverser,
+    "mersenne": MersenneReverser,
+}
+
+
+def noise(count: int, seed: int) -> list[int]:
+    """Return random values no generator is expected to match."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    ("name", "prng", "count"),
+    [
+        ("lcg", Lcg(2**32, 1664525, 1013904223, 1), 300),
+        ("xoshiro", Xoshiro((1, 2, 3, 4)), 100),
+        ("ran3", Ran3(5), 200),
+        ("mersenne", MersenneTwister(7), 1000),
+    ],
+)
+@pytest.mark.parametrize("offset", [0, 1, 37])
+def test_offset(name: str, prng: object, count: int, offset: int) -> None:
+    """Test that a run is found after unrelated values."""
+    run = list(islice(prng, count))
+    values = [*noise(offset, offset), *run, *noise(20, 1)]
+
+    segments = list(scan(values, REVERSERS))
+
+    assert [(s.generator, s.end) for s in segments] == [(name, offset + count)]
+    # the oldest Mersenne Twister word only matters for its top bit
+    assert offset - (name == "mersenne") <= segments[0].start <= offset
+    assert type(prng).is_state_equal(segments[0].state, prng.state())
+
+
+def test_segments() -> None:
+    """Test that consecutive runs are all reported in order."""
+    first = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 300))
+    second = list(islice(Xoshiro((1, 2, 3, 4)), 100))
+    third = list(islice(Lcg(2**31, 1103515245, 12345, 7), 200))
+    values = [*noise(10, 2), *first, *noise(5, 3), *second, *third]
+
+    segments = list(scan(values, REVERSERS))
+
+    assert [(s.generator, s.start, s.end) for s in segments] == [
+        ("lcg", 10, 310),
+        ("xoshiro", 315, 415),
+        ("lcg", 415, 615),
+    ]
+    assert segments[2].state == reverse_lcg(iter(third))
+
+
+def test_unconfirmed() -> None:
+    """Test that noise and runs too short to be confirmed are not reported."""
+    run = list(islice(Lcg(2**32, 1664525, 1013904223, 1), 40))
+    assert list(scan([*noise(500, 4), *run], REVERSERS)) == []
+
+
+def test_lcg_slide() -> None:
+    """Test that sliding over values agrees with solving every window."""
+    values = [*noise(50, 5), *islice(Lcg(2**32, 1664525, 1013904223, 1), 100)]
+    slider = LcgReverser()
+
+    for index, value in enumerate(values):
+        candidate = slider.slide(value)
+
+        if index < 50:
+            # every window contains noise
+            assert candidate is None
+        elif index >= 50 + 33:
+            window = values[index - 33 : index + 1]
+            assert candidate is not None
+            assert candidate.state() == reverse_lcg(iter(window))
+
+
+def test_sliding_gcd() -> None:
+    """Test that the gcd follows the values in the queue."""
+    queue = SlidingGcd()
+    values = [12, 0, 18, 30, 7, 14]
+    expected = [12, 12, 6, 6, 1, 1]
+
+    for value, gcd in zip(values, expected, strict=True):
+        queue.push(value)
+        assert queue.gcd() == gcd
+
+    assert queue.pop() == 12
+    assert queue.pop() == 0
+    assert queue.pop() == 18
+    assert (queue.gcd(), queue.nonzero, len(queue)) == (1, 3, 3)
+    assert queue.pop() == 30
+    assert queue.gcd() == 7
+
+
+def test_untemper() -> None:
+    """Test that untempering recovers the state words."""
+    prng = MersenneTwister(3)
+    outputs = list(islice(prng, MersenneTwister.N))
+    assert [untemper(value) for value in outputs] == prng.state_array
+
+
+def test_slides() -> None:
+    """Test which reversers can scan."""
+    assert slides(LcgReverser)
+    assert not slides(reverse_lcg)
@@ -0,0 +1,131 @@
+import random
+from itertools import islice
+
+import pytest
+
+from seedseeker.generators import (
+    Lcg,
+    Xoshiro,
+    reverse_lcg_sparse,
+    reverse_xoshiro_sparse,
+)
+from seedseeker.generators.lcg import affine_power, unit_step
+from seedseeker.generators.xoshiro import from_vector, to_vector, transition
+from seedseeker.utils.gf2 import solve
+from seedseeker.utils.primes import factorize, is_prime
+
+# a step count no capture could hold consecutively
+FAR = 10**9 + 7
+
+
+def after[T](prng: T, index: int) -> T:
+    """Return the generator after the value at `index`."""
+    for _ in range(index + 1):
+        _ = next(prng)
+    return prng
+
+
+@pytest.mark.parametrize(
+    ("prng", "stride"),
+    [
+        (Lcg(2**32, 1664525, 1013904223, 7), 1),
+        (Lcg(2**32, 1664525, 1013904223, 7), 3),
+        (Lcg(2**31 - 1, 16807, 0, 7), 5),
+    ],
+)
+def test_lcg_stride(prng: Lcg, stride: int) -> None:
+    """Test that every stride-th value gives the state after the last one."""
+    values = list(islice(prng.fork(), 3000))
+    pairs = [(index, values[index]) for index in range(4, 3000, stride)]
+
+    state = reverse_lcg_sparse(pairs)
+
+    assert state is not None
+    assert Lcg.is_state_equal(state, after(prng, pairs[-1][0]).state())
+
+
+def test_lcg_irregular() -> None:
+    """Test that gaps between runs of evenly spaced values are jumped."""
+    m, a, c, seed = 2**48, 25214903917, 11, 12345
+    # four runs of eight values a stride apart, with wider gaps between them
+    positions = [run * 20 + offset for run in range(4) for offset in range(8)]
+    pairs = []
+
+    for position in positions:
+        multiplier, increment = affine_power(a, c, position * FAR + 1, m)
+        pairs.append((position * FAR, (multiplier * seed + increment) % m))
+
+    state = reverse_lcg_sparse(pairs)
+
+    assert state is not None
+    assert (state.a, state.c, int(state.x_n)) == (a, c, pairs[-1][1])
+
+
+def test_lcg_ambiguous() -> None:
+    """Test that an even stride of a power of two modulus is not guessed."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 7), 400))
+    assert reverse_lcg_sparse(list(enumerate(values))[::2]) is None
+    assert unit_step(*affine_power(1664525, 1013904223, 2, 2**32), 2, 2**32) is None
+
+
+def test_lcg_wrong() -> None:
+    """Test that a value that does not follow the others rejects the state."""
+    values = list(islice(Lcg(2**32, 1664525, 1013904223, 7), 400))
+    pairs = list(enumerate(values))[::3]
+    pairs[-40] = (pairs[-40][0], pairs[-40][1] ^ 1)
+    assert reverse_lcg_sparse(pairs) is None
+
+
+@pytest.mark.parametrize("distances", [[1, 1, 1, 1], [7] * 40, [FAR] * 6])
+def test_xoshiro(distances: list[int]) -> None:
+    """Test that values at any indices give the state after the last one."""
+    steps = transition()
+    vector = to_vector(Xoshiro((1, 2, 3, 4)).state())
+    index, pairs = 0, []
+
+    for distance in distances:
+        vector = steps.jump(vector, distance)
+        index += distance
+        pairs.append((index, next(Xoshiro(from_vector(vector)))))
+
+    state = reverse_xoshiro_sparse(pairs)
+
+    assert state == from_vector(steps.jump(vector, 1))
+
+
+def test_xoshiro_irregular() -> None:
+    """Test that irregular indices agree with stepping the generator."""
+    prng = Xoshiro((5, 6, 7, 8))
+    values = list(islice(prng, 5000))
+    indices = sorted(random.Random(1).sample(range(5000), 20))
+
+    state = reverse_xoshiro_sparse([(i, values[i]) for i in indices])
+
+    assert state == after(Xoshiro((5, 6, 7, 8)), indices[-1]).state()
+    assert reverse_xoshiro_sparse([(i, values[i] ^ 1) for i in indices]) is None
+
+
+def test_transition() -> None:
+    """Test that the transition steps like the generator."""
+    prng = Xoshiro((1, 2, 3, 4))
+    start = to_vector(prng.state())
+    _ = list(islice(prng, 1000))
+
+    assert transition().jump(start, 1000) == to_vector(prng.state())
+    assert transition().jump(start, 0) == start
+
+
+def test_solve() -> None:
+    """Test the GF(2) solver on determined, inconsistent and open systems."""
+    # x0 ^ x1 = 1, x1 = 1, x2 ^ x0 = 0
+    assert solve([(0b011, 1), (0b010, 1), (0b101, 0)], 3) == 0b010
+    assert solve([(0b011, 1), (0b011, 0)], 2) is None
+    assert solve([(0b011, 1)], 2) is None
+
+
+def test_factorize() -> None:
+    """Test factors below and above the trial division bound."""
+    assert factorize(2**32) == {2: 32}
+    assert factorize(3 * (2**61 - 1)) == {3: 1, 2**61 - 1: 1}
+    assert factorize((2**31 - 1) * (2**61 - 1)) is None
+    assert [n for n in range(30) if is_prime(n)] == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
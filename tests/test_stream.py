@@ -0,0 +1,49 @@
+from itertools import islice
+
+from seedseeker.generators import Lcg, reverse_lcg, reverse_ran3
+from seedseeker.utils.iterator import drop
+from seedseeker.utils.stream import SharedStream
+
+
+def test_shared_stream() -> None:
+    """Test that cursors read the same values independently."""
+    stream = SharedStream(iter(range(10_000)), chunk_size=100)
+    first = stream.cursor()
+    second = stream.cursor()
+
+    assert list(islice(first, 250)) == list(range(250))
+    assert list(islice(second, 10)) == list(range(10))
+    assert stream.filled == 3
+
+    # only the chunks from the slowest cursor onwards are kept
+    assert list(islice(second, 290)) == list(range(10, 300))
+    assert min(stream.chunks) == 2
+
+    second.close()
+    assert list(first) == list(range(250, 10_000))
+    assert stream.exhausted
+    assert not stream.chunks
+
+
+def test_shared_stream_reversers() -> None:
+    """Test that a reverser verifies the whole stream through its cursor."""
+    stream = SharedStream(islice(Lcg(2**32, 1664525, 1013904223, 1), 50_000))
+    lcg = stream.cursor()
+    ran3 = stream.cursor()
+
+    assert reverse_ran3(ran3) is None
+    ran3.close()
+
+    found = reverse_lcg(lcg)
+    assert found is not None
+    assert found == drop(Lcg(2**32, 1664525, 1013904223, 1), 50_000).state()
+    assert stream.exhausted
+
+
+def test_shared_stream_peek() -> None:
+    """Test that peeking keeps the values available for readers."""
+    stream = SharedStream(iter(range(1000)), chunk_size=100)
+
+    assert stream.peek(250) == list(range(250))
+    assert stream.peek(5000) == list(range(1000))
+    assert list(stream.cursor()) == list(range(1000))
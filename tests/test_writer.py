@@ -0,0 +1,72 @@
+import io
+import sys
+from itertools import islice
+
+import pytest
+
+from seedseeker.defs import InvalidFormatError
+from seedseeker.generators import Xoshiro
+from seedseeker.utils import writer
+from seedseeker.utils.binary import BinaryStream
+from seedseeker.utils.writer import ValueWriter
+
+VALUES = list(islice(Xoshiro((1, 2, 3, 4)), 1000))
+
+
+def written(layout: str, sequences: list[list[int]], separator: str = "\n") -> bytes:
+    """Write sequences with a small block size and return the output."""
+    out = io.TextIOWrapper(io.BytesIO(), write_through=True)
+    value_writer = ValueWriter(out, layout, block_size=7)
+
+    value_writer.begin((len(sequences), len(sequences[0])))
+    for sequence in sequences:
+        value_writer.write(iter(sequence), separator)
+    value_writer.end()
+
+    return out.buffer.getvalue()  # type: ignore[attr-defined]
+
+
+def test_text() -> None:
+    """Test that text output matches formatting every value on its own."""
+    assert written("text", [VALUES]) == "".join(f"{v}\n" for v in VALUES).encode()
+    assert written("text", [[1, 2, 3], [4, 5, 6]], ";") == b"1;2;3\n4;5;6\n"
+    assert written("text", [[]]) == b"\n"
+
+
+@pytest.mark.parametrize("layout", ["u32le", "u32be", "u64le", "u64be"])
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_binary(layout: str, vectorized: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that binary output can be read back."""
+    if vectorized:
+        _ = pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(writer, "numpy", lambda: None)
+
+    values = [v % 2**32 for v in VALUES] if layout.startswith("u32") else VALUES
+    data = written(layout, [values[:500], values[500:]])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    with BinaryStream(None, layout) as stream:
+        assert list(stream) == values
+
+
+def test_npy() -> None:
+    """Test that .npy output has the shape of all sequences."""
+    np = pytest.importorskip("numpy")
+    data = written("npy", [VALUES[:500], VALUES[500:]])
+
+    array = np.load(io.BytesIO(data))
+    assert array.shape == (2, 500)
+    assert array.reshape(-1).tolist() == VALUES
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_overflow(vectorized: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that values wider than the layout are rejected."""
+    if vectorized:
+        _ = pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(writer, "numpy", lambda: None)
+
+    with pytest.raises(InvalidFormatError, match="do not fit in u32le"):
+        _ = written("u32le", [VALUES])